@@ -1,13 +1,9 @@
 from interactions import Extension, Modal, ShortText, StringSelectOption, slash_command, slash_default_member_permission, Permissions, Button, ButtonStyle, StringSelectMenu
 from interactions.api.events import Component
+from Utils.extensions import load_for_client
 
 class Config(Extension):
 
-	async def _refresh_config_cache(self, guild_id: int):
-		doc = await self.bot.db.config.find_one({"guild_id": str(guild_id)}) or {}
-		await self.bot.mem_cache.set(f"config_{guild_id}", doc)
-		return doc
-
 	@slash_command(name="config", description="Configure bot settings", sub_cmd_name="set", sub_cmd_description="Set configuration options")
 	@slash_default_member_permission(Permissions.MANAGE_GUILD)
 	async def config(self, ctx):
@@ -129,13 +125,7 @@ class Config(Extension):
 				selected_role_id_str = role_interaction_ctx.ctx.values[0]
 				selected_role = ctx.guild.get_role(int(selected_role_id_str))
 
-				await self.bot.db.config.update_one(
-					{"guild_id": str(ctx.guild.id)},
-					{"$set": {selected_setting_key: str(selected_role.id)}},
-					upsert=True,
-				)
-
-				await self._refresh_config_cache(ctx.guild.id)
+				await self.bot.guild_config.update(ctx.guild.id, {"$set": {selected_setting_key: str(selected_role.id)}})
 
 				await ctx.edit(
 					embed={
@@ -191,12 +181,7 @@ class Config(Extension):
 					modal_ctx = await self.bot.wait_for_modal(modal=modal, timeout=120)
 					infraction_type_name = modal_ctx.responses["infraction_type"]
 
-					await self.bot.db.config.update_one(
-						{"guild_id": str(ctx.guild.id)},
-						{"$addToSet": {"infraction_types": infraction_type_name}},
-						upsert=True,
-					)
-					await self._refresh_config_cache(ctx.guild.id)
+					await self.bot.guild_config.update(ctx.guild.id, {"$addToSet": {"infraction_types": infraction_type_name}})
 
 					await modal_ctx.send(embed={
 						"title": "Infraction Type Added",
@@ -206,8 +191,8 @@ class Config(Extension):
 					return
 
 				elif action_selected == "remove_infraction_type":
-					config_data = await self.bot.mem_cache.get(f"config_{ctx.guild.id}") or await self._refresh_config_cache(ctx.guild.id)
-					if not config_data or "infraction_types" not in config_data or not config_data["infraction_types"]:
+					config_data = await self.bot.guild_config.get(ctx.guild.id)
+					if not config_data.infraction_types:
 						await ctx.edit(
 							embed={
 								"title": "No Infraction Types Found",
@@ -220,7 +205,7 @@ class Config(Extension):
 
 					infraction_type_options = [
 						StringSelectOption(label=itype, value=itype)
-						for itype in config_data["infraction_types"]
+						for itype in config_data.infraction_types
 					]
 					infraction_type_selector = StringSelectMenu(
 						*infraction_type_options,
@@ -245,11 +230,7 @@ class Config(Extension):
 						await type_interaction_ctx.ctx.send("This menu isn't for you!", ephemeral=True)
 						return
 					selected_type = type_interaction_ctx.ctx.values[0]
-					await self.bot.db.config.update_one(
-						{"guild_id": str(ctx.guild.id)},
-						{"$pull": {"infraction_types": selected_type}},
-					)
-					await self._refresh_config_cache(ctx.guild.id)
+					await self.bot.guild_config.update(ctx.guild.id, {"$pull": {"infraction_types": selected_type}}, upsert=False)
 					await ctx.edit(
 						embed={
 							"title": "Infraction Type Removed",
@@ -285,13 +266,7 @@ class Config(Extension):
 			selected_channel_id_str = channel_interaction_ctx.ctx.values[0]
 			selected_channel = ctx.guild.get_channel(int(selected_channel_id_str))
 
-			await self.bot.db.config.update_one(
-				{"guild_id": str(ctx.guild.id)},
-				{"$set": {selected_setting_key: str(selected_channel.id)}},
-				upsert=True,
-			)
-
-			await self._refresh_config_cache(ctx.guild.id)
+			await self.bot.guild_config.update(ctx.guild.id, {"$set": {selected_setting_key: str(selected_channel.id)}})
 
 			await ctx.edit(
 				embed={
@@ -323,12 +298,10 @@ class Config(Extension):
 	async def view_config(self, ctx):
 		await ctx.defer(ephemeral=True)
 
-		key = f"config_{ctx.guild.id}"
-		config_data = await self.bot.mem_cache.get(key)
-		if not config_data:
-			config_data = await self._refresh_config_cache(ctx.guild.id) or {}
+		config_data = await self.bot.guild_config.get(ctx.guild.id)
 
-		if not config_data:
+		# No stored document at all; one without settings is reported as empty below.
+		if config_data.guild_id is None:
 			return await ctx.send(
 				embed={
 					"title": "No Configuration Found",
@@ -338,7 +311,7 @@ class Config(Extension):
 				ephemeral=True,
 			)
 
-		display_data = {k: v for k, v in config_data.items() if k not in ['_id', 'guild_id']}
+		display_data = config_data.settings
 		if not display_data:
 			return await ctx.send(
 				embed={
@@ -394,4 +367,4 @@ class Config(Extension):
 		)
 
 def setup(bot):
-	Config(bot)
\ No newline at end of file
+	load_for_client(Config, bot)
\ No newline at end of file
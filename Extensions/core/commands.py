@@ -1,54 +1,105 @@
-from interactions import slash_command, Extension, listen
+import os
+from interactions import slash_command, Extension, listen, Task, IntervalTrigger
+from Utils.extensions import load_for_client
+from Utils.sharding import total_guild_count
+
+bot_logs_channel_id = 1430984965826543733
+DIGEST_INTERVAL = max(1, int(os.getenv("GUILD_DIGEST_INTERVAL", "30")))
+DIGEST_MAX_EMBEDS = 10
+DIGEST_MAX_PENDING = int(os.getenv("GUILD_DIGEST_MAX_PENDING", "1000"))
+DIGEST_TABLE_LIMIT = 3900
 
 class CoreCommands(Extension):
 
+    def __init__(self, bot):
+        self.guild_events = []
+        self.guild_events_dropped = {"join": 0, "leave": 0}
+        # Joins/leaves are posted as one digest per interval, so bursts cost at most one REST call per tick.
+        self.digest_task = Task(self.flush_guild_digest, IntervalTrigger(seconds=DIGEST_INTERVAL))
+        super().__init__()
+
+    def export_state(self):
+        return {"guild_events": self.guild_events, "guild_events_dropped": self.guild_events_dropped}
+
+    def import_state(self, state: dict):
+        self.guild_events = state["guild_events"]
+        self.guild_events_dropped = state["guild_events_dropped"]
+        if self.guild_events:
+            self.digest_task.start()
+
+    def drop(self):
+        self.digest_task.stop()
+        super().drop()
+
+    def queue_guild_event(self, kind: str, guild):
+        if len(self.guild_events) >= DIGEST_MAX_PENDING:
+            self.guild_events_dropped[kind] += 1
+        else:
+            self.guild_events.append({"kind": kind, "name": guild.name, "id": str(guild.id), "member_count": guild.member_count})
+        if not self.digest_task.running:
+            self.digest_task.start()
+
+    def build_guild_digest(self, events: list, dropped: dict, guild_count: int):
+        joined = sum(1 for e in events if e["kind"] == "join") + dropped["join"]
+        left = sum(1 for e in events if e["kind"] == "leave") + dropped["leave"]
+        summary = f"Joined {joined} · Left {left} · Now in {guild_count} servers"
+        if len(events) < DIGEST_MAX_EMBEDS and not any(dropped.values()):
+            embeds = [
+                {
+                    "title": "Joined New Guild" if e["kind"] == "join" else "Left Guild",
+                    "fields": [
+                        {"name": "Guild Name", "value": e["name"], "inline": True},
+                        {"name": "Guild ID", "value": e["id"], "inline": True},
+                        {"name": "Member Count", "value": str(e["member_count"]), "inline": True},
+                    ]
+                }
+                for e in events
+            ]
+            embeds.append({"description": summary})
+            return embeds
+
+        lines = []
+        length = 0
+        for e in events:
+            line = f"`{'+' if e['kind'] == 'join' else '-'}` {e['name']} ({e['id']}) · {e['member_count']} members"
+            if length + len(line) + 1 > DIGEST_TABLE_LIMIT:
+                break
+            lines.append(line)
+            length += len(line) + 1
+        hidden = len(events) - len(lines) + sum(dropped.values())
+        if hidden:
+            lines.append(f"…and {hidden} more")
+        return [{"title": "Guild Activity Digest", "description": "\n".join(lines), "footer": {"text": summary}}]
+
+    async def flush_guild_digest(self):
+        if not self.guild_events and not any(self.guild_events_dropped.values()):
+            self.digest_task.stop()
+            return
+        events, dropped = self.guild_events, self.guild_events_dropped
+        self.guild_events, self.guild_events_dropped = [], {"join": 0, "leave": 0}
+        try:
+            bot_logs_channel = await self.bot.fetch_channel(bot_logs_channel_id)
+            if bot_logs_channel:
+                await bot_logs_channel.send(embeds=self.build_guild_digest(events, dropped, await total_guild_count(self.bot)))
+        except Exception:
+            # Put the batch back so its totals land in the next digest instead of being lost.
+            self.guild_events = (events + self.guild_events)[:DIGEST_MAX_PENDING]
+            for kind, count in dropped.items():
+                self.guild_events_dropped[kind] += count
+            self.bot.logger.warning("Failed to send the guild activity digest; retrying next interval.", exc_info=True)
+
     @listen()
     async def on_guild_join(self, event):
-        guild = event.guild
-        blacklisted_guilds = await self.bot.mem_cache.get("blacklisted_guilds") or []
-        if guild.id in blacklisted_guilds:
-            await guild.leave()
-            return
+        # Blacklisted guilds are filtered out (and left) by Utils.blacklist before this runs.
         if not self.bot.ready:
             return
-        studio_server_id = 1430984964283043916
-        studio_server = self.client.get_guild(studio_server_id)
-        if studio_server:
-            bot_logs_channel_id = 1430984965826543733
-            bot_logs_channel = studio_server.get_channel(bot_logs_channel_id)
-            if bot_logs_channel:
-                await bot_logs_channel.send(embed={
-                    "title": "Joined New Guild",
-                    "fields": [
-                        {"name": "Guild Name", "value": guild.name, "inline": True},
-                        {"name": "Guild ID", "value": str(guild.id), "inline": True},
-                        {"name": "Member Count", "value": str(guild.member_count), "inline": True},
-                    ]
-                })
+        self.queue_guild_event("join", event.guild)
 
     @listen()
     async def on_guild_left(self, event):
-        guild = event.guild
-        blacklisted_guilds = await self.bot.mem_cache.get("blacklisted_guilds") or []
-        if guild.id in blacklisted_guilds:
-            await guild.leave()
-            return
         if not self.bot.ready:
             return
-        studio_server_id = 1430984964283043916
-        studio_server = self.client.get_guild(studio_server_id)
-        if studio_server:
-            bot_logs_channel_id = 1430984965826543733
-            bot_logs_channel = studio_server.get_channel(bot_logs_channel_id)
-            if bot_logs_channel:
-                await bot_logs_channel.send(embed={
-                    "title": "Left Guild",
-                    "fields": [
-                        {"name": "Guild Name", "value": guild.name, "inline": True},
-                        {"name": "Guild ID", "value": str(guild.id), "inline": True},
-                        {"name": "Member Count", "value": str(guild.member_count), "inline": True},
-                    ]
-                })
+        self.queue_guild_event("leave", event.guild)
 
     @slash_command(name="ping", description="Replies with Pong!")
     async def ping(self, ctx):
@@ -56,4 +107,4 @@ class CoreCommands(Extension):
         await ctx.send(embed={"description": f"<:check:1430728952535842907> Pong! Latency: {round(self.bot.latency * 1000)}ms"})
 
 def setup(bot):
-    CoreCommands(bot)
\ No newline at end of file
+    load_for_client(CoreCommands, bot)
\ No newline at end of file
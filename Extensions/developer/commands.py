@@ -1,70 +1,98 @@
-from interactions import Extension, Timestamp
-from interactions.ext.prefixed_commands import prefixed_command
+from interactions import Extension, Timestamp, slash_command, slash_option, slash_default_member_permission, OptionType, Permissions
 from datetime import datetime, timezone
+from Utils.extensions import load_for_client
+from Utils.reload import reload_extension
 
 devs = {856196104385986560, 1362053982444454119}
+studio_server_id = 1430984964283043916
 
 class DeveloperCommands(Extension):
-	@prefixed_command()
-	async def blacklist_server(self, ctx, guild_id: int, *, reason: str = "No reason provided"):
-		if ctx.author.id not in devs:
+	async def _check_dev(self, ctx) -> bool:
+		if ctx.author.id in devs:
+			return True
+		await ctx.send(embed={"description": "<:warning:1430730420307234916> This command is restricted to the bot developers."}, ephemeral=True)
+		return False
+
+	async def _parse_guild_id(self, ctx, guild_id: str):
+		guild_id = guild_id.strip()
+		if guild_id.isdigit():
+			return int(guild_id)
+		await ctx.send(embed={"description": f"<:warning:1430730420307234916> `{guild_id}` is not a valid server ID."}, ephemeral=True)
+		return None
+
+	@slash_command(name="developer", description="Developer commands", scopes=[studio_server_id])
+	@slash_default_member_permission(Permissions.ADMINISTRATOR)
+	async def developer(self, ctx):
+		pass
+
+	@developer.subcommand(sub_cmd_name="blacklist_server", sub_cmd_description="Blacklist a server and leave it")
+	@slash_option(
+		name="guild_id",
+		description="The ID of the server to blacklist",
+		required=True,
+		opt_type=OptionType.STRING
+	)
+	@slash_option(
+		name="reason",
+		description="Reason for the blacklist",
+		required=False,
+		opt_type=OptionType.STRING
+	)
+	async def blacklist_server(self, ctx, guild_id: str, reason: str = "No reason provided"):
+		if not await self._check_dev(ctx):
 			return
+		guild_id = await self._parse_guild_id(ctx, guild_id)
+		if guild_id is None:
+			return
+		await ctx.defer(ephemeral=True)
 
 		guild = await self.client.fetch_guild(guild_id)
 		if not guild:
 			await ctx.send(f"Guild with ID {guild_id} not found.")
 			return
 
-		blacklisted_guilds = await self.bot.mem_cache.get("blacklisted_guilds")
-
-		if not blacklisted_guilds:
-			doc = await self.bot.db.blacklisted_guilds.find({}).to_list(length=None)
-			blacklisted_guilds = {item["guild_id"]: item.get("reason", "No reason provided") for item in doc}
-			await self.bot.mem_cache.set("blacklisted_guilds", blacklisted_guilds)
-
-		if guild_id in blacklisted_guilds:
-			await ctx.send(f"Guild ID `{guild_id}` is already blacklisted for reason `{blacklisted_guilds[guild_id]}`.")
+		if not await self.bot.blacklist.add(guild_id, reason, ctx.author.id, datetime.now(timezone.utc)):
+			existing = await self.bot.db.blacklisted_guilds.find_one({"guild_id": guild_id}) or {}
+			await ctx.send(f"Guild ID `{guild_id}` is already blacklisted for reason `{existing.get('reason', 'No reason provided')}`.")
 			return
 
-		blacklisted_guilds[guild_id] = reason
-		await self.bot.mem_cache.set("blacklisted_guilds", blacklisted_guilds)
-
-		await self.bot.db.blacklisted_guilds.insert_one({
-			"guild_id": guild_id,
-			"reason": reason,
-			"blacklisted_at": ctx.message.created_at,
-			"blacklisted_by": ctx.author.id
-		})
-
-		try:
-			if guild := self.client.get_guild(guild_id):
-				await guild.leave()
-		except Exception:
-			pass
+		await self.bot.blacklist.leave(guild_id)
 
 		await ctx.send(f"Guild ID `{guild_id}` has been blacklisted for reason `{reason}` and left if present.")
 
-	@prefixed_command()
-	async def unblacklist_server(self, ctx, guild_id: int):
-		if ctx.author.id not in devs:
+	@developer.subcommand(sub_cmd_name="unblacklist_server", sub_cmd_description="Remove a server from the blacklist")
+	@slash_option(
+		name="guild_id",
+		description="The ID of the server to unblacklist",
+		required=True,
+		opt_type=OptionType.STRING
+	)
+	async def unblacklist_server(self, ctx, guild_id: str):
+		if not await self._check_dev(ctx):
 			return
-		blacklisted_guilds =await self.bot.mem_cache.get("blacklisted_guilds") or []
-		if not blacklisted_guilds:
-			doc = await self.bot.db.blacklisted_guilds.find({}).to_list(length=None)
-			blacklisted_guilds = [item["guild_id"] for item in doc]
-			await self.bot.mem_cache.set("blacklisted_guilds", blacklisted_guilds)
-		if guild_id in blacklisted_guilds:
-			blacklisted_guilds.remove(guild_id)
-			await self.bot.mem_cache.set("blacklisted_guilds", blacklisted_guilds)
-			await self.bot.db.blacklisted_guilds.delete_one({"guild_id": guild_id})
+		guild_id = await self._parse_guild_id(ctx, guild_id)
+		if guild_id is None:
+			return
+		await ctx.defer(ephemeral=True)
+		if await self.bot.blacklist.remove(guild_id):
 			await ctx.send(f"Guild ID {guild_id} has been removed from the blacklist.")
 		else:
 			await ctx.send(f"Guild ID {guild_id} is not in the blacklist.")
 
-	@prefixed_command()
-	async def view_blacklisted_server(self, ctx, guild_id: int):
-		if ctx.author.id not in devs:
+	@developer.subcommand(sub_cmd_name="view_blacklisted_server", sub_cmd_description="View why a server is blacklisted")
+	@slash_option(
+		name="guild_id",
+		description="The ID of the server to look up",
+		required=True,
+		opt_type=OptionType.STRING
+	)
+	async def view_blacklisted_server(self, ctx, guild_id: str):
+		if not await self._check_dev(ctx):
+			return
+		guild_id = await self._parse_guild_id(ctx, guild_id)
+		if guild_id is None:
 			return
+		await ctx.defer(ephemeral=True)
 		blacklisted_guild = await self.bot.db.blacklisted_guilds.find_one({"guild_id": guild_id})
 		if blacklisted_guild:
 			timestamp = blacklisted_guild.get("blacklisted_at")
@@ -81,40 +109,72 @@ class DeveloperCommands(Extension):
 		else:
 			await ctx.send(f"Guild ID `{guild_id}` is not blacklisted.")
 
-	@prefixed_command()
+	@developer.subcommand(sub_cmd_name="load", sub_cmd_description="Load an extension")
+	@slash_option(
+		name="extension_name",
+		description="Extension path relative to Extensions, e.g. core.commands",
+		required=True,
+		opt_type=OptionType.STRING
+	)
 	async def load(self, ctx, extension_name: str):
-		if ctx.author.id not in devs:
+		if not await self._check_dev(ctx):
 			return
+		await ctx.defer(ephemeral=True)
 		try:
 			self.client.load_extension(f"Extensions.{extension_name}")
 			await ctx.send(f"Extension '{extension_name}' loaded successfully.")
 		except Exception as e:
 			await ctx.send(f"Failed to load extension '{extension_name}': {e}")
 
-	@prefixed_command()
+	@developer.subcommand(sub_cmd_name="unload", sub_cmd_description="Unload an extension")
+	@slash_option(
+		name="extension_name",
+		description="Extension path relative to Extensions, e.g. core.commands",
+		required=True,
+		opt_type=OptionType.STRING
+	)
 	async def unload(self, ctx, extension_name: str):
-		if ctx.author.id not in devs:
+		if not await self._check_dev(ctx):
 			return
+		await ctx.defer(ephemeral=True)
 		try:
 			self.client.unload_extension(f"Extensions.{extension_name}")
 			await ctx.send(f"Extension '{extension_name}' unloaded successfully.")
 		except Exception as e:
 			await ctx.send(f"Failed to unload extension '{extension_name}': {e}")
 
-	@prefixed_command()
+	@developer.subcommand(sub_cmd_name="reload", sub_cmd_description="Reload an extension")
+	@slash_option(
+		name="extension_name",
+		description="Extension path relative to Extensions, e.g. core.commands",
+		required=True,
+		opt_type=OptionType.STRING
+	)
 	async def reload(self, ctx, extension_name: str):
-		if ctx.author.id not in devs:
+		if not await self._check_dev(ctx):
 			return
+		await ctx.defer(ephemeral=True)
 		try:
-			self.client.reload_extension(f"Extensions.{extension_name}")
-			await ctx.send(f"Extension '{extension_name}' reloaded successfully.")
+			elapsed, restored = reload_extension(self.client, f"Extensions.{extension_name}")
+			carried = f" State carried over for {', '.join(restored)}." if restored else ""
+			await ctx.send(f"Extension '{extension_name}' reloaded successfully in {elapsed * 1000:.1f}ms.{carried}")
 		except Exception as e:
 			await ctx.send(f"Failed to reload extension '{extension_name}': {e}")
 			
-	@prefixed_command()
-	async def leave_guild(self, ctx, guild_id: int):
-		if ctx.author.id not in devs:
+	@developer.subcommand(sub_cmd_name="leave_guild", sub_cmd_description="Make the bot leave a server")
+	@slash_option(
+		name="guild_id",
+		description="The ID of the server to leave",
+		required=True,
+		opt_type=OptionType.STRING
+	)
+	async def leave_guild(self, ctx, guild_id: str):
+		if not await self._check_dev(ctx):
+			return
+		guild_id = await self._parse_guild_id(ctx, guild_id)
+		if guild_id is None:
 			return
+		await ctx.defer(ephemeral=True)
 		guild = self.client.get_guild(guild_id)
 		if guild:
 			await guild.leave()
@@ -123,4 +183,4 @@ class DeveloperCommands(Extension):
 			await ctx.send(f"Guild with ID {guild_id} not found.")
 	
 def setup(client):
-	DeveloperCommands(client)
+	load_for_client(DeveloperCommands, client)
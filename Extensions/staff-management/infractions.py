@@ -1,6 +1,14 @@
-import random, string, ast, re, asyncio, humanfriendly
+import random, string, asyncio, humanfriendly
 from datetime import datetime, timezone, timedelta
-from interactions import Extension, slash_command, slash_option, OptionType, User, Timestamp, AutocompleteContext, Modal, ShortText, listen, Task, IntervalTrigger, Embed
+from interactions import Extension, slash_command, slash_option, OptionType, User, Timestamp, AutocompleteContext, Modal, ShortText, listen, Task, IntervalTrigger
+from Utils.startup import timed
+from Utils.extensions import load_for_client
+from Utils.sharding import owns_guild
+from Utils.mem_cache import infraction_key
+from Utils.models import Infraction
+from Utils.permissions import DENIED, ROLE_MISSING
+from Utils.resolver import edit_message_embed
+from Utils.result_cache import bump_generation
 
 class Infractions(Extension):
 
@@ -17,93 +25,161 @@ class Infractions(Extension):
 
 	def __init__(self, bot):
 		self.scheduled_expirations = {}
+		self.expiry_payloads = {}
 		super().__init__()
 
+	def export_state(self):
+		# Timers are rebuilt from their payloads by the reloaded module, so no collection rescan is needed.
+		return {"expirations": list(self.expiry_payloads.values())}
+
+	def import_state(self, state: dict):
+		for infraction in state.get("expirations", []):
+			self.schedule_infraction_expiry(infraction)
+		self.bot.logger.info(f"Restored {len(self.scheduled_expirations)} infraction expiry timers.")
+
+	def drop(self):
+		for task in self.scheduled_expirations.values():
+			task.cancel()
+		self.scheduled_expirations.clear()
+		self.expiry_payloads.clear()
+		super().drop()
+
 	@listen()
 	async def on_startup(self):
-		await self.schedule_all_expirations()
+		await timed(self.bot, "expiry_scheduling", self.schedule_all_expirations())
 
 	async def schedule_all_expirations(self):
-		now = datetime.utcnow()
-		now_iso = now.isoformat()
 		query = {"expires_at": {"$ne": None}, "expired_notified": {"$ne": True}}
 		pending_infractions = await self.bot.db.infractions.find(query).to_list(length=None)
 
-		for infraction_data in pending_infractions:
-			self.schedule_infraction_expiry(infraction_data)
+		for doc in pending_infractions:
+			infraction = Infraction.from_doc(doc)
+			# Other shard processes schedule their own guilds' expiries. Ownership comes from the shard ids,
+			# not the guild cache, which is still empty when a resumed boot gets here.
+			if owns_guild(self.bot, infraction.guild_id):
+				self.schedule_infraction_expiry(infraction)
 
-	def schedule_infraction_expiry(self, infraction_data: dict):
-		infraction_id = infraction_data["infraction_id"]
-		expires_at_str = infraction_data.get("expires_at")
+	def schedule_infraction_expiry(self, infraction: Infraction):
+		infraction_id = infraction.record_id
 
 		if infraction_id in self.scheduled_expirations:
-			self.scheduled_expirations[infraction_id].cancel()
+			self.scheduled_expirations.pop(infraction_id).cancel()
+			self.expiry_payloads.pop(infraction_id, None)
 
-		if not expires_at_str:
+		if not infraction.expires_at:
 			return
 
-		expires_at = datetime.fromisoformat(expires_at_str)
 		now = datetime.utcnow()
 		
-		if expires_at > now:
-			delay = (expires_at - now).total_seconds()
-			task = asyncio.create_task(self.handle_infraction_expiry(infraction_data, delay=delay))
+		if infraction.expires_at > now:
+			delay = (infraction.expires_at - now).total_seconds()
+			task = asyncio.create_task(self.handle_infraction_expiry(infraction, delay=delay))
 			self.scheduled_expirations[infraction_id] = task
+			self.expiry_payloads[infraction_id] = infraction
 		else:
-			asyncio.create_task(self.handle_infraction_expiry(infraction_data, delay=0))
+			asyncio.create_task(self.handle_infraction_expiry(infraction, delay=0))
 
-	async def handle_infraction_expiry(self, infraction_data: dict, delay: float):
+	async def handle_infraction_expiry(self, infraction: Infraction, delay: float):
 		if delay > 0:
 			await asyncio.sleep(delay)
 
-		infraction_id = infraction_data["infraction_id"]
+		infraction_id = infraction.record_id
+		self.scheduled_expirations.pop(infraction_id, None)
+		self.expiry_payloads.pop(infraction_id, None)
 		fresh_data = await self.bot.db.infractions.find_one({"infraction_id": infraction_id})
 
 		if not fresh_data or fresh_data.get("expired_notified"):
 			return
 
-		await self._update_log_message(fresh_data, "infraction_audit_log", "infraction_audit_message_id")
-		await self._update_log_message(fresh_data, "infraction_log", "infraction_message_id")
-
-		if infraction_id in self.scheduled_expirations:
-			del self.scheduled_expirations[infraction_id]
-
-	async def _update_log_message(self, infraction_data: dict, log_type_key: str, message_id_key: str):
-		guild_id = int(infraction_data["guild_id"])
-		guild = self.bot.get_guild(guild_id)
-		if not guild:
-			return
-
-		config = await self.bot.mem_cache.get(f"guild_config_{guild_id}")
-		if not config:
-			config = await self.bot.db.config.find_one({"guild_id": str(guild_id)}) or {}
-			await self.bot.mem_cache.set(f"guild_config_{guild_id}", config)
-
-		channel_id = config.get(log_type_key)
-		message_id = infraction_data.get(message_id_key)
-
-		if not channel_id or not message_id:
-			return
+		await self._mark_expired(Infraction.from_doc(fresh_data))
+
+	async def _load(self, guild_id, infraction_id: str):
+		doc = await self.bot.db.infractions.find_one({"infraction_id": infraction_id, "guild_id": str(guild_id)})
+		return Infraction.from_doc(doc) if doc else None
+
+	@staticmethod
+	def _discord_time(dt: datetime):
+		return str(Timestamp.fromdatetime(dt.replace(tzinfo=timezone.utc)))
+
+	@classmethod
+	def _expires_display(cls, expires_at: datetime):
+		if not expires_at:
+			return "Never"
+		display = cls._discord_time(expires_at)
+		return f"{display} (expired)" if expires_at < datetime.utcnow() else display
+
+	@classmethod
+	def _expires_line(cls, expires_at: datetime):
+		return f"\n> **Expires:** {cls._discord_time(expires_at)}" if expires_at else ""
+
+	@staticmethod
+	def _render_fields(member, issuer):
+		return {
+			"member": str(member),
+			"member_mention": member.mention,
+			"member_avatar": member.display_avatar.url,
+			"issuer": str(issuer),
+			"issuer_mention": issuer.mention,
+			"issuer_avatar": issuer.display_avatar.url,
+		}
+
+	async def _render(self, infraction: Infraction):
+		# Records written before the render fields were stored fall back to the (cache-first) user lookups.
+		if infraction.render:
+			return infraction.render
+		member = await self.bot.fetch_user(infraction.member_id)
+		issuer = await self.bot.fetch_user(infraction.issued_by_id)
+		return self._render_fields(member, issuer)
+
+	def _log_embed(self, infraction: Infraction, render: dict, expired: bool = False):
+		expires_line = "" if expired else self._expires_line(infraction.expires_at)
+		return {
+			"description": f"**{render['member']}**, you have been infracted.\n\n> **Infraction Type:** {infraction.infraction_type}\n> **Reason:** {infraction.reason if infraction.reason else 'No reason provided'}\n> **Infraction ID:** {infraction.record_id}{expires_line}",
+			"author": {"name": f"Signed, {render['issuer']}", "icon_url": render["issuer_avatar"]},
+			"thumbnail": {"url": render["member_avatar"]},
+		}
+
+	def _audit_embed(self, infraction: Infraction, render: dict, expired: bool = False):
+		status_line = "\n> **Status:** Expired" if expired else self._expires_line(infraction.expires_at)
+		return {
+			"title": "Infraction Audit Log (Expired)" if expired else "Infraction Audit Log",
+			"description": f"> **Member Infracted:** {render['member_mention']}\n> **Infraction Type:** {infraction.infraction_type}\n> **Infracted By:** {render['issuer_mention']}\n> **Reason:** {infraction.reason if infraction.reason else 'No reason provided'}\n> **Infraction ID:** {infraction.record_id}{status_line}",
+			"author": {"name": f"Signed, {render['issuer']}", "icon_url": render["issuer_avatar"]},
+			"thumbnail": {"url": render["member_avatar"]},
+		}
+
+	async def _edit_log_messages(self, infraction: Infraction, log_embed: dict, audit_embed: dict):
+		# Messages are edited by id from the stored channel ids; nothing is fetched to read them back.
+		config = None
+		for channel_id, config_attribute, message_id, embed in (
+			(infraction.channel_id, "infraction_log", infraction.message_id, log_embed),
+			(infraction.audit_channel_id, "infraction_audit_log", infraction.audit_message_id, audit_embed),
+		):
+			if not message_id:
+				continue
+			if not channel_id:
+				config = config or await self.bot.guild_config.get(infraction.guild_id)
+				channel_id = getattr(config, config_attribute)
+			if not channel_id:
+				continue
+			try:
+				await edit_message_embed(self.bot, channel_id, message_id, embed)
+			except Exception as e:
+				self.bot.logger.warning(f"Could not update log message for infraction {infraction.record_id}: {e}")
 
+	async def _mark_expired(self, infraction: Infraction):
 		try:
-			channel = await self.bot.fetch_channel(int(channel_id))
-			message = await channel.fetch_message(int(message_id))
-			
-			if not message.embeds:
-				return
-
-			original_embed = message.embeds[0]
-			new_embed = original_embed.to_dict()
-
-			if 'title' in new_embed and new_embed['title']:
-				if "(Expired)" not in new_embed['title']: new_embed['title'] = f"{new_embed['title']} (Expired)"
-			
-			if 'description' in new_embed:
-				new_embed['description'] = re.sub(r'\n> \*\*Expires:\*\* .*', '', new_embed['description'])
-
-			await message.edit(embed=Embed.from_dict(new_embed))
-		except Exception:
-			pass
+			render = await self._render(infraction)
+			await self._edit_log_messages(infraction, self._log_embed(infraction, render, expired=True), self._audit_embed(infraction, render, expired=True))
+		except Exception as e:
+			self.bot.logger.warning(f"Could not update expired infraction message for {infraction.record_id}: {e}")
+		finally:
+			await self.bot.db.infractions.update_one(
+				{"_id": infraction._id},
+				{"$set": {"expired_notified": True}}
+			)
+			infraction.expired_notified = True
+			await self.bot.mem_cache.set(infraction_key(infraction.guild_id, infraction.record_id), infraction)
 
 	@slash_command(name="infractions", description="Infractions management commands")
 	async def infractions(self, ctx):
@@ -138,98 +214,66 @@ class Infractions(Extension):
 	async def infract(self, ctx, member: User, type: str, reason: str = None, temporary: str = None):
 		await ctx.defer(ephemeral=True)
 
-		config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-		if not config:
-			config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-			if not config:
-				config = {}
-			await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-		infraction_issuer_role_id = config.get("infraction_issuer_role")
-
-		if infraction_issuer_role_id:
-			infraction_issuer_role = ctx.guild.get_role(int(infraction_issuer_role_id))
-			if not infraction_issuer_role:
-				try:
-					infraction_issuer_role = await ctx.guild.fetch_role(int(infraction_issuer_role_id))
-				except Exception:
-					infraction_issuer_role = None
-			if not infraction_issuer_role:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
-				return
-			if infraction_issuer_role not in ctx.author.roles:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to infract others."}, ephemeral=True)
-				return
+		config = await self.bot.guild_config.get(ctx.guild.id)
+		permission = await self.bot.permissions.check(ctx.guild, ctx.author, "infract")
+		if permission == ROLE_MISSING:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
+			return
+		if permission == DENIED:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to infract others."}, ephemeral=True)
+			return
 			
 		if member.id == ctx.author.id:
 			await ctx.send(embed={"description": "<:warning:1430730420307234916> You cannot infract yourself."}, ephemeral=True)
 			return
 		
-		infraction_types = config.get("infraction_types", []) or []
-		if type not in infraction_types:
+		if type not in config.infraction_types:
 			await ctx.send(embed={"description": "<:warning:1430730420307234916> The specified infraction type is not valid."}, ephemeral=True)
 			return
 
 		temporary_value = temporary.strip() if temporary else None
-		expires_at_iso = None
-		expiration_display = None
+		expiration_dt = None
 		if temporary_value:
 			expiration_dt = self.parse_temporary_duration(temporary_value)
 			if not expiration_dt:
 				await ctx.send(embed={"description": "<:warning:1430730420307234916> Temporary duration must be formatted like 30d, 1w, or 2h30m."}, ephemeral=True)
 				return
-			expires_at_iso = expiration_dt.isoformat()
-			try:
-				expiration_display = str(Timestamp.fromdatetime(expiration_dt.replace(tzinfo=timezone.utc)))
-			except Exception:
-				expiration_display = None
-		expires_line = f"\n> **Expires:** {expiration_display}" if expiration_display else ""
+		expiration_display = self._discord_time(expiration_dt) if expiration_dt else None
+		expires_line = self._expires_line(expiration_dt)
 
-		issued_at = datetime.utcnow()
-		timestamp_iso = issued_at.isoformat()
 		infraction_id = (random.choices(string.ascii_uppercase + string.digits, k=8))
 		infraction_id_str = ''.join(infraction_id)
-			
-		infraction_channel_id = config.get("infraction_log")
-		infraction_message = None
-		infraction_audit_message = None
-		if infraction_channel_id:
-			infraction_channel = ctx.guild.get_channel(int(infraction_channel_id))
-			if not infraction_channel:
-				try:
-					infraction_channel = await ctx.guild.fetch_channel(int(infraction_channel_id))
-				except Exception:
-					infraction_channel = None
+		infraction = Infraction(
+			record_id=infraction_id_str,
+			guild_id=ctx.guild.id,
+			member_id=member.id,
+			issued_by_id=ctx.author.id,
+			infraction_type=type,
+			reason=reason,
+			timestamp=datetime.utcnow(),
+			expires_at=expiration_dt,
+			temporary_duration=temporary_value,
+			# Enough to re-render both log embeds later, so edits never have to fetch users or messages.
+			render=self._render_fields(member, ctx.author),
+		)
+
+		if config.infraction_log:
+			infraction_channel = await self.bot.resolver.channel(ctx.guild, config.infraction_log)
 			if infraction_channel:
-				infraction_message = await infraction_channel.send(
-					f"{member.mention}",
-					embed={
-						"description": f"**{member}**, you have been infracted.\n\n> **Infraction Type:** {type}\n> **Reason:** {reason if reason else 'No reason provided'}\n> **Infraction ID:** {infraction_id_str}{expires_line}",
-						"author": {"name": f"Signed, {ctx.author}", "icon_url": ctx.author.display_avatar.url},
-						"thumbnail": {"url": member.display_avatar.url},
-					}
-				)
-		infraction_audit_channel_id = config.get("infraction_audit_log")
-		infraction_audit_message = None
-		if infraction_audit_channel_id:
-			infraction_audit_channel = ctx.guild.get_channel(int(infraction_audit_channel_id))
-			if not infraction_audit_channel:
-				try:
-					infraction_audit_channel = await ctx.guild.fetch_channel(int(infraction_audit_channel_id))
-				except Exception:
-					infraction_audit_channel = None
+				infraction_message = await infraction_channel.send(f"{member.mention}", embed=self._log_embed(infraction, infraction.render))
+				infraction.message_id = int(infraction_message.id)
+				infraction.channel_id = int(infraction_channel.id)
+		if config.infraction_audit_log:
+			infraction_audit_channel = await self.bot.resolver.channel(ctx.guild, config.infraction_audit_log)
 			if infraction_audit_channel:
-				infraction_audit_message = await infraction_audit_channel.send(
-					embed={
-						"title": "Infraction Audit Log",
-						"description": f"> **Member Infracted:** {member.mention}\n> **Infraction Type:** {type}\n> **Infracted By:** {ctx.author.mention}\n> **Reason:** {reason if reason else 'No reason provided'}\n> **Infraction ID:** {infraction_id_str}{expires_line}",
-						"author": {"name": f"Signed, {ctx.author}", "icon_url": ctx.author.display_avatar.url},
-						"thumbnail": {"url": member.display_avatar.url},
-					}
-				)
+				infraction_audit_message = await infraction_audit_channel.send(embed=self._audit_embed(infraction, infraction.render))
+				infraction.audit_message_id = int(infraction_audit_message.id)
+				infraction.audit_channel_id = int(infraction_audit_channel.id)
 		
 		try:
-			await member.send(
-				embed={
+			await self.bot.dms.send(
+				member,
+				{
 					"description": f"You have been infracted in **{ctx.guild.name}**!\n\n> **Infraction Type** {type}\n> **Reason:** {reason if reason else 'No reason provided'}\n> **Infraction ID:** {infraction_id_str}{expires_line}",
 					"author": {"name": f"Signed, {ctx.author}", "icon_url": ctx.author.display_avatar.url},
 					"footer": {"text": f"{self.bot.user.username}", "icon_url": self.bot.user.display_avatar.url},
@@ -238,34 +282,12 @@ class Infractions(Extension):
 			)
 		except Exception as e:
 			pass
-		await self.bot.db.infractions.insert_one({
-			"infraction_id": infraction_id_str,
-			"guild_id": str(ctx.guild.id),
-			"member_id": str(member.id),
-			"infraction_type": type,
-			"issued_by_id": str(ctx.author.id),
-			"infraction_message_id": infraction_message.id if infraction_message else None,
-			"infraction_audit_message_id": infraction_audit_message.id if infraction_audit_message else None,
-			"reason": reason,
-			"timestamp": timestamp_iso,
-			"expires_at": expires_at_iso,
-			"temporary_duration": temporary_value
-		})
-		await self.bot.mem_cache.set(f"infraction_{infraction_id_str}", {
-			"infraction_id": infraction_id_str,
-			"guild_id": str(ctx.guild.id),
-			"member_id": str(member.id),
-			"infraction_type": type,
-			"issued_by_id": str(ctx.author.id),
-			"infraction_message_id": infraction_message.id if infraction_message else None,
-			"infraction_audit_message_id": infraction_audit_message.id if infraction_audit_message else None,
-			"reason": reason,
-			"timestamp": timestamp_iso,
-			"expires_at": expires_at_iso,
-			"temporary_duration": temporary_value
-		})
-		if expires_at_iso:
-			self.schedule_infraction_expiry(await self.bot.db.infractions.find_one({"infraction_id": infraction_id_str}))
+		# The expiry path needs the _id.
+		infraction._id = (await self.bot.db.infractions.insert_one(infraction.to_doc())).inserted_id
+		await self.bot.mem_cache.set(infraction_key(ctx.guild.id, infraction_id_str), infraction)
+		await bump_generation(self.bot.mem_cache, ctx.guild.id)
+		if infraction.expires_at:
+			self.schedule_infraction_expiry(infraction)
 		await ctx.send(
 			embed={
 				"description": f"<:check:1430728952535842907> Successfully infracted **{member}**{f' (expires {expiration_display})' if expiration_display else ''}.",
@@ -275,41 +297,10 @@ class Infractions(Extension):
 
 	@infractions.autocomplete("type")
 	async def infraction_type_autocomplete(self, ctx: AutocompleteContext):
-		cfg = await self.bot.mem_cache.get(f"config_{ctx.guild.id}")
-		if isinstance(cfg, str):
-			try:
-				cfg = ast.literal_eval(cfg)
-			except Exception:
-				cfg = {}
-		if not cfg:
-			cfg = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)}) or {}
-			await self.bot.mem_cache.set(f"config_{ctx.guild.id}", cfg)
-
-		infraction_types = cfg.get("infraction_types", []) or []
-
-		if isinstance(infraction_types, str):
-			try:
-				parsed = ast.literal_eval(infraction_types)
-				infraction_types = parsed if isinstance(parsed, list) else [parsed]
-			except Exception:
-				infraction_types = [infraction_types]
+		cfg = await self.bot.guild_config.get(ctx.guild.id)
 
-		if not isinstance(infraction_types, list):
-			infraction_types = [str(infraction_types)]
-
-		cleaned = []
-		seen = set()
-		for item in infraction_types:
-			if item is None:
-				continue
-			s = str(item).strip()
-			if not s:
-				continue
-			s = s[:100]
-			if s in seen:
-				continue
-			seen.add(s)
-			cleaned.append(s)
+		# Already cleaned (stringified, trimmed to 100 chars, de-duplicated) when the config was loaded.
+		cleaned = cfg.infraction_types
 
 		q = (getattr(ctx, "input_text", "") or "").lower()
 		if q:
@@ -352,27 +343,13 @@ class Infractions(Extension):
 	async def view_infraction(self, ctx, infraction_id: str = None, member: User = None):
 		await ctx.defer(ephemeral=True)
 
-		config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-		if not config:
-			config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-			if not config:
-				config = {}
-			await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-		infraction_issuer_role_id = config.get("infraction_issuer_role")
-
-		if infraction_issuer_role_id:
-			infraction_issuer_role = ctx.guild.get_role(int(infraction_issuer_role_id))
-			if not infraction_issuer_role:
-				try:
-					infraction_issuer_role = await ctx.guild.fetch_role(int(infraction_issuer_role_id))
-				except Exception:
-					infraction_issuer_role = None
-			if not infraction_issuer_role:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
-				return
-			if infraction_issuer_role not in ctx.author.roles:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to view infractions."}, ephemeral=True)
-				return
+		permission = await self.bot.permissions.check(ctx.guild, ctx.author, "infract")
+		if permission == ROLE_MISSING:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
+			return
+		if permission == DENIED:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to view infractions."}, ephemeral=True)
+			return
 		
 		if not infraction_id and not member:
 			return await ctx.send(embed={"description": "<:warning:1430730420307234916> You must provide either an Infraction ID or a member to view."}, ephemeral=True)
@@ -381,61 +358,28 @@ class Infractions(Extension):
 			return await ctx.send(embed={"description": "<:warning:1430730420307234916> You can only provide an Infraction ID or a member, not both."}, ephemeral=True)
 
 		if infraction_id:
-			infraction_data = await self.bot.mem_cache.get(f"infraction_{infraction_id}")
-
-			if not infraction_data:
-				infraction_data = await self.bot.db.infractions.find_one(
-					{"infraction_id": infraction_id, "guild_id": str(ctx.guild.id)}
+			infraction = await self.bot.loader.get(infraction_key(ctx.guild.id, infraction_id), lambda: self._load(ctx.guild.id, infraction_id))
+			if not infraction:
+				await ctx.send(
+					embed={
+						"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID.",
+					},
+					ephemeral=True
 				)
-				if not infraction_data:
-					await ctx.send(
-						embed={
-							"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID.",
-						},
-						ephemeral=True
-					)
-					return
-				await self.bot.mem_cache.set(f"infraction_{infraction_id}", infraction_data)
-			else:
-				if infraction_data.get("guild_id") != str(ctx.guild.id):
-					await ctx.send(
-						embed={
-							"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID.",
-						},
-						ephemeral=True
-					)
-					return
+				return
 			
-			member_obj = ctx.guild.get_member(int(infraction_data["member_id"])) or await self.bot.fetch_user(int(infraction_data["member_id"]))
-			infraction_type = infraction_data.get("infraction_type", "Unknown")
-			issued_by = ctx.guild.get_member(int(infraction_data["issued_by_id"])) or await self.bot.fetch_user(int(infraction_data["issued_by_id"]))
-
-			timestamp = infraction_data.get("timestamp")
-			if timestamp:
-				try:
-					dt = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
-					timestamp = str(Timestamp.fromdatetime(dt))
-				except Exception:
-					timestamp = "Unknown"
-			else:
-				timestamp = "Unknown"
-			expires_at = infraction_data.get("expires_at")
-			expires_display = "Never"
-			if expires_at:
-				try:
-					expires_dt = datetime.fromisoformat(expires_at)
-					display_dt = Timestamp.fromdatetime(expires_dt.replace(tzinfo=timezone.utc))
-					expires_display = str(display_dt)
-					if expires_dt < datetime.utcnow():
-						expires_display = f"{expires_display} (expired)"
-				except Exception:
-					expires_display = "Unknown"
+			member_obj = await ctx.guild.fetch_member(infraction.member_id) or await self.bot.fetch_user(infraction.member_id)
+			infraction_type = infraction.infraction_type or "Unknown"
+			issued_by = await ctx.guild.fetch_member(infraction.issued_by_id) or await self.bot.fetch_user(infraction.issued_by_id)
+
+			timestamp = self._discord_time(infraction.timestamp) if infraction.timestamp else "Unknown"
+			expires_display = self._expires_display(infraction.expires_at)
 
 			description_lines = [
-				f"> **Member:** {member_obj.mention if member_obj else f'ID: {infraction_data['member_id']}'}",
+				f"> **Member:** {member_obj.mention if member_obj else f'ID: {infraction.member_id}'}",
 				f"> **Infraction Type:** {infraction_type}",
-				f"> **Issued By:** {issued_by.mention if issued_by else f'ID: {infraction_data['issued_by_id']}'}",
-				f"> **Reason:** {infraction_data.get('reason') or 'No reason provided'}",
+				f"> **Issued By:** {issued_by.mention if issued_by else f'ID: {infraction.issued_by_id}'}",
+				f"> **Reason:** {infraction.reason or 'No reason provided'}",
 				f"> **Issued At:** {timestamp}",
 				f"> **Expires:** {expires_display}",
 			]
@@ -452,38 +396,27 @@ class Infractions(Extension):
 
 		if member:
 			infractions_cursor = self.bot.db.infractions.find({"member_id": str(member.id), "guild_id": str(ctx.guild.id)})
-			infractions_list = await infractions_cursor.to_list(length=100)
+			infractions_list = [Infraction.from_doc(doc) for doc in await infractions_cursor.to_list(length=100)]
 
 			if not infractions_list:
 				return await ctx.send(embed={"description": f"No infractions found for **{member}**."}, ephemeral=True)
 
 			description_lines = []
 			for infrac in infractions_list:
-				timestamp_str = "Unknown"
-				if infrac.get("timestamp"):
-					try:
-						dt = datetime.fromisoformat(infrac["timestamp"]).replace(tzinfo=timezone.utc)
-						timestamp_str = str(Timestamp.fromdatetime(dt))
-					except Exception:
-						pass
+				timestamp_str = self._discord_time(infrac.timestamp) if infrac.timestamp else "Unknown"
 				
-				infrac_type = infrac.get('infraction_type', 'Unknown')
-				reason = infrac.get('reason') or 'No reason provided'
+				infrac_type = infrac.infraction_type or 'Unknown'
+				reason = infrac.reason or 'No reason provided'
 				
 				expires_str = ""
-				if infrac.get("expires_at"):
-					try:
-						expires_dt = datetime.fromisoformat(infrac["expires_at"])
-						if expires_dt > datetime.utcnow():
-							expires_ts = Timestamp.fromdatetime(expires_dt.replace(tzinfo=timezone.utc))
-							expires_str = f" (Expires {expires_ts})"
-						else:
-							expires_str = " (Expired)"
-					except Exception:
-						pass
+				if infrac.expires_at:
+					if infrac.expires_at > datetime.utcnow():
+						expires_str = f" (Expires {self._discord_time(infrac.expires_at)})"
+					else:
+						expires_str = " (Expired)"
 
 				description_lines.append(
-					f"**ID:** `{infrac['infraction_id']}` - {timestamp_str}\n"
+					f"**ID:** `{infrac.record_id}` - {timestamp_str}\n"
 					f"**Type:** {infrac_type} - **Reason:** *{reason}*{expires_str}"
 				)
 
@@ -505,131 +438,48 @@ class Infractions(Extension):
 	async def revoke_infraction(self, ctx, infraction_id: str):
 		await ctx.defer(ephemeral=True)
 
-		config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-		if not config:
-			config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-			if not config:
-				config = {}
-			await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-		infraction_issuer_role_id = config.get("infraction_issuer_role")
-
-		if infraction_issuer_role_id:
-			infraction_issuer_role = ctx.guild.get_role(int(infraction_issuer_role_id))
-			if not infraction_issuer_role:
-				try:
-					infraction_issuer_role = await ctx.guild.fetch_role(int(infraction_issuer_role_id))
-				except Exception:
-					infraction_issuer_role = None
-			if not infraction_issuer_role:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
-				return
-			if infraction_issuer_role not in ctx.author.roles:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to revoke infractions."}, ephemeral=True)
-				return
-
-		infraction_data = await self.bot.mem_cache.get(f"infraction_{infraction_id}")
+		permission = await self.bot.permissions.check(ctx.guild, ctx.author, "infract")
+		if permission == ROLE_MISSING:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
+			return
+		if permission == DENIED:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to revoke infractions."}, ephemeral=True)
+			return
 
-		if not infraction_data:
-			infraction_data = await self.bot.db.infractions.find_one(
-				{"infraction_id": infraction_id, "guild_id": str(ctx.guild.id)}
+		infraction = await self.bot.loader.get(infraction_key(ctx.guild.id, infraction_id), lambda: self._load(ctx.guild.id, infraction_id))
+		if not infraction:
+			await ctx.send(
+				embed={
+					"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID.",
+				},
+				ephemeral=True
 			)
-			if not infraction_data:
-				await ctx.send(
-					embed={
-						"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID.",
-					},
-					ephemeral=True
-				)
-				return
-			await self.bot.mem_cache.set(f"infraction_{infraction_id}", infraction_data)
-		else:
-			if infraction_data.get("guild_id") != str(ctx.guild.id):
-				await ctx.send(
-					embed={
-						"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID.",
-					},
-					ephemeral=True
-				)
-				return
+			return
 		
-		member = ctx.guild.get_member(int(infraction_data["member_id"]))
+		member = await ctx.guild.fetch_member(infraction.member_id)
 		if not member:
 			try:
-				member = await self.bot.fetch_user(int(infraction_data["member_id"]))
+				member = await self.bot.fetch_user(infraction.member_id)
 			except Exception:
 				member = None
 		if member.id == ctx.author.id:
 			await ctx.send(embed={"description": "<:warning:1430730420307234916> You cannot revoke your own infraction."}, ephemeral=True)
 			return
-		infraction_type = infraction_data.get("infraction_type", "Unknown")
+		infraction_type = infraction.infraction_type or "Unknown"
 
 		if member:
-			timestamp = infraction_data.get("timestamp")
-			if timestamp:
-				try:
-					dt = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
-					timestamp = str(Timestamp.fromdatetime(dt))
-				except Exception:
-					timestamp = "Unknown"
-			else:
-				timestamp = "Unknown"
-			expires_at = infraction_data.get("expires_at")
-			expires_display = "Never"
-			if expires_at:
-				try:
-					expires_dt = datetime.fromisoformat(expires_at)
-					display_dt = Timestamp.fromdatetime(expires_dt.replace(tzinfo=timezone.utc))
-					expires_display = str(display_dt)
-					if expires_dt < datetime.utcnow():
-						expires_display = f"{expires_display} (expired)"
-				except Exception:
-					expires_display = "Unknown"
-			temporary_value = infraction_data.get("temporary_duration") or ""
+			timestamp = self._discord_time(infraction.timestamp) if infraction.timestamp else "Unknown"
+			expires_display = self._expires_display(infraction.expires_at)
+			temporary_value = infraction.temporary_duration or ""
 			infraction_revoked_embed = {
-				"description": f"***Infraction ID {infraction_id} has been revoked by {ctx.author} ({ctx.author.id})***\n\n> **Member:** {member} `({member.id})`\n> **Infraction Type**: {infraction_type}\n> **Original Reason:** {infraction_data['reason'] if infraction_data['reason'] else 'No reason provided'}\n> **Issued At:** {timestamp}\n> **Expires:** {expires_display}\n> **Temporary Input:** {temporary_value if temporary_value else 'None'}",
+				"description": f"***Infraction ID {infraction_id} has been revoked by {ctx.author} ({ctx.author.id})***\n\n> **Member:** {member} `({member.id})`\n> **Infraction Type**: {infraction_type}\n> **Original Reason:** {infraction.reason if infraction.reason else 'No reason provided'}\n> **Issued At:** {timestamp}\n> **Expires:** {expires_display}\n> **Temporary Input:** {temporary_value if temporary_value else 'None'}",
 				"thumbnail": {"url": member.display_avatar.url},
 				"author": {"name": f"Signed, {ctx.author}", "icon_url":ctx.author.display_avatar.url},
 			}
-			infraction_message_id = infraction_data.get("infraction_message_id")
-			if infraction_message_id:
-				config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-				if not config:
-					config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-					if not config:
-						config = {}
-					await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-				infraction_channel_id = config.get("infraction_log")
-				if infraction_channel_id:
-					infraction_channel = ctx.guild.get_channel(int(infraction_channel_id))
-					if not infraction_channel:
-						try:
-							infraction_channel = await ctx.guild.fetch_channel(int(infraction_channel_id))
-						except Exception:
-							infraction_channel = None
-					if infraction_channel:
-						try:
-							infraction_message = await infraction_channel.fetch_message(infraction_message_id)
-							await infraction_message.edit(embed=infraction_revoked_embed)
-						except Exception:
-							pass
-				infraction_audit_channel_id = config.get("infraction_audit_log")
-				if infraction_audit_channel_id:
-					infraction_audit_channel = ctx.guild.get_channel(int(infraction_audit_channel_id))
-					if not infraction_audit_channel:
-						try:
-							infraction_audit_channel = await ctx.guild.fetch_channel(int(infraction_audit_channel_id))
-						except Exception:
-							infraction_audit_channel = None
-					if infraction_audit_channel:
-						infraction_audit_message_id = infraction_data.get("infraction_audit_message_id")
-						if infraction_audit_message_id:
-							try:
-								infraction_audit_message = await infraction_audit_channel.fetch_message(infraction_audit_message_id)
-								await infraction_audit_message.edit(embed=infraction_revoked_embed)
-							except Exception:
-								pass
+			await self._edit_log_messages(infraction, infraction_revoked_embed, infraction_revoked_embed)
 			await self.bot.db.infractions.delete_one({"infraction_id": infraction_id, "guild_id": str(ctx.guild.id)})
-			await self.bot.mem_cache.delete(f"infraction_{infraction_id}")
+			await self.bot.mem_cache.delete(infraction_key(ctx.guild.id, infraction_id))
+			await bump_generation(self.bot.mem_cache, ctx.guild.id)
 			await ctx.send(
 				embed={
 					"description": f"<:check:1430728952535842907> Successfully revoked infraction of **{member}**.",
@@ -653,40 +503,22 @@ class Infractions(Extension):
 	)
 	async def edit_infraction(self, ctx, infraction_id: str):
 
-		config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-		if not config:
-			config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-			if not config:
-				config = {}
-			await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-		infraction_issuer_role_id = config.get("infraction_issuer_role")
-
-		if infraction_issuer_role_id:
-			infraction_issuer_role = ctx.guild.get_role(int(infraction_issuer_role_id))
-			if not infraction_issuer_role:
-				try:
-					infraction_issuer_role = await ctx.guild.fetch_role(int(infraction_issuer_role_id))
-				except Exception:
-					infraction_issuer_role = None
-			if not infraction_issuer_role:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
-				return
-			if infraction_issuer_role not in ctx.author.roles:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to edit infractions."}, ephemeral=True)
-				return
+		permission = await self.bot.permissions.check(ctx.guild, ctx.author, "infract")
+		if permission == ROLE_MISSING:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> Infraction issuer role not found in the guild."}, ephemeral=True)
+			return
+		if permission == DENIED:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to edit infractions."}, ephemeral=True)
+			return
 
-		infraction_data = await self.bot.mem_cache.get(f"infraction_{infraction_id}")
-		if not infraction_data:
-			infraction_data = await self.bot.db.infractions.find_one(
-				{"infraction_id": infraction_id, "guild_id": str(ctx.guild.id)}
-			)
-			if not infraction_data:
-				await ctx.send(embed={"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID."}, ephemeral=True)
-				return
+		infraction = await self.bot.loader.get(infraction_key(ctx.guild.id, infraction_id), lambda: self._load(ctx.guild.id, infraction_id))
+		if not infraction:
+			await ctx.send(embed={"description": "<:warning:1430730420307234916> No infraction found with the given Infraction ID."}, ephemeral=True)
+			return
 
 		modal = Modal(
-			ShortText(label="Reason", custom_id="reason", value=infraction_data.get("reason"), placeholder="New reason for the infraction", required=False),
-			ShortText(label="Temporary Duration", custom_id="temporary", value=infraction_data.get("temporary_duration"), placeholder="e.g., 30d, 1w (leave blank for permanent)", required=False),
+			ShortText(label="Reason", custom_id="reason", value=infraction.reason, placeholder="New reason for the infraction", required=False),
+			ShortText(label="Temporary Duration", custom_id="temporary", value=infraction.temporary_duration, placeholder="e.g., 30d, 1w (leave blank for permanent)", required=False),
 			title=f"Editing Infraction {infraction_id}",
 		)
 		await ctx.send_modal(modal)
@@ -696,69 +528,34 @@ class Infractions(Extension):
 		new_temporary = modal_ctx.responses["temporary"]
 
 		temporary_value = new_temporary.strip() if new_temporary else None
-		expires_at_iso = None
-		expiration_display = None
+		expiration_dt = None
 		if temporary_value:
 			expiration_dt = self.parse_temporary_duration(temporary_value)
 			if not expiration_dt:
 				await modal_ctx.send(embed={"description": "<:warning:1430730420307234916> Temporary duration must be formatted like 30d, 1w, or 2h30m."}, ephemeral=True)
 				return
-			expires_at_iso = expiration_dt.isoformat()
-			try:
-				expiration_display = str(Timestamp.fromdatetime(expiration_dt.replace(tzinfo=timezone.utc)))
-			except Exception:
-				expiration_display = None
-		expires_line = f"\n> **Expires:** {expiration_display}" if expiration_display else ""
 
-		infraction_data["reason"] = new_reason
-		infraction_data["temporary_duration"] = temporary_value
-		infraction_data["expires_at"] = expires_at_iso
+		# The loaded model is the cached instance; edit a copy and cache it only once the write has gone through.
+		infraction = Infraction.from_doc(infraction.to_doc())
+		infraction.reason = new_reason
+		infraction.temporary_duration = temporary_value
+		infraction.expires_at = expiration_dt
 
 		await self.bot.db.infractions.update_one(
 			{"infraction_id": infraction_id, "guild_id": str(ctx.guild.id)},
-			{"$set": {"reason": new_reason, "temporary_duration": temporary_value, "expires_at": expires_at_iso}}
+			{"$set": {"reason": new_reason, "temporary_duration": temporary_value, "expires_at": expiration_dt.isoformat() if expiration_dt else None}}
 		)
-		await self.bot.mem_cache.set(f"infraction_{infraction_id}", infraction_data)
+		await self.bot.mem_cache.set(infraction_key(ctx.guild.id, infraction_id), infraction)
+		await bump_generation(self.bot.mem_cache, ctx.guild.id)
 		
-		self.schedule_infraction_expiry(infraction_data)
-
-
-		member = await self.bot.fetch_user(int(infraction_data["member_id"]))
-		issuer = await self.bot.fetch_user(int(infraction_data["issued_by_id"]))
-		infraction_type = infraction_data.get("infraction_type")
-
-		infraction_message_id = infraction_data.get("infraction_message_id")
-		infraction_channel_id = config.get("infraction_log")
-		if infraction_message_id and infraction_channel_id:
-			try:
-				channel = await self.bot.fetch_channel(int(infraction_channel_id))
-				message = await channel.fetch_message(infraction_message_id)
-				await message.edit(
-					embed={
-						"description": f"**{member}**, you have been infracted.\n\n> **Infraction Type:** {infraction_type}\n> **Reason:** {new_reason if new_reason else 'No reason provided'}\n> **Infraction ID:** {infraction_id}{expires_line}",
-						"author": {"name": f"Signed, {issuer}", "icon_url": issuer.display_avatar.url},
-						"thumbnail": {"url": member.display_avatar.url},
-					}
-				)
-			except Exception:
-				pass
+		self.schedule_infraction_expiry(infraction)
 
-		infraction_audit_message_id = infraction_data.get("infraction_audit_message_id")
-		infraction_audit_channel_id = config.get("infraction_audit_log")
-		if infraction_audit_message_id and infraction_audit_channel_id:
-			try:
-				channel = await self.bot.fetch_channel(int(infraction_audit_channel_id))
-				message = await channel.fetch_message(infraction_audit_message_id)
-				await message.edit(
-					embed={
-						"title": "Infraction Audit Log",
-						"description": f"> **Member Infracted:** {member.mention}\n> **Infraction Type:** {infraction_type}\n> **Infracted By:** {issuer.mention}\n> **Reason:** {new_reason if new_reason else 'No reason provided'}\n> **Infraction ID:** {infraction_id}{expires_line}",
-						"author": {"name": f"Signed, {issuer}", "icon_url": issuer.display_avatar.url},
-						"thumbnail": {"url": member.display_avatar.url},
-					}
-				)
-			except Exception:
-				pass
+		# The edit is saved by now, so a log message that can't be re-rendered mustn't cost the user their reply.
+		try:
+			render = await self._render(infraction)
+			await self._edit_log_messages(infraction, self._log_embed(infraction, render), self._audit_embed(infraction, render))
+		except Exception as e:
+			self.bot.logger.warning(f"Could not update log messages for edited infraction {infraction.record_id}: {e}")
 
 		await modal_ctx.send(
 			embed={
@@ -772,57 +569,17 @@ class Infractions(Extension):
 		if not self.bot.ready:
 			return
 
-		now = datetime.utcnow()
-		now_iso = now.isoformat()
+		now_iso = datetime.utcnow().isoformat()
 
 		query = {"expires_at": {"$ne": None, "$lt": now_iso}, "expired_notified": {"$ne": True}}
 		expired_infractions = await self.bot.db.infractions.find(query).to_list(length=None)
 
-		for infraction_data in expired_infractions:
-			guild_id = int(infraction_data["guild_id"])
-			guild = self.bot.get_guild(guild_id)
-			if not guild:
-				continue
-
-			config = await self.bot.mem_cache.get(f"guild_config_{guild_id}")
-			if not config:
-				config = await self.bot.db.config.find_one({"guild_id": str(guild_id)}) or {}
-				await self.bot.mem_cache.set(f"guild_config_{guild_id}", config)
-
-			audit_channel_id = config.get("infraction_audit_log")
-			audit_message_id = infraction_data.get("infraction_audit_message_id")
-
-			if not audit_channel_id or not audit_message_id:
-				await self.bot.db.infractions.update_one(
-					{"_id": infraction_data["_id"]},
-					{"$set": {"expired_notified": True}}
-				)
+		for doc in expired_infractions:
+			infraction = Infraction.from_doc(doc)
+			if not owns_guild(self.bot, infraction.guild_id) or not self.bot.get_guild(infraction.guild_id):
 				continue
 
-			try:
-				audit_channel = await self.bot.fetch_channel(int(audit_channel_id))
-				audit_message = await audit_channel.fetch_message(int(audit_message_id))
-				
-				original_embed = audit_message.embeds[0]
-				new_embed = original_embed.to_dict()
-
-				new_embed['title'] = f"{new_embed.get('title', 'Infraction Audit Log')} (Expired)"
-				
-				if 'description' in new_embed:
-					new_embed['description'] = re.sub(r'\n> \*\*Expires:\*\* .*', '', new_embed['description'])
-					new_embed['description'] += "\n> **Status:** Expired"
-
-				await audit_message.edit(embed=new_embed)
-
-			except Exception as e:
-				print(f"Could not update expired infraction message for {infraction_data['infraction_id']}: {e}")
-			finally:
-				await self.bot.db.infractions.update_one(
-					{"_id": infraction_data["_id"]},
-					{"$set": {"expired_notified": True}}
-				)
-				infraction_data['expired_notified'] = True
-				await self.bot.mem_cache.set(f"infraction_{infraction_data['infraction_id']}", infraction_data)
+			await self._mark_expired(infraction)
 
 def setup(bot):
-	Infractions(bot)
+	load_for_client(Infractions, bot)
@@ -1,9 +1,78 @@
 import random, string
 from datetime import datetime, timezone
 from interactions import Extension, slash_command, slash_option, OptionType, User, Role, Timestamp, Modal, ShortText
+from Utils.extensions import load_for_client
+from Utils.mem_cache import promotion_key
+from Utils.models import Promotion
+from Utils.permissions import DENIED, ROLE_MISSING
+from Utils.resolver import edit_message_embed
+from Utils.result_cache import bump_generation
 
 class Promotions(Extension):
 
+    @staticmethod
+    def _render_fields(member, issuer, role_name: str):
+        return {
+            "member": str(member),
+            "member_mention": member.mention,
+            "member_avatar": member.display_avatar.url,
+            "issuer": str(issuer),
+            "issuer_mention": issuer.mention,
+            "issuer_avatar": issuer.display_avatar.url,
+            "role_name": role_name,
+        }
+
+    async def _render(self, guild, promotion: Promotion):
+        # Records written before the render fields were stored fall back to the (cache-first) lookups.
+        if promotion.render:
+            return promotion.render
+        member = await self.bot.fetch_user(promotion.member_id)
+        issuer = await self.bot.fetch_user(promotion.issued_by_id)
+        role = await self.bot.resolver.role(guild, promotion.new_role_id)
+        return self._render_fields(member, issuer, role.name if role else "Role not found")
+
+    async def _load(self, guild_id, promotion_id: str):
+        doc = await self.bot.db.promotions.find_one({"promotion_id": promotion_id, "guild_id": str(guild_id)})
+        return Promotion.from_doc(doc) if doc else None
+
+    @staticmethod
+    def _discord_time(dt: datetime):
+        return str(Timestamp.fromdatetime(dt.replace(tzinfo=timezone.utc)))
+
+    def _log_embed(self, promotion: Promotion, render: dict):
+        return {
+            "description": f"**{render['member']}**, you have been promoted.\n\n> **New Role:** @{render['role_name']}\n> **Reason:** {promotion.reason if promotion.reason else 'No reason provided'}\n> **Promotion ID:** {promotion.record_id}",
+            "author": {"name": f"Signed, {render['issuer']}", "icon_url": render["issuer_avatar"]},
+            "thumbnail": {"url": render["member_avatar"]},
+        }
+
+    def _audit_embed(self, promotion: Promotion, render: dict):
+        return {
+            "title": "Promotion Audit Log",
+            "description": f"> **Member Promoted:** {render['member_mention']}\n> **New Role:** @{render['role_name']}\n> **Promoted By:** {render['issuer_mention']}\n> **Reason:** {promotion.reason if promotion.reason else 'No reason provided'}\n> **Promotion ID:** {promotion.record_id}",
+            "author": {"name": f"Signed, {render['issuer']}", "icon_url": render["issuer_avatar"]},
+            "thumbnail": {"url": render["member_avatar"]},
+        }
+
+    async def _edit_log_messages(self, promotion: Promotion, log_embed: dict, audit_embed: dict):
+        # Messages are edited by id from the stored channel ids; nothing is fetched to read them back.
+        config = None
+        for channel_id, config_attribute, message_id, embed in (
+            (promotion.channel_id, "promotion_log", promotion.message_id, log_embed),
+            (promotion.audit_channel_id, "promotion_audit_log", promotion.audit_message_id, audit_embed),
+        ):
+            if not message_id:
+                continue
+            if not channel_id:
+                config = config or await self.bot.guild_config.get(promotion.guild_id)
+                channel_id = getattr(config, config_attribute)
+            if not channel_id:
+                continue
+            try:
+                await edit_message_embed(self.bot, channel_id, message_id, embed)
+            except Exception as e:
+                self.bot.logger.warning(f"Could not update log message for promotion {promotion.record_id}: {e}")
+
     @slash_command(name="promotions", description="Promotion management commands")
     async def promotions(self, ctx):
         pass
@@ -30,27 +99,14 @@ class Promotions(Extension):
     async def promote(self, ctx, member: User, new_role: Role, reason: str = None):
         await ctx.defer(ephemeral=True)
 
-        config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-        if not config:
-            config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-            if not config:
-                config = {}
-            await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-        promotion_issuer_role_id = config.get("promotion_issuer_role")
-
-        if promotion_issuer_role_id:
-            promotion_issuer_role = ctx.guild.get_role(int(promotion_issuer_role_id))
-            if not promotion_issuer_role:
-                try:
-                    promotion_issuer_role = await ctx.guild.fetch_role(int(promotion_issuer_role_id))
-                except Exception:
-                    promotion_issuer_role = None
-            if not promotion_issuer_role:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
-                return
-            if promotion_issuer_role not in ctx.author.roles:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to promote others."}, ephemeral=True)
-                return
+        config = await self.bot.guild_config.get(ctx.guild.id)
+        permission = await self.bot.permissions.check(ctx.guild, ctx.author, "promote")
+        if permission == ROLE_MISSING:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
+            return
+        if permission == DENIED:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to promote others."}, ephemeral=True)
+            return
             
         if member.id == ctx.author.id:
             await ctx.send(embed={"description": "<:warning:1430730420307234916> You cannot promote yourself."}, ephemeral=True)
@@ -58,50 +114,38 @@ class Promotions(Extension):
 
         promotion_id = (random.choices(string.ascii_uppercase + string.digits, k=8))
         promotion_id_str = ''.join(promotion_id)
-            
-        promotion_channel_id = config.get("promotion_log")
-        promotion_audit_message = None
-        if promotion_channel_id:
-            promotion_channel = ctx.guild.get_channel(int(promotion_channel_id))
-            if not promotion_channel:
-                try:
-                    promotion_channel = await ctx.guild.fetch_channel(int(promotion_channel_id))
-                except Exception:
-                    promotion_channel = None
+        promotion = Promotion(
+            record_id=promotion_id_str,
+            guild_id=ctx.guild.id,
+            member_id=member.id,
+            new_role_id=new_role.id,
+            issued_by_id=ctx.author.id,
+            reason=reason,
+            timestamp=datetime.utcnow(),
+            # Enough to re-render both log embeds later, so edits never have to fetch users, roles or messages.
+            render=self._render_fields(member, ctx.author, new_role.name),
+        )
+
+        if config.promotion_log:
+            promotion_channel = await self.bot.resolver.channel(ctx.guild, config.promotion_log)
             if promotion_channel:
-                promotion_message = await promotion_channel.send(
-                    f"{member.mention}",
-                    embed={
-                        "description": f"**{member}**, you have been promoted.\n\n> **New Role:** @{new_role.name}\n> **Reason:** {reason if reason else 'No reason provided'}\n> **Promotion ID:** {promotion_id_str}",
-                        "author": {"name": f"Signed, {ctx.author}", "icon_url": ctx.author.display_avatar.url},
-                        "thumbnail": {"url": member.display_avatar.url},
-                    }
-                )
-        promotion_audit_channel_id = config.get("promotion_audit_log")
-        promotion_audit_message = None
-        if promotion_audit_channel_id:
-            promotion_audit_channel = ctx.guild.get_channel(int(promotion_audit_channel_id))
-            if not promotion_audit_channel:
-                try:
-                    promotion_audit_channel = await ctx.guild.fetch_channel(int(promotion_audit_channel_id))
-                except Exception:
-                    promotion_audit_channel = None
+                promotion_message = await promotion_channel.send(f"{member.mention}", embed=self._log_embed(promotion, promotion.render))
+                promotion.message_id = int(promotion_message.id)
+                promotion.channel_id = int(promotion_channel.id)
+        if config.promotion_audit_log:
+            promotion_audit_channel = await self.bot.resolver.channel(ctx.guild, config.promotion_audit_log)
             if promotion_audit_channel:
-                promotion_audit_message = await promotion_audit_channel.send(
-                    embed={
-                        "title": "Promotion Audit Log",
-                        "description": f"> **Member Promoted:** {member.mention}\n> **New Role:** @{new_role.name}\n> **Promoted By:** {ctx.author.mention}\n> **Reason:** {reason if reason else 'No reason provided'}\n> **Promotion ID:** {promotion_id_str}",
-                        "author": {"name": f"Signed, {ctx.author}", "icon_url": ctx.author.display_avatar.url},
-                        "thumbnail": {"url": member.display_avatar.url},
-                    }
-                )
+                promotion_audit_message = await promotion_audit_channel.send(embed=self._audit_embed(promotion, promotion.render))
+                promotion.audit_message_id = int(promotion_audit_message.id)
+                promotion.audit_channel_id = int(promotion_audit_channel.id)
         
 
         try: await member.add_role(new_role, reason=f"Promoted by {ctx.author} | Reason: {reason if reason else 'No reason provided'} | Promotion ID: {promotion_id_str}")
         except Exception: pass
         try:
-            await member.send(
-                embed={
+            await self.bot.dms.send(
+                member,
+                {
                     "description": f"You have been promoted in **{ctx.guild.name}**!\n\n> **New Role:** @{new_role.name}\n> **Reason:** {reason if reason else 'No reason provided'}\n> **Promotion ID:** {promotion_id_str}\n\nCongratulations!",
                     "author": {"name": f"Signed, {ctx.author}", "icon_url": ctx.author.display_avatar.url},
                     "footer": {"text": f"{self.bot.user.username}", "icon_url": self.bot.user.display_avatar.url},
@@ -110,28 +154,9 @@ class Promotions(Extension):
             )
         except Exception:
             pass
-        await self.bot.db.promotions.insert_one({
-            "promotion_id": promotion_id_str,
-            "guild_id": str(ctx.guild.id),
-            "member_id": str(member.id),
-            "new_role_id": str(new_role.id),
-            "issued_by_id": str(ctx.author.id),
-            "promotion_message_id": promotion_message.id if promotion_channel_id else None,
-            "promotion_audit_message_id": promotion_audit_message.id if promotion_audit_channel_id else None,
-            "reason": reason,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        await self.bot.mem_cache.set(f"promotion_{promotion_id_str}", {
-            "promotion_id": promotion_id_str,
-            "guild_id": str(ctx.guild.id),
-            "member_id": str(member.id),
-            "new_role_id": str(new_role.id),
-            "issued_by_id": str(ctx.author.id),
-            "promotion_message_id": promotion_message.id if promotion_channel_id else None,
-            "promotion_audit_message_id": promotion_audit_message.id if promotion_audit_channel_id else None,
-            "reason": reason,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        promotion._id = (await self.bot.db.promotions.insert_one(promotion.to_doc())).inserted_id
+        await self.bot.mem_cache.set(promotion_key(ctx.guild.id, promotion_id_str), promotion)
+        await bump_generation(self.bot.mem_cache, ctx.guild.id)
         await ctx.send(
             embed={
                 "description": f"<:check:1430728952535842907> Successfully promoted **{member}** to **@{new_role.name}**.",
@@ -156,27 +181,13 @@ class Promotions(Extension):
         await ctx.defer(ephemeral=True)
 
 
-        config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-        if not config:
-            config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-            if not config:
-                config = {}
-            await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-        promotion_issuer_role_id = config.get("promotion_issuer_role")
-
-        if promotion_issuer_role_id:
-            promotion_issuer_role = ctx.guild.get_role(int(promotion_issuer_role_id))
-            if not promotion_issuer_role:
-                try:
-                    promotion_issuer_role = await ctx.guild.fetch_role(int(promotion_issuer_role_id))
-                except Exception:
-                    promotion_issuer_role = None
-            if not promotion_issuer_role:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
-                return
-            if promotion_issuer_role not in ctx.author.roles:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to view promotions."}, ephemeral=True)
-                return
+        permission = await self.bot.permissions.check(ctx.guild, ctx.author, "promote")
+        if permission == ROLE_MISSING:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
+            return
+        if permission == DENIED:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to view promotions."}, ephemeral=True)
+            return
         
         if not promotion_id and not member:
             return await ctx.send(embed={"description": "<:warning:1430730420307234916> You must provide either a Promotion ID or a member to view."}, ephemeral=True)
@@ -185,53 +196,30 @@ class Promotions(Extension):
             return await ctx.send(embed={"description": "<:warning:1430730420307234916> You can only provide a Promotion ID or a member, not both."}, ephemeral=True)
 
         if promotion_id:
-            promotion_data = await self.bot.mem_cache.get(f"promotion_{promotion_id}")
-
-            if not promotion_data:
-                promotion_data = await self.bot.db.promotions.find_one(
-                    {"promotion_id": promotion_id, "guild_id": str(ctx.guild.id)}
+            promotion = await self.bot.loader.get(promotion_key(ctx.guild.id, promotion_id), lambda: self._load(ctx.guild.id, promotion_id))
+            if not promotion:
+                await ctx.send(
+                    embed={
+                        "description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID.",
+                    },
+                    ephemeral=True
                 )
-                if not promotion_data:
-                    await ctx.send(
-                        embed={
-                            "description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID.",
-                        },
-                        ephemeral=True
-                    )
-                    return
-                await self.bot.mem_cache.set(f"promotion_{promotion_id}", promotion_data)
-            else:
-                if promotion_data.get("guild_id") != str(ctx.guild.id):
-                    await ctx.send(
-                        embed={
-                            "description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID.",
-                        },
-                        ephemeral=True
-                    )
-                    return
+                return
             
-            member_obj = ctx.guild.get_member(int(promotion_data["member_id"])) or await self.bot.fetch_user(int(promotion_data["member_id"]))
-            new_role = ctx.guild.get_role(int(promotion_data["new_role_id"])) or await ctx.guild.fetch_role(int(promotion_data["new_role_id"]))
-            issued_by = ctx.guild.get_member(int(promotion_data["issued_by_id"])) or await self.bot.fetch_user(int(promotion_data["issued_by_id"]))
-
-            timestamp = promotion_data.get("timestamp")
-            if timestamp:
-                try:
-                    dt = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
-                    timestamp = str(Timestamp.fromdatetime(dt))
-                except Exception:
-                    timestamp = "Unknown"
-            else:
-                timestamp = "Unknown"
+            member_obj = await ctx.guild.fetch_member(promotion.member_id) or await self.bot.fetch_user(promotion.member_id)
+            new_role = await self.bot.resolver.role(ctx.guild, promotion.new_role_id)
+            issued_by = await ctx.guild.fetch_member(promotion.issued_by_id) or await self.bot.fetch_user(promotion.issued_by_id)
+
+            timestamp = self._discord_time(promotion.timestamp) if promotion.timestamp else "Unknown"
 
             await ctx.send(
                 embed={
                     "title": f"Promotion Details: {promotion_id}",
                     "fields": [
-                        {"name": "Member", "value": f"{member_obj} ({member_obj.id})" if member_obj else f"Member not found ({promotion_data['member_id']})", "inline": True},
-                        {"name": "New Role", "value": f"{new_role.mention} ({new_role.id})" if new_role else f"Role not found ({promotion_data['new_role_id']})", "inline": True},
-                        {"name": "Issued By", "value": f"{issued_by} ({issued_by.id})" if issued_by else f"Issuer not found ({promotion_data['issued_by_id']})", "inline": True},
-                        {"name": "Reason", "value": promotion_data.get("reason") or "No reason provided", "inline": False},
+                        {"name": "Member", "value": f"{member_obj} ({member_obj.id})" if member_obj else f"Member not found ({promotion.member_id})", "inline": True},
+                        {"name": "New Role", "value": f"{new_role.mention} ({new_role.id})" if new_role else f"Role not found ({promotion.new_role_id})", "inline": True},
+                        {"name": "Issued By", "value": f"{issued_by} ({issued_by.id})" if issued_by else f"Issuer not found ({promotion.issued_by_id})", "inline": True},
+                        {"name": "Reason", "value": promotion.reason or "No reason provided", "inline": False},
                         {"name": "Timestamp", "value": timestamp, "inline": False},
                     ],
                     "thumbnail": {"url": member_obj.display_avatar.url if member_obj else None},
@@ -241,27 +229,21 @@ class Promotions(Extension):
         
         if member:
             promotions_cursor = self.bot.db.promotions.find({"member_id": str(member.id), "guild_id": str(ctx.guild.id)})
-            promotions_list = await promotions_cursor.to_list(length=100)
+            promotions_list = [Promotion.from_doc(doc) for doc in await promotions_cursor.to_list(length=100)]
 
             if not promotions_list:
                 return await ctx.send(embed={"description": f"No promotions found for **{member}**."}, ephemeral=True)
 
             description_lines = []
             for promo in promotions_list:
-                timestamp_str = "Unknown"
-                if promo.get("timestamp"):
-                    try:
-                        dt = datetime.fromisoformat(promo["timestamp"]).replace(tzinfo=timezone.utc)
-                        timestamp_str = str(Timestamp.fromdatetime(dt))
-                    except Exception:
-                        pass
+                timestamp_str = self._discord_time(promo.timestamp) if promo.timestamp else "Unknown"
                 
-                new_role = ctx.guild.get_role(int(promo["new_role_id"]))
-                role_mention = new_role.mention if new_role else f"@{promo['new_role_id']}"
-                reason = promo.get('reason') or 'No reason provided'
+                new_role = ctx.guild.get_role(promo.new_role_id) if promo.new_role_id else None
+                role_mention = new_role.mention if new_role else f"@{promo.new_role_id}"
+                reason = promo.reason or 'No reason provided'
                 
                 description_lines.append(
-                    f"**ID:** `{promo['promotion_id']}` - {timestamp_str}\n"
+                    f"**ID:** `{promo.record_id}` - {timestamp_str}\n"
                     f"**Role:** {role_mention} - **Reason:** *{reason}*"
                 )
 
@@ -283,126 +265,48 @@ class Promotions(Extension):
     async def revoke_promotion(self, ctx, promotion_id: str):
         await ctx.defer(ephemeral=True)
 
-        config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-        if not config:
-            config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-            if not config:
-                config = {}
-            await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-        promotion_issuer_role_id = config.get("promotion_issuer_role")
-
-        if promotion_issuer_role_id:
-            promotion_issuer_role = ctx.guild.get_role(int(promotion_issuer_role_id))
-            if not promotion_issuer_role:
-                try:
-                    promotion_issuer_role = await ctx.guild.fetch_role(int(promotion_issuer_role_id))
-                except Exception:
-                    promotion_issuer_role = None
-            if not promotion_issuer_role:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
-                return
-            if promotion_issuer_role not in ctx.author.roles:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to revoke promotions."}, ephemeral=True)
-                return
-
-        promotion_data = await self.bot.mem_cache.get(f"promotion_{promotion_id}")
+        permission = await self.bot.permissions.check(ctx.guild, ctx.author, "promote")
+        if permission == ROLE_MISSING:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
+            return
+        if permission == DENIED:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to revoke promotions."}, ephemeral=True)
+            return
 
-        if not promotion_data:
-            promotion_data = await self.bot.db.promotions.find_one(
-                {"promotion_id": promotion_id, "guild_id": str(ctx.guild.id)}
+        promotion = await self.bot.loader.get(promotion_key(ctx.guild.id, promotion_id), lambda: self._load(ctx.guild.id, promotion_id))
+        if not promotion:
+            await ctx.send(
+                embed={
+                    "description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID.",
+                },
+                ephemeral=True
             )
-            if not promotion_data:
-                await ctx.send(
-                    embed={
-                        "description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID.",
-                    },
-                    ephemeral=True
-                )
-                return
-            await self.bot.mem_cache.set(f"promotion_{promotion_id}", promotion_data)
-        else:
-            if promotion_data.get("guild_id") != str(ctx.guild.id):
-                await ctx.send(
-                    embed={
-                        "description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID.",
-                    },
-                    ephemeral=True
-                )
-                return
+            return
         
-        member = ctx.guild.get_member(int(promotion_data["member_id"]))
+        member = await ctx.guild.fetch_member(promotion.member_id)
         if not member:
             try:
-                member = await self.bot.fetch_user(int(promotion_data["member_id"]))
+                member = await self.bot.fetch_user(promotion.member_id)
             except Exception:
                 member = None
         if member.id == ctx.author.id:
             await ctx.send(embed={"description": "<:warning:1430730420307234916> You cannot revoke your own promotion."}, ephemeral=True)
             return
-        new_role = ctx.guild.get_role(int(promotion_data["new_role_id"]))
-        if not new_role:
-            try:
-                new_role = await ctx.guild.fetch_role(int(promotion_data["new_role_id"]))
-            except Exception:
-                new_role = None
+        new_role = await self.bot.resolver.role(ctx.guild, promotion.new_role_id)
 
         if member:
-            timestamp = promotion_data.get("timestamp")
-            if timestamp:
-                try:
-                    dt = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc)
-                    timestamp = str(Timestamp.fromdatetime(dt))
-                except Exception:
-                    timestamp = "Unknown"
-            else:
-                timestamp = "Unknown"
+            timestamp = self._discord_time(promotion.timestamp) if promotion.timestamp else "Unknown"
             promotion_revoked_embed = {
-                "description": f"***Promotion ID {promotion_id} has been revoked by {ctx.author}***\n\n> **Member:** {member}\n> **Role Revoked:** @{new_role.name if new_role else 'Role not found'}\n> **Original Reason:** {promotion_data['reason'] if promotion_data['reason'] else 'No reason provided'}\n> **Issued At:** {timestamp}",
+                "description": f"***Promotion ID {promotion_id} has been revoked by {ctx.author}***\n\n> **Member:** {member}\n> **Role Revoked:** @{new_role.name if new_role else 'Role not found'}\n> **Original Reason:** {promotion.reason if promotion.reason else 'No reason provided'}\n> **Issued At:** {timestamp}",
                 "thumbnail": {"url": member.display_avatar.url},
                 "author": {"name": f"Signed, {ctx.author}", "icon_url":ctx.author.display_avatar.url},
             }
-            promotion_message_id = promotion_data.get("promotion_message_id")
-            if promotion_message_id:
-                config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-                if not config:
-                    config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-                    if not config:
-                        config = {}
-                    await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-                promotion_channel_id = config.get("promotion_log")
-                if promotion_channel_id:
-                    promotion_channel = ctx.guild.get_channel(int(promotion_channel_id))
-                    if not promotion_channel:
-                        try:
-                            promotion_channel = await ctx.guild.fetch_channel(int(promotion_channel_id))
-                        except Exception:
-                            promotion_channel = None
-                    if promotion_channel:
-                        try:
-                            promotion_message = await promotion_channel.fetch_message(promotion_message_id)
-                            await promotion_message.edit(embed=promotion_revoked_embed)
-                        except Exception:
-                            pass
-                promotion_audit_channel_id = config.get("promotion_audit_log")
-                if promotion_audit_channel_id:
-                    promotion_audit_channel = ctx.guild.get_channel(int(promotion_audit_channel_id))
-                    if not promotion_audit_channel:
-                        try:
-                            promotion_audit_channel = await ctx.guild.fetch_channel(int(promotion_audit_channel_id))
-                        except Exception:
-                            promotion_audit_channel = None
-                    if promotion_audit_channel:
-                        promotion_audit_message_id = promotion_data.get("promotion_audit_message_id")
-                        if promotion_audit_message_id:
-                            try:
-                                promotion_audit_message = await promotion_audit_channel.fetch_message(promotion_audit_message_id)
-                                await promotion_audit_message.edit(embed=promotion_revoked_embed)
-                            except Exception:
-                                pass
+            await self._edit_log_messages(promotion, promotion_revoked_embed, promotion_revoked_embed)
             try: await member.remove_role(new_role, reason=f"Promotion revoked by {ctx.author} | Promotion ID: {promotion_id}")
             except Exception: pass
             await self.bot.db.promotions.delete_one({"promotion_id": promotion_id, "guild_id": str(ctx.guild.id)})
-            await self.bot.mem_cache.delete(f"promotion_{promotion_id}")
+            await self.bot.mem_cache.delete(promotion_key(ctx.guild.id, promotion_id))
+            await bump_generation(self.bot.mem_cache, ctx.guild.id)
             await ctx.send(
                 embed={
                     "description": f"<:check:1430728952535842907> Successfully revoked promotion of **{member}** from **@{new_role.name}**.",
@@ -426,39 +330,21 @@ class Promotions(Extension):
     )
     async def edit_promotion(self, ctx, promotion_id: str):
 
-        config = await self.bot.mem_cache.get(f"guild_config_{ctx.guild.id}")
-        if not config:
-            config = await self.bot.db.config.find_one({"guild_id": str(ctx.guild.id)})
-            if not config:
-                config = {}
-            await self.bot.mem_cache.set(f"guild_config_{ctx.guild.id}", config)
-        promotion_issuer_role_id = config.get("promotion_issuer_role")
-
-        if promotion_issuer_role_id:
-            promotion_issuer_role = ctx.guild.get_role(int(promotion_issuer_role_id))
-            if not promotion_issuer_role:
-                try:
-                    promotion_issuer_role = await ctx.guild.fetch_role(int(promotion_issuer_role_id))
-                except Exception:
-                    promotion_issuer_role = None
-            if not promotion_issuer_role:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
-                return
-            if promotion_issuer_role not in ctx.author.roles:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to edit promotions."}, ephemeral=True)
-                return
+        permission = await self.bot.permissions.check(ctx.guild, ctx.author, "promote")
+        if permission == ROLE_MISSING:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> Promotion issuer role not found in the guild."}, ephemeral=True)
+            return
+        if permission == DENIED:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> You don't have permission to edit promotions."}, ephemeral=True)
+            return
 
-        promotion_data = await self.bot.mem_cache.get(f"promotion_{promotion_id}")
-        if not promotion_data:
-            promotion_data = await self.bot.db.promotions.find_one(
-                {"promotion_id": promotion_id, "guild_id": str(ctx.guild.id)}
-            )
-            if not promotion_data:
-                await ctx.send(embed={"description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID."}, ephemeral=True)
-                return
+        promotion = await self.bot.loader.get(promotion_key(ctx.guild.id, promotion_id), lambda: self._load(ctx.guild.id, promotion_id))
+        if not promotion:
+            await ctx.send(embed={"description": "<:warning:1430730420307234916> No promotion found with the given Promotion ID."}, ephemeral=True)
+            return
 
         modal = Modal(
-            ShortText(label="Reason", custom_id="reason", value=promotion_data.get("reason"), placeholder="New reason for the promotion", required=False),
+            ShortText(label="Reason", custom_id="reason", value=promotion.reason, placeholder="New reason for the promotion", required=False),
             title=f"Editing Promotion {promotion_id}",
         )
         await ctx.send_modal(modal)
@@ -466,50 +352,23 @@ class Promotions(Extension):
         
         new_reason = modal_ctx.responses["reason"]
 
-        promotion_data["reason"] = new_reason
+        # The loaded model is the cached instance; edit a copy and cache it only once the write has gone through.
+        promotion = Promotion.from_doc(promotion.to_doc())
+        promotion.reason = new_reason
 
         await self.bot.db.promotions.update_one(
             {"promotion_id": promotion_id, "guild_id": str(ctx.guild.id)},
             {"$set": {"reason": new_reason}}
         )
-        await self.bot.mem_cache.set(f"promotion_{promotion_id}", promotion_data)
-
-        member = await self.bot.fetch_user(int(promotion_data["member_id"]))
-        new_role = await ctx.guild.fetch_role(int(promotion_data["new_role_id"]))
-        issuer = await self.bot.fetch_user(int(promotion_data["issued_by_id"]))
+        await self.bot.mem_cache.set(promotion_key(ctx.guild.id, promotion_id), promotion)
+        await bump_generation(self.bot.mem_cache, ctx.guild.id)
 
-        promotion_message_id = promotion_data.get("promotion_message_id")
-        promotion_channel_id = config.get("promotion_log")
-        if promotion_message_id and promotion_channel_id:
-            try:
-                channel = await self.bot.fetch_channel(int(promotion_channel_id))
-                message = await channel.fetch_message(promotion_message_id)
-                await message.edit(
-                    embed={
-                        "description": f"**{member}**, you have been promoted.\n\n> **New Role:** @{new_role.name}\n> **Reason:** {new_reason if new_reason else 'No reason provided'}\n> **Promotion ID:** {promotion_id}",
-                        "author": {"name": f"Signed, {issuer}", "icon_url": issuer.display_avatar.url},
-                        "thumbnail": {"url": member.display_avatar.url},
-                    }
-                )
-            except Exception:
-                pass
-
-        promotion_audit_message_id = promotion_data.get("promotion_audit_message_id")
-        promotion_audit_channel_id = config.get("promotion_audit_log")
-        if promotion_audit_message_id and promotion_audit_channel_id:
-            try:
-                channel = await self.bot.fetch_channel(int(promotion_audit_channel_id))
-                message = await channel.fetch_message(promotion_audit_message_id)
-                await message.edit(
-                    embed={
-                        "title": "Promotion Audit Log",
-                        "description": f"> **Member Promoted:** {member.mention}\n> **New Role:** @{new_role.name}\n> **Promoted By:** {issuer.mention}\n> **Reason:** {new_reason if new_reason else 'No reason provided'}\n> **Promotion ID:** {promotion_id}",
-                        "author": {"name": f"Signed, {issuer}", "icon_url": issuer.display_avatar.url},
-                        "thumbnail": {"url": member.display_avatar.url},
-                    }
-                )
-            except Exception:
-                pass
+        # The edit is saved by now, so a log message that can't be re-rendered mustn't cost the user their reply.
+        try:
+            render = await self._render(ctx.guild, promotion)
+            await self._edit_log_messages(promotion, self._log_embed(promotion, render), self._audit_embed(promotion, render))
+        except Exception as e:
+            self.bot.logger.warning(f"Could not update log messages for edited promotion {promotion.record_id}: {e}")
 
         await modal_ctx.send(
             embed={
@@ -519,4 +378,4 @@ class Promotions(Extension):
         )
 
 def setup(bot):
-    Promotions(bot)
\ No newline at end of file
+    load_for_client(Promotions, bot)
\ No newline at end of file
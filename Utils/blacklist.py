@@ -0,0 +1,91 @@
+import asyncio
+
+from interactions import Listener
+from interactions.api import events
+
+from Utils.startup import timed
+
+
+class GuildBlacklist:
+    """The blacklisted guild ids as a set of ints, mirrored from the blacklisted_guilds collection."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.guild_ids = set()
+
+    def __contains__(self, guild_id):
+        try:
+            return int(guild_id) in self.guild_ids
+        except (TypeError, ValueError):
+            return False
+
+    async def load(self):
+        docs = await self.bot.db.blacklisted_guilds.find({}, {"guild_id": 1}).to_list(length=None)
+        self.guild_ids = {int(doc["guild_id"]) for doc in docs}
+
+    async def add(self, guild_id: int, reason: str, blacklisted_by: int, blacklisted_at):
+        if guild_id in self:
+            return False
+        # Write first: the set only ever mirrors what the next load() would read back.
+        await self.bot.db.blacklisted_guilds.insert_one({
+            "guild_id": int(guild_id),
+            "reason": reason,
+            "blacklisted_at": blacklisted_at,
+            "blacklisted_by": blacklisted_by
+        })
+        self.guild_ids.add(int(guild_id))
+        return True
+
+    async def remove(self, guild_id: int):
+        if guild_id not in self:
+            return False
+        await self.bot.db.blacklisted_guilds.delete_one({"guild_id": int(guild_id)})
+        self.guild_ids.discard(int(guild_id))
+        return True
+
+    async def sweep(self):
+        # Reload first so additions made by other processes are honoured too.
+        await self.load()
+        joined = {int(guild.id) for guild in self.bot.guilds}
+        offending = joined & self.guild_ids
+        for guild_id in offending:
+            await self.leave(guild_id)
+        self.bot.logger.info(f"Blacklist sweep: {len(self.guild_ids)} blacklisted, left {len(offending)} guilds.")
+
+    async def leave(self, guild_id: int):
+        try:
+            if guild := self.bot.get_guild(guild_id):
+                await guild.leave()
+        except Exception:
+            self.bot.logger.warning(f"Failed to leave blacklisted guild {guild_id}.")
+
+
+def install_blacklist(bot):
+    blacklist = GuildBlacklist(bot)
+    bot.blacklist = blacklist
+
+    interaction_processor = bot.processors["raw_interaction_create"]
+
+    @bot.add_event_processor("raw_interaction_create")
+    async def _gated_interaction(event):
+        if event.data.get("guild_id") in blacklist:
+            return
+        await interaction_processor(event)
+
+    dispatch = bot.dispatch
+
+    def gated_dispatch(event, *args, **kwargs):
+        # Guild-scoped events from blacklisted guilds never reach extension listeners.
+        if getattr(event, "guild_id", None) in blacklist:
+            if isinstance(event, events.GuildJoin) and bot.is_ready:
+                asyncio.create_task(blacklist.leave(event.guild_id))
+            return
+        return dispatch(event, *args, **kwargs)
+
+    bot.dispatch = gated_dispatch
+
+    async def on_ready():
+        await timed(bot, "blacklist_sweep", blacklist.sweep())
+
+    bot.add_listener(Listener.create("on_ready")(on_ready))
+    return blacklist
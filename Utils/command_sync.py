@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+from interactions.models.internal.application_commands import application_commands_to_dict
+
+
+def get_sync_mode():
+    mode = os.getenv("COMMAND_SYNC_MODE", "manifest").strip().lower()
+    return mode if mode in {"manifest", "always", "never"} else "manifest"
+
+
+def command_signatures(bot):
+    payload = application_commands_to_dict(bot.interactions_by_scope, bot)
+    signatures = {}
+    for scope, commands in payload.items():
+        for command in commands:
+            encoded = json.dumps(command, sort_keys=True, default=str).encode()
+            signatures[f"{scope}:{command['name']}"] = hashlib.sha256(encoded).hexdigest()
+    return signatures
+
+
+def manifest_hash(signatures: dict):
+    encoded = json.dumps(signatures, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _manifest_id(bot):
+    return f"command_manifest_{bot.app.id}"
+
+
+async def load_manifest(bot):
+    if os.getenv("COMMAND_MANIFEST_STORE", "mongo") == "file":
+        try:
+            with open(os.getenv("COMMAND_MANIFEST_PATH", "command_manifest.json")) as f:
+                return json.load(f).get(_manifest_id(bot))
+        except (FileNotFoundError, ValueError):
+            return None
+    return await bot.db.bot_meta.find_one({"_id": _manifest_id(bot)})
+
+
+async def save_manifest(bot, manifest: dict):
+    if os.getenv("COMMAND_MANIFEST_STORE", "mongo") == "file":
+        path = os.getenv("COMMAND_MANIFEST_PATH", "command_manifest.json")
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+        except (FileNotFoundError, ValueError):
+            stored = {}
+        stored[_manifest_id(bot)] = manifest
+        with open(path, "w") as f:
+            json.dump(stored, f, indent=2)
+        return
+    await bot.db.bot_meta.replace_one({"_id": _manifest_id(bot)}, manifest, upsert=True)
+
+
+async def sync_if_changed(bot):
+    signatures = command_signatures(bot)
+    digest = manifest_hash(signatures)
+    previous = await load_manifest(bot) or {}
+
+    if previous.get("hash") == digest:
+        bot.logger.info(f"Command manifest unchanged ({digest[:12]}), skipping sync of {len(signatures)} commands.")
+        return False
+
+    old = previous.get("commands") or {}
+    added = sorted(set(signatures) - set(old))
+    removed = sorted(set(old) - set(signatures))
+    changed = sorted(k for k in set(signatures) & set(old) if signatures[k] != old[k])
+    bot.logger.info(f"Command manifest changed ({previous.get('hash', 'none')[:12]} -> {digest[:12]}): added={added} removed={removed} changed={changed}")
+
+    started = time.perf_counter()
+    await bot.synchronise_interactions()
+    elapsed = time.perf_counter() - started
+    bot.logger.info(f"Synced application commands in {elapsed:.2f}s.")
+
+    await save_manifest(bot, {
+        "hash": digest,
+        "commands": signatures,
+        "synced_at": datetime.utcnow().isoformat(),
+        "sync_seconds": round(elapsed, 3),
+    })
+    return True
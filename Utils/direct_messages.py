@@ -0,0 +1,75 @@
+import os
+import time
+
+from interactions.client.errors import Forbidden, NotFound
+
+# Discord's "Cannot send messages to this user": DMs closed, the bot blocked, or no shared guild.
+CANNOT_MESSAGE_USER = 50007
+
+
+def dm_key(user_id) -> str:
+    return f"dm_{user_id}"
+
+
+class DirectMessages:
+    """Member notifications sent straight to a known DM channel id.
+
+    Channel ids are kept per bot in the dm_channels collection (and mem_cache), so a restart
+    doesn't reopen them. Users whose DMs are closed get closed_until and are skipped until then
+    (DM_CLOSED_RETRY seconds, default one day) instead of retried on every action.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.closed_retry = float(os.getenv("DM_CLOSED_RETRY", "86400"))
+        self.opened = 0
+        self.sent = 0
+        self.closed = 0
+        self.skipped = 0
+
+    def _filter(self, user_id: int) -> dict:
+        return {"bot_id": int(self.bot.user.id), "user_id": user_id}
+
+    async def _entry(self, user_id: int) -> dict:
+        return await self.bot.loader.get(
+            dm_key(user_id), lambda: self.bot.db.dm_channels.find_one(self._filter(user_id), {"_id": 0, "channel_id": 1, "closed_until": 1})
+        ) or {}
+
+    async def _save(self, user_id: int, entry: dict, **fields) -> dict:
+        entry = {**entry, **fields}
+        await self.bot.db.dm_channels.update_one(self._filter(user_id), {"$set": fields}, upsert=True)
+        await self.bot.mem_cache.set(dm_key(user_id), entry)
+        return entry
+
+    async def send(self, user, embed: dict) -> bool:
+        """DM embed to user; False when it couldn't be delivered."""
+        user_id = int(user.id)
+        entry = await self._entry(user_id)
+        if (entry.get("closed_until") or 0) > time.time():
+            self.skipped += 1
+            return False
+        for _ in range(2):
+            if not entry.get("channel_id"):
+                channel = await self.bot.http.create_dm(user_id)
+                self.opened += 1
+                entry = await self._save(user_id, entry, channel_id=int(channel["id"]))
+            try:
+                await self.bot.http.create_message({"embeds": [embed]}, entry["channel_id"])
+            except Forbidden as e:
+                if e.code != CANNOT_MESSAGE_USER:
+                    raise
+                self.closed += 1
+                await self._save(user_id, entry, closed_until=time.time() + self.closed_retry)
+                return False
+            except NotFound:
+                # The stored channel no longer exists; open a fresh one once.
+                entry = await self._save(user_id, entry, channel_id=None)
+                continue
+            self.sent += 1
+            if entry.get("closed_until"):
+                await self._save(user_id, entry, closed_until=None)
+            return True
+        return False
+
+    def stats(self) -> dict:
+        return {"opened": self.opened, "sent": self.sent, "closed": self.closed, "skipped": self.skipped}
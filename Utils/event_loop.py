@@ -0,0 +1,26 @@
+import asyncio
+import importlib.util
+import os
+
+LOOPS = ("asyncio", "uvloop")
+
+
+def resolve_loop_name(name: str = None):
+    name = (name or os.getenv("EVENT_LOOP", "asyncio")).strip().lower()
+    if name == "auto":
+        return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    if name not in LOOPS:
+        raise ValueError(f"Unknown event loop {name!r}, expected one of {', '.join(LOOPS)} or auto")
+    return name
+
+
+def loop_factory(name: str):
+    if name == "uvloop":
+        import uvloop
+        return uvloop.new_event_loop
+    return asyncio.new_event_loop
+
+
+def run(coro, name: str = None):
+    with asyncio.Runner(loop_factory=loop_factory(resolve_loop_name(name))) as runner:
+        return runner.run(coro)
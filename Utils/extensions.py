@@ -0,0 +1,20 @@
+import copy
+import inspect
+
+from interactions import BaseCommand, Task
+
+
+def load_for_client(cls, bot):
+    """Instantiate the extension cls on bot through a subclass holding bot's own commands and tasks.
+
+    interactions keeps commands and tasks on the Extension class and binds them to whichever
+    instance loads it first, so several clients in one process (runner.py) would otherwise all
+    run their commands against the first client's extension.
+    """
+    namespace = {"__module__": cls.__module__, "__qualname__": cls.__qualname__, "__doc__": cls.__doc__}
+    for name, value in inspect.getmembers(cls):
+        if isinstance(value, BaseCommand):
+            namespace[name] = copy.copy(value)
+        elif isinstance(value, Task):
+            namespace[name] = Task(value.callback, copy.copy(value.trigger))
+    return type(cls.__name__, (cls,), namespace)(bot)
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import os
+import time
+import zlib
+
+from interactions import Listener
+from interactions.api import events
+from interactions.api.gateway import state as gateway_state
+from interactions.api.gateway.gateway import GatewayClient
+
+from Utils.sharding import shard_label
+
+# Closing with 1000/1001 makes Discord invalidate the session; any 4xxx code keeps it resumable.
+RESUMABLE_CLOSE_CODE = 4000
+
+
+def _session_path():
+    label = shard_label()
+    return os.getenv("GATEWAY_SESSION_PATH", f"gateway_session.{label}.json" if label else "gateway_session.json")
+
+
+def _connection_states(bot):
+    return getattr(bot, "_connection_states", None) or [bot._connection_state]
+
+
+class ResumableGatewayClient(GatewayClient):
+
+    async def __aenter__(self):
+        snapshot = getattr(self.state.client, "resume_sessions", {}).pop(self.shard[0], None)
+        if not snapshot:
+            return await super().__aenter__()
+
+        self._entered = True
+        self._zlib = zlib.decompressobj()
+        self.session_id = snapshot["session_id"]
+        self.sequence = snapshot["sequence"]
+        self.ws_resume_url = snapshot["resume_url"]
+
+        self.ws = await self.state.client.http.websocket_connect(self.ws_resume_url)
+        hello = await self.receive(force=True)
+        self.heartbeat_interval = hello["d"]["heartbeat_interval"] / 1000
+        self._closed.set()
+        self._keep_alive = asyncio.create_task(self.run_bee_gees())
+
+        # If Discord rejects the session it answers with INVALID_SESSION and the library re-identifies.
+        await self._resume_connection()
+        self.state.client.logger.info(f"Resuming gateway session {self.session_id} at sequence {self.sequence}.")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, traceback):
+        if not getattr(self.state.client, "preserve_gateway_session", False):
+            return await super().__aexit__(exc_type, exc_val, traceback)
+
+        self._close_gateway.set()
+        try:
+            if self._keep_alive is not None:
+                self._kill_bee_gees.set()
+                try:
+                    await self._keep_alive
+                finally:
+                    self._keep_alive = None
+        finally:
+            if self.ws is not None:
+                try:
+                    await self.ws.close(code=RESUMABLE_CLOSE_CODE)
+                finally:
+                    self.ws = None
+
+
+def load_session_snapshot(path: str = None):
+    path = path or _session_path()
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    finally:
+        # A session can only be resumed once, never reuse a stale snapshot.
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    max_age = float(os.getenv("GATEWAY_SESSION_MAX_AGE", "60"))
+    if time.time() - snapshot.get("saved_at", 0) > max_age:
+        return None
+    return snapshot
+
+
+def save_session_snapshot(bot, gateways):
+    shards = {
+        str(shard_id): {"session_id": gw.session_id, "sequence": gw.sequence, "resume_url": gw.ws_resume_url}
+        for shard_id, gw in gateways
+        if gw.session_id and gw.sequence and isinstance(gw.ws_resume_url, str)
+    }
+    if not shards:
+        return False
+    with open(getattr(bot, "gateway_session_path", None) or _session_path(), "w") as f:
+        json.dump({
+            "saved_at": time.time(),
+            "shards": shards,
+            "guild_ids": [str(g) for g in bot.user._guild_ids],
+        }, f)
+    return True
+
+
+async def _hydrate_guilds(bot, guild_ids):
+    sem = asyncio.Semaphore(int(os.getenv("GATEWAY_RESUME_HYDRATE_CONCURRENCY", "5")))
+
+    async def hydrate(guild_id):
+        async with sem:
+            try:
+                guild = await bot.fetch_guild(guild_id)
+                if guild:
+                    await guild.fetch_channels()
+            except Exception:
+                bot.logger.warning(f"Failed to hydrate guild {guild_id} after resume.")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(hydrate(g) for g in guild_ids))
+    bot.logger.info(f"Hydrated {len(bot.guilds)} guilds after resume in {time.perf_counter() - started:.2f}s.")
+
+
+def install_session_resume(bot, path: str = None):
+    bot.preserve_gateway_session = False
+    bot.resume_sessions = {}
+    bot.gateway_session_path = path or _session_path()
+    gateway_state.GatewayClient = ResumableGatewayClient
+
+    snapshot = load_session_snapshot(bot.gateway_session_path)
+    if not snapshot:
+        return
+    bot.resume_sessions = {int(k): v for k, v in snapshot["shards"].items()}
+    guild_ids = {int(g) for g in snapshot.get("guild_ids", [])}
+
+    async def on_resume():
+        # A fresh process that resumed never sees READY/GUILD_CREATE, so run the startup path ourselves.
+        if bot._startup:
+            return
+        bot._startup = True
+        bot._user._add_guilds(guild_ids)
+        await bot._init_interactions()
+        # Like a fresh IDENTIFY, Startup/Ready listeners (config prefetch, blacklist sweep) expect a filled guild cache.
+        await _hydrate_guilds(bot, guild_ids)
+        bot.dispatch(events.Startup())
+        bot.dispatch(events.Ready())
+
+    bot.add_listener(Listener.create("on_resume")(on_resume))
+
+
+def track_interactions(bot):
+    bot.draining = False
+    bot.inflight_interactions = set()
+    dispatch = bot.processors["raw_interaction_create"]
+
+    @bot.add_event_processor("raw_interaction_create")
+    async def _tracked_interaction(event):
+        if bot.draining:
+            return
+        task = asyncio.current_task()
+        bot.inflight_interactions.add(task)
+        try:
+            await dispatch(event)
+        finally:
+            bot.inflight_interactions.discard(task)
+
+
+async def graceful_shutdown(bot):
+    bot.draining = True
+    pending = set(getattr(bot, "inflight_interactions", ()))
+    if pending:
+        drain_timeout = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "10"))
+        bot.logger.info(f"Draining {len(pending)} in-flight interactions (up to {drain_timeout}s)...")
+        _, still_pending = await asyncio.wait(pending, timeout=drain_timeout)
+        if still_pending:
+            bot.logger.warning(f"{len(still_pending)} interactions did not finish within the drain window.")
+
+    if not hasattr(bot, "preserve_gateway_session"):
+        await bot.stop()
+        return
+
+    bot.preserve_gateway_session = True
+    gateways = [(state.shard_id, state.gateway) for state in _connection_states(bot) if state.gateway]
+    for state in _connection_states(bot):
+        await state.stop()
+    if save_session_snapshot(bot, gateways):
+        bot.logger.info(f"Saved gateway session for {len(gateways)} shard(s) to {bot.gateway_session_path}.")
+    await bot.stop()
@@ -0,0 +1,60 @@
+from pymongo import ReturnDocument
+
+from Utils.member_cache import update_protected_roles
+from Utils.models import GuildConfig
+
+
+def config_key(guild_id) -> str:
+    return f"config_{guild_id}"
+
+
+class GuildConfigStore:
+    """Guild config for every command, task and API handler, cached per guild under config_{id} as a GuildConfig.
+
+    Unconfigured guilds are cached as an empty GuildConfig so they stay hits. Every write lands in put(),
+    the one place the cached doc and everything derived from it (protected issuer roles,
+    staff permission rules) are replaced.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, guild_id) -> GuildConfig:
+        config = await self.bot.mem_cache.get(config_key(guild_id))
+        if config is not None:
+            self.hits += 1
+            return config
+        self.misses += 1
+        # Unconfigured guilds are already cached (with no settings), so only the single-flight half of the loader applies.
+        return await self.bot.loader.load(config_key(guild_id), lambda: self.refresh(guild_id))
+
+    async def refresh(self, guild_id) -> GuildConfig:
+        doc = await self.bot.db.config.find_one({"guild_id": str(guild_id)}) or {}
+        return await self.put(guild_id, doc)
+
+    async def update(self, guild_id, update: dict, upsert: bool = True) -> GuildConfig:
+        # Write-through: the post-update doc comes back from the same round trip and replaces the cached one.
+        doc = await self.bot.db.config.find_one_and_update(
+            {"guild_id": str(guild_id)}, update, upsert=upsert, return_document=ReturnDocument.AFTER
+        ) or {}
+        return await self.put(guild_id, doc)
+
+    async def put(self, guild_id, doc: dict) -> GuildConfig:
+        config = GuildConfig.from_doc(doc)
+        await self.bot.mem_cache.set(config_key(guild_id), config)
+        update_protected_roles(self.bot, guild_id, config)
+        self.bot.permissions.invalidate(guild_id)
+        return config
+
+    async def prime(self, docs: dict):
+        configs = {guild_id: GuildConfig.from_doc(doc) for guild_id, doc in docs.items()}
+        await self.bot.mem_cache.multi_set([(config_key(guild_id), config) for guild_id, config in configs.items()])
+        for guild_id, config in configs.items():
+            update_protected_roles(self.bot, guild_id, config)
+            self.bot.permissions.invalidate(guild_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / lookups, 3) if lookups else None}
@@ -0,0 +1,126 @@
+"""Index definitions for every collection the bot and the API query, and a query-plan check.
+
+Usage: python -m Utils.indexes [--database Chirp] [--no-create]
+
+Creates the indexes (idempotent; existing ones are left alone), then explains every query shape
+in QUERY_SHAPES and exits non-zero if any of them still plans a collection scan.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+log = logging.getLogger("Logger")
+
+# background is an index option, so it goes in each IndexModel; MongoDB 4.2+ ignores it (builds no
+# longer block the collection) and older servers build in the background instead of locking.
+INDEXES = {
+    "infractions": [
+        IndexModel([("infraction_id", ASCENDING), ("guild_id", ASCENDING)], name="infraction_id_guild", background=True),
+        IndexModel([("member_id", ASCENDING), ("guild_id", ASCENDING)], name="member_guild", background=True),
+        IndexModel([("guild_id", ASCENDING), ("_id", DESCENDING)], name="guild_newest", background=True),
+        IndexModel([("guild_id", ASCENDING), ("timestamp", DESCENDING)], name="guild_timestamp", background=True),
+        IndexModel([("expires_at", ASCENDING), ("expired_notified", ASCENDING)], name="expiry", background=True),
+    ],
+    "promotions": [
+        IndexModel([("promotion_id", ASCENDING), ("guild_id", ASCENDING)], name="promotion_id_guild", background=True),
+        IndexModel([("member_id", ASCENDING), ("guild_id", ASCENDING)], name="member_guild", background=True),
+        IndexModel([("guild_id", ASCENDING), ("_id", DESCENDING)], name="guild_newest", background=True),
+    ],
+    "config": [IndexModel([("guild_id", ASCENDING)], name="guild", unique=True, background=True)],
+    "blacklisted_guilds": [IndexModel([("guild_id", ASCENDING)], name="guild", unique=True, background=True)],
+    "dm_channels": [IndexModel([("bot_id", ASCENDING), ("user_id", ASCENDING)], name="bot_user", unique=True, background=True)],
+}
+
+_GUILD = "1430984964283043916"
+_NOW = "2026-01-01T00:00:00"
+
+# (collection, filter, sort) for each query the commands, tasks and API run; values are placeholders.
+QUERY_SHAPES = [
+    ("infractions", {"infraction_id": "ABCD1234", "guild_id": _GUILD}, None),
+    ("infractions", {"infraction_id": "ABCD1234"}, None),
+    ("infractions", {"member_id": _GUILD, "guild_id": _GUILD}, None),
+    ("infractions", {"guild_id": _GUILD}, [("_id", -1)]),
+    ("infractions", {"guild_id": _GUILD}, [("timestamp", -1)]),
+    ("infractions", {"$and": [{"guild_id": _GUILD}, {"$or": [{"id": "ABCD1234"}, {"infraction_id": "ABCD1234"}]}]}, [("_id", -1)]),
+    ("infractions", {"guild_id": _GUILD, "timestamp": {"$exists": True}}, None),
+    ("infractions", {"expires_at": {"$ne": None, "$lt": _NOW}, "expired_notified": {"$ne": True}}, None),
+    ("infractions", {"expires_at": {"$ne": None}, "expired_notified": {"$ne": True}}, None),
+    ("promotions", {"promotion_id": "ABCD1234", "guild_id": _GUILD}, None),
+    ("promotions", {"member_id": _GUILD, "guild_id": _GUILD}, None),
+    ("promotions", {"guild_id": _GUILD}, [("_id", -1)]),
+    ("config", {"guild_id": _GUILD}, None),
+    ("config", {"guild_id": {"$in": [_GUILD]}}, None),
+    ("blacklisted_guilds", {"guild_id": int(_GUILD)}, None),
+    ("dm_channels", {"bot_id": int(_GUILD), "user_id": int(_GUILD)}, None),
+]
+
+
+async def create_indexes(db) -> int:
+    """Create every index in INDEXES; returns how many failed (e.g. duplicate keys under a unique index)."""
+    failed = 0
+    for collection, models in INDEXES.items():
+        for model in models:
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                failed += 1
+                log.error(f"Could not create index {collection}.{model.document['name']}: {e}")
+    return failed
+
+
+def _stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+
+async def collection_scans(db) -> list:
+    """The query shapes whose winning plan contains a COLLSCAN."""
+    scans = []
+    for collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        if "COLLSCAN" in set(_stages(explain["queryPlanner"]["winningPlan"])):
+            scans.append((collection, query, sort))
+    return scans
+
+
+async def ensure_indexes(bot):
+    failed = await create_indexes(bot.db)
+    bot.logger.info(f"Index bootstrap: {sum(map(len, INDEXES.values()))} indexes checked, {failed} failed.")
+    if os.getenv("INDEX_VERIFY", "false").lower() == "true":
+        for collection, query, sort in await collection_scans(bot.db):
+            bot.logger.error(f"Query on {collection} falls back to a collection scan: {query} sort={sort}")
+
+
+async def _main(args) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    db = AsyncIOMotorClient(os.environ.get("MONGODB_URI"))[args.database]
+    if not args.no_create and await create_indexes(db):
+        return 1
+    scans = await collection_scans(db)
+    for collection, query, sort in scans:
+        print(f"COLLSCAN {collection} {query} sort={sort}")
+    print(f"{len(QUERY_SHAPES) - len(scans)}/{len(QUERY_SHAPES)} query shapes use an index.")
+    return 1 if scans else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default="Chirp")
+    parser.add_argument("--no-create", action="store_true", help="only check the query plans")
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+
+from interactions import Intents, Listener, Activity, ActivityType, Task, IntervalTrigger
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from Utils.command_sync import get_sync_mode, sync_if_changed
+from Utils.gateway_session import install_session_resume, track_interactions
+from Utils.blacklist import install_blacklist
+from Utils.guild_config import GuildConfigStore
+from Utils.indexes import ensure_indexes
+from Utils.loader import SingleFlightLoader
+from Utils.permissions import install_permissions
+from Utils.resolver import install_resolver
+from Utils.direct_messages import DirectMessages
+from Utils.member_names import install_member_names
+from Utils.tiered_cache import create_cache
+from Utils.member_cache import create_cache_policies
+from Utils.warmup import prefetch_guild_configs, warm_connection_pool
+from Utils.sharding import create_client, is_primary, total_guild_count
+
+# Every command is an application command, so message, reaction and typing events are never needed.
+INTENTS = (Intents.DEFAULT | Intents.GUILD_MEMBERS) & ~(Intents.MESSAGES | Intents.REACTIONS | Intents.TYPING)
+
+EXTENSIONS = (
+    "Extensions.developer.commands",
+    "Extensions.core.commands",
+    "Extensions.config.config",
+    "Extensions.staff-management.promotions",
+    "Extensions.staff-management.infractions",
+)
+
+
+class NamespacedCache:
+    """One bot's view of the shared cache; every key is prefixed with the bot's namespace."""
+
+    def __init__(self, cache, namespace: str):
+        self.cache = cache
+        self.namespace = namespace
+
+    async def get(self, key, default=None):
+        return await self.cache.get(key, default, namespace=self.namespace)
+
+    async def set(self, key, value, ttl=None):
+        return await self.cache.set(key, value, ttl=ttl, namespace=self.namespace)
+
+    async def delete(self, key):
+        return await self.cache.delete(key, namespace=self.namespace)
+
+    async def multi_get(self, keys):
+        return await self.cache.multi_get(keys, namespace=self.namespace)
+
+    async def multi_set(self, pairs, ttl=None):
+        return await self.cache.multi_set(pairs, ttl=ttl, namespace=self.namespace)
+
+    def stats(self):
+        return self.cache.stats()
+
+
+class SharedResources:
+    """Connections every bot in the process shares: one Mongo pool and one cache (bounded L1, plus Redis when REDIS_URL is set)."""
+
+    def __init__(self):
+        self.db_client = AsyncIOMotorClient(os.environ.get("MONGODB_URI"), minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")))
+        self.cache = create_cache()
+
+    def cache_for(self, namespace: str = None):
+        return NamespacedCache(self.cache, f"{namespace}:") if namespace else self.cache
+
+    def close(self):
+        self.db_client.close()
+        if hasattr(self.cache, "close"):
+            self.cache.close()
+
+
+def create_bot(shared: SharedResources, timeline, logger: logging.Logger, name: str = None, database: str = "Chirp", brand: str = "Chirp", session_path: str = None):
+    command_sync_mode = get_sync_mode()
+    member_cache, user_cache = create_cache_policies()
+
+    bot = create_client(intents=INTENTS, sync_interactions=command_sync_mode == "always", asyncio_debug=False, logger=logger, activity=Activity(type=ActivityType.PLAYING, name=f"{brand} Bot | /help"), member_cache=member_cache, user_cache=user_cache)
+
+    bot.instance_name = name
+    bot.mem_cache = shared.cache_for(name)
+    bot.db_client = shared.db_client
+    bot.db = shared.db_client[database]
+    bot.loader = SingleFlightLoader(bot.mem_cache)
+    bot.guild_config = GuildConfigStore(bot)
+    bot.dms = DirectMessages(bot)
+    bot.member_cache_policy = member_cache
+    bot.startup_timeline = timeline
+    bot.ready = False
+
+    track_interactions(bot)
+    install_blacklist(bot)
+    install_permissions(bot)
+    install_resolver(bot)
+    install_member_names(bot)
+    if os.getenv("GATEWAY_RESUME", "true").lower() == "true":
+        install_session_resume(bot, session_path)
+
+    async def ping_database():
+        try:
+            await bot.db_client.admin.command("ping")
+            logger.info("Connected to MongoDB successfully.")
+        except Exception as e:
+            logger.exception("Failed to connect to MongoDB.")
+
+    async def sync_commands():
+        if command_sync_mode != "manifest" or not is_primary(bot):
+            return
+        try:
+            await sync_if_changed(bot)
+        except Exception:
+            logger.exception("Failed to sync application commands from manifest.")
+
+    async def bootstrap_indexes():
+        if os.getenv("INDEX_BOOTSTRAP", "true").lower() != "true" or not is_primary(bot):
+            return
+        await ensure_indexes(bot)
+
+    async def set_startup_presence():
+        guild_count = await total_guild_count(bot)
+        await bot.change_presence(activity=Activity(type=ActivityType.PLAYING, name=f"{brand} Bot | /help | {guild_count} servers"))
+
+    async def update_servers_activity_task():
+        guild_count = await total_guild_count(bot)
+        current_activity = bot.activity
+        if current_activity and current_activity.name == f"{brand} | /help | {guild_count} servers":
+            return
+        await bot.change_presence(activity=Activity(type=ActivityType.PLAYING, name=f"{brand} | /help | {guild_count} servers"))
+        logger.info(f"Updated activity to {guild_count} servers.")
+
+    activity_task = Task(update_servers_activity_task, IntervalTrigger(minutes=5))
+
+    async def on_startup():
+        timeline.end("gateway_ready")
+        logger.info("Bot is starting up...")
+        activity_task.start()
+        # None of these depend on each other, so run them side by side instead of back to back.
+        results = await asyncio.gather(
+            timeline.run("db_ping", ping_database()),
+            timeline.run("command_sync", sync_commands()),
+            timeline.run("index_bootstrap", bootstrap_indexes()),
+            timeline.run("presence", set_startup_presence()),
+            timeline.run("config_prefetch", prefetch_guild_configs(bot)),
+            timeline.run("mongo_pool_warmup", warm_connection_pool(bot)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Startup phase failed", exc_info=result)
+        logger.info(timeline.format_report())
+
+    async def on_ready():
+        if bot.ready:
+            return
+        bot.ready = True
+        logger.info(f"Bot is ready. Logged in as {bot.user} (ID: {bot.user.id})")
+
+    async def on_error(event, *args, **kwargs):
+        logger.exception(f"Error in event {event}")
+
+    bot.add_listener(Listener.create("on_startup")(on_startup))
+    bot.add_listener(Listener.create("on_ready")(on_ready))
+    bot.add_listener(Listener.create("on_error")(on_error))
+
+    timeline.start("extension_loads")
+    for extension in EXTENSIONS:
+        bot.load_extension(extension)
+    timeline.end("extension_loads")
+    return bot
@@ -0,0 +1,55 @@
+import asyncio
+import os
+
+# Cached in place of a document that doesn't exist; a dict so it survives the Redis tier's BSON encoding.
+MISSING = {"__missing__": True}
+
+
+class SingleFlightLoader:
+    """Cache-aside loading for one bot's mem_cache.
+
+    Concurrent misses on a key share one query, and "not found" is cached for
+    NEGATIVE_CACHE_TTL seconds (default 30) so repeated lookups of a bad ID stay off Mongo.
+    """
+
+    def __init__(self, cache, negative_ttl: float = None):
+        self.cache = cache
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(os.getenv("NEGATIVE_CACHE_TTL", "30"))
+        self.inflight = {}
+        self.queries = 0
+        self.coalesced = 0
+        self.negative_hits = 0
+
+    async def load(self, key: str, loader):
+        """Run loader() once for all concurrent callers asking for key."""
+        task = self.inflight.get(key)
+        if task is None:
+            self.queries += 1
+            # Its own task, so one caller being cancelled doesn't fail the others waiting on it.
+            task = self.inflight[key] = asyncio.ensure_future(loader())
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def get(self, key: str, loader, ttl=None):
+        """mem_cache.get(key), falling back to loader() on a miss; returns None when not found."""
+        value = await self.cache.get(key)
+        if value is not None:
+            if value == MISSING:
+                self.negative_hits += 1
+                return None
+            return value
+        return await self.load(key, lambda: self._fill(key, loader, ttl))
+
+    async def _fill(self, key, loader, ttl):
+        value = await loader()
+        if value is None:
+            if self.negative_ttl:
+                await self.cache.set(key, MISSING, ttl=self.negative_ttl)
+        else:
+            await self.cache.set(key, value, ttl=ttl)
+        return value
+
+    def stats(self) -> dict:
+        return {"queries": self.queries, "coalesced": self.coalesced, "negative_hits": self.negative_hits, "inflight": len(self.inflight)}
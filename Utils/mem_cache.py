@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+from collections import OrderedDict
+
+# key prefix -> (max entries, default ttl seconds; 0 = no expiry). Overridable with MEM_CACHE_LIMITS / MEM_CACHE_TTLS.
+DEFAULT_LIMITS = {
+    "config": 20000, "infraction": 5000, "promotion": 5000, "dm": 20000, "member": 50000,
+    "generation": 20000, "result": 5000, "default": 5000,
+}
+DEFAULT_TTLS = {
+    "config": 0, "infraction": 900, "promotion": 900, "dm": 3600, "member": 600,
+    "generation": 0, "result": 300, "default": 600,
+}
+
+
+def infraction_key(guild_id, infraction_id) -> str:
+    return f"infraction_{guild_id}_{infraction_id}"
+
+
+def promotion_key(guild_id, promotion_id) -> str:
+    return f"promotion_{guild_id}_{promotion_id}"
+
+
+def _parse_mapping(value: str, defaults: dict) -> dict:
+    mapping = dict(defaults)
+    for item in (value or "").split(","):
+        name, _, amount = item.partition("=")
+        if name.strip() and amount.strip():
+            mapping[name.strip()] = int(amount)
+    return mapping
+
+
+def approx_bytes(value, depth: int = 3) -> int:
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        size += sum(approx_bytes(k, 0) + approx_bytes(v, depth - 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(approx_bytes(v, depth - 1) for v in value)
+    elif hasattr(type(value), "__slots__"):
+        size += sum(
+            approx_bytes(getattr(value, name, None), depth - 1)
+            for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ())
+        )
+    return size
+
+
+class _Section:
+
+    def __init__(self, capacity: int, ttl: int):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (value, expires_at or None, approx bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+        return entry
+
+
+class BoundedCache:
+    """In-memory cache with the aiocache call signatures, bounded per key prefix.
+
+    A key's section is its prefix ("config_1" -> config). Each section has its own LRU
+    capacity and default TTL; expired entries are dropped when touched or evicted first.
+    """
+
+    def __init__(self, limits: dict = None, ttls: dict = None):
+        self.limits = limits or _parse_mapping(os.getenv("MEM_CACHE_LIMITS"), DEFAULT_LIMITS)
+        self.ttls = ttls or _parse_mapping(os.getenv("MEM_CACHE_TTLS"), DEFAULT_TTLS)
+        self.sections = {}
+
+    def _section(self, key: str) -> _Section:
+        name = key.split("_", 1)[0] if "_" in key else "default"
+        if name not in self.limits:
+            name = "default"
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self.limits[name], self.ttls.get(name, self.ttls["default"]))
+        return section
+
+    def _get(self, key, default=None, namespace=None):
+        section = self._section(key)
+        full_key = f"{namespace}{key}" if namespace else key
+        entry = section.entries.get(full_key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            section.pop(full_key)
+            section.expirations += 1
+            entry = None
+        if entry is None:
+            section.misses += 1
+            return default
+        section.entries.move_to_end(full_key)
+        section.hits += 1
+        return entry[0]
+
+    def _set(self, key, value, ttl=None, namespace=None):
+        section = self._section(key)
+        full_key = f"{namespace}{key}" if namespace else key
+        ttl = section.ttl if ttl is None else ttl
+        size = approx_bytes(value)
+        section.pop(full_key)
+        section.entries[full_key] = (value, time.monotonic() + ttl if ttl else None, size)
+        section.bytes += size
+        while len(section.entries) > section.capacity:
+            _, entry = section.entries.popitem(last=False)
+            section.bytes -= entry[2]
+            section.evictions += 1
+        return True
+
+    def ttl_for(self, key) -> int:
+        return self._section(key).ttl
+
+    def discard(self, key, namespace=None):
+        full_key = f"{namespace}{key}" if namespace else key
+        return self._section(key).pop(full_key) is not None
+
+    async def get(self, key, default=None, namespace=None):
+        return self._get(key, default, namespace)
+
+    async def set(self, key, value, ttl=None, namespace=None):
+        return self._set(key, value, ttl, namespace)
+
+    async def delete(self, key, namespace=None):
+        return 1 if self.discard(key, namespace) else 0
+
+    async def exists(self, key, namespace=None):
+        return self._get(key, None, namespace) is not None
+
+    async def multi_get(self, keys, namespace=None):
+        return [self._get(key, None, namespace) for key in keys]
+
+    async def multi_set(self, pairs, ttl=None, namespace=None):
+        for key, value in pairs:
+            self._set(key, value, ttl, namespace)
+        return True
+
+    async def clear(self, namespace=None):
+        for section in self.sections.values():
+            for full_key in [k for k in section.entries if not namespace or k.startswith(namespace)]:
+                section.pop(full_key)
+        return True
+
+    def stats(self) -> dict:
+        sections = {
+            name: {
+                "entries": len(section.entries),
+                "capacity": section.capacity,
+                "ttl_s": section.ttl or None,
+                "approx_bytes": section.bytes,
+                "hits": section.hits,
+                "misses": section.misses,
+                "evictions": section.evictions,
+                "expirations": section.expirations,
+            }
+            for name, section in self.sections.items()
+        }
+        return {
+            "entries": sum(s["entries"] for s in sections.values()),
+            "approx_bytes": sum(s["approx_bytes"] for s in sections.values()),
+            "sections": sections,
+        }
@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+from collections import OrderedDict
+
+_SHARED_FIELDS = {"_client", "logger"}
+
+
+def approx_size(obj):
+    size = sys.getsizeof(obj)
+    for field in getattr(type(obj), "__attrs_attrs__", ()):
+        if field.name not in _SHARED_FIELDS:
+            size += sys.getsizeof(getattr(obj, field.name, None))
+    return size
+
+
+class BudgetedCache(OrderedDict):
+
+    def __init__(self, budget_mb: float, recent_seconds: float, scan_limit: int = 1000):
+        super().__init__()
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.recent_seconds = recent_seconds
+        self.scan_limit = scan_limit
+        self.total_bytes = 0
+        self.evictions = 0
+        self.overruns = 0
+        self._sizes = {}
+        self._last_used = {}
+
+    def is_protected(self, key, value):
+        return False
+
+    def _track(self, key, value):
+        size = approx_size(value)
+        self._sizes[key] = size
+        self.total_bytes += size
+
+    def _resize(self, key, value):
+        size = approx_size(value)
+        self.total_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _forget(self, key):
+        self.total_bytes -= self._sizes.pop(key, 0)
+        self._last_used.pop(key, None)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self._resize(key, value)
+        else:
+            self._track(key, value)
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self._last_used[key] = time.monotonic()
+        if self.total_bytes > self.budget_bytes:
+            self.evict()
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        self._last_used[key] = time.monotonic()
+        return super().__getitem__(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._forget(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = super().__getitem__(key)
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self, last: bool = True):
+        key, value = super().popitem(last=last)
+        self._forget(key)
+        return key, value
+
+    def clear(self):
+        super().clear()
+        self._sizes.clear()
+        self._last_used.clear()
+        self.total_bytes = 0
+
+    def evict(self):
+        # Evict down to 90% of the budget so a full cache doesn't scan on every insert.
+        target = self.budget_bytes * 0.9
+        now = time.monotonic()
+        victims = []
+        protected = []
+        freed = 0
+        for scanned, key in enumerate(self):
+            if self.total_bytes - freed <= target or scanned >= self.scan_limit:
+                break
+            # Entries are ordered by last use (protected ones are parked at the end), so everything from here on is recent too.
+            if now - self._last_used.get(key, 0) < self.recent_seconds:
+                break
+            if self.is_protected(key, super().__getitem__(key)):
+                protected.append(key)
+                continue
+            victims.append(key)
+            freed += self._sizes.get(key, 0)
+        # Park protected entries at the end so the next pass starts on evictable ones.
+        for key in protected:
+            self.move_to_end(key)
+        for key in victims:
+            self.pop(key, None)
+        self.evictions += len(victims)
+        if self.total_bytes > self.budget_bytes:
+            self.overruns += 1
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "approx_bytes": self.total_bytes,
+            "budget_bytes": self.budget_bytes,
+            "evictions": self.evictions,
+            "overruns": self.overruns,
+        }
+
+
+class MemberCachePolicy(BudgetedCache):
+
+    def __init__(self, budget_mb: float, recent_seconds: float):
+        super().__init__(budget_mb, recent_seconds)
+        self.protected_roles = {}
+        self._user_refs = {}
+
+    def _track(self, key, value):
+        super()._track(key, value)
+        self._user_refs[key[1]] = self._user_refs.get(key[1], 0) + 1
+
+    def _forget(self, key):
+        super()._forget(key)
+        refs = self._user_refs.get(key[1], 0) - 1
+        if refs > 0:
+            self._user_refs[key[1]] = refs
+        else:
+            self._user_refs.pop(key[1], None)
+
+    def clear(self):
+        super().clear()
+        self._user_refs.clear()
+
+    def has_user(self, user_id):
+        return user_id in self._user_refs
+
+    def set_protected_roles(self, guild_id, role_ids):
+        role_ids = {int(r) for r in role_ids if r}
+        if role_ids:
+            self.protected_roles[int(guild_id)] = role_ids
+        else:
+            self.protected_roles.pop(int(guild_id), None)
+
+    def is_protected(self, key, member):
+        roles = self.protected_roles.get(key[0])
+        return bool(roles) and not roles.isdisjoint(getattr(member, "_role_ids", ()))
+
+    def stats(self):
+        return super().stats() | {"protected_guilds": len(self.protected_roles)}
+
+
+class UserCachePolicy(BudgetedCache):
+
+    def __init__(self, members: MemberCachePolicy, budget_mb: float, recent_seconds: float):
+        super().__init__(budget_mb, recent_seconds)
+        self.members = members
+
+    def is_protected(self, user_id, user):
+        return self.members.has_user(user_id)
+
+
+def create_cache_policies():
+    recent_seconds = float(os.getenv("MEMBER_CACHE_RECENT_SECONDS", "900"))
+    members = MemberCachePolicy(float(os.getenv("MEMBER_CACHE_BUDGET_MB", "64")), recent_seconds)
+    users = UserCachePolicy(members, float(os.getenv("USER_CACHE_BUDGET_MB", "32")), recent_seconds)
+    return members, users
+
+
+def update_protected_roles(bot, guild_id, config):
+    policy = getattr(bot, "member_cache_policy", None)
+    if policy is not None:
+        policy.set_protected_roles(guild_id, config.promotion_issuer_roles | config.infraction_issuer_roles)
+
+
+def cache_stats(bot):
+    policy = getattr(bot, "member_cache_policy", None)
+    if policy is None:
+        return None
+    return {"members": policy.stats(), "users": bot.cache.user_cache.stats() if isinstance(bot.cache.user_cache, BudgetedCache) else None}
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import uuid
+from typing import Dict, Iterable, Optional
+
+from interactions import Listener
+
+# Discord caps user_ids per Request Guild Members.
+CHUNK_USER_IDS = 100
+
+
+def member_name_key(guild_id, user_id) -> str:
+    return f"member_{guild_id}_{user_id}"
+
+
+def member_info(member) -> Optional[Dict[str, str]]:
+    if not member:
+        return None
+    try:
+        user = getattr(member, "user", member)
+        display_name = (
+            getattr(member, "display_name", None)
+            or getattr(user, "global_name", None)
+            or getattr(user, "username", None)
+            or getattr(member, "name", None)
+        )
+        username = getattr(user, "username", None) or getattr(user, "name", None)
+        return {"display_name": str(display_name) if display_name else None, "username": str(username) if username else None}
+    except Exception:
+        return None
+
+
+def _chunk_member_info(data: dict) -> Dict[str, str]:
+    user = data.get("user") or {}
+    display_name = data.get("nick") or user.get("global_name") or user.get("username")
+    return {"display_name": display_name, "username": user.get("username")}
+
+
+class MemberNames:
+    """Member display/user names for API listings, cached per guild under member_{guild}_{user}.
+
+    Ids not in mem_cache or the gateway member cache are resolved together with one
+    Request Guild Members (per 100 ids), waited on for MEMBER_CHUNK_TIMEOUT seconds (default 5).
+    Members the gateway reports as not found are cached as {} so they aren't asked for again.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.timeout = float(os.getenv("MEMBER_CHUNK_TIMEOUT", "5"))
+        self.pending = {}
+        self.requests = 0
+        self.timeouts = 0
+
+    async def resolve(self, guild_id: int, user_ids: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        guild = self.bot.get_guild(int(guild_id))
+        if not guild:
+            return {}
+        ids = list(dict.fromkeys(str(uid) for uid in user_ids if str(uid).isdigit()))
+        cached = await self.bot.mem_cache.multi_get([member_name_key(guild.id, uid) for uid in ids])
+        found = {}
+        fresh = {}
+        missing = []
+        for uid, info in zip(ids, cached):
+            if info is not None:
+                found[uid] = info
+            elif info := member_info(guild.get_member(int(uid))):
+                found[uid] = fresh[uid] = info
+            else:
+                missing.append(uid)
+        if missing:
+            batches = [missing[i:i + CHUNK_USER_IDS] for i in range(0, len(missing), CHUNK_USER_IDS)]
+            for fetched in await asyncio.gather(*(self._request(guild, batch) for batch in batches)):
+                fresh.update(fetched)
+                found.update(fetched)
+        if fresh:
+            await self.bot.mem_cache.multi_set([(member_name_key(guild.id, uid), info) for uid, info in fresh.items()])
+        return {uid: info for uid, info in found.items() if info}
+
+    async def _request(self, guild, user_ids: list) -> Dict[str, Dict[str, str]]:
+        nonce = uuid.uuid4().hex
+        waiter = self.pending[nonce] = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        try:
+            await self.bot.get_guild_websocket(guild.id).request_member_chunks(guild.id, limit=0, user_ids=user_ids, nonce=nonce)
+            return await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return {}
+        except Exception:
+            self.bot.logger.warning(f"Member name lookup failed for guild {guild.id}.", exc_info=True)
+            return {}
+        finally:
+            self.pending.pop(nonce, None)
+
+    def on_chunk(self, data: dict):
+        waiter = self.pending.get(data.get("nonce"))
+        if waiter is None or waiter.done():
+            return
+        # A user_ids request of at most 100 always comes back as a single chunk.
+        names = {str(uid): {} for uid in data.get("not_found") or []}
+        for member in data.get("members") or []:
+            names[str(member["user"]["id"])] = _chunk_member_info(member)
+        waiter.set_result(names)
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "timeouts": self.timeouts, "pending": len(self.pending)}
+
+
+def install_member_names(bot):
+    member_names = MemberNames(bot)
+    bot.member_names = member_names
+
+    async def on_raw_guild_members_chunk(event):
+        member_names.on_chunk(event.data)
+
+    bot.add_listener(Listener.create("raw_guild_members_chunk")(on_raw_guild_members_chunk))
+    return member_names
@@ -0,0 +1,275 @@
+"""Slotted records for guild configs, infractions and promotions.
+
+Mongo documents are parsed once, when they're loaded: ids become ints and timestamps naive UTC
+datetimes. to_doc() gives back the stored shape (string ids, ISO timestamps), which is what gets
+inserted and what the Redis cache tier and the API IPC carry.
+"""
+import ast
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def to_int(value) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def to_datetime(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Millisecond epochs show up in docs written by the dashboard.
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, timezone.utc).replace(tzinfo=None)
+    elif isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _str_id(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _first(doc: dict, *keys):
+    for key in keys:
+        if doc.get(key):
+            return doc[key]
+    return None
+
+
+def _role_ids(value) -> frozenset:
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    return frozenset(role_id for role_id in map(to_int, values) if role_id)
+
+
+def _infraction_types(value) -> tuple:
+    if isinstance(value, str):
+        # Some older configs stored the list as its repr.
+        try:
+            parsed = ast.literal_eval(value)
+            value = parsed if isinstance(parsed, list) else [parsed]
+        except Exception:
+            value = [value]
+    if not isinstance(value, (list, tuple)):
+        value = [value] if value is not None else []
+    types = []
+    for item in value:
+        name = str(item).strip()[:100] if item is not None else ""
+        if name and name not in types:
+            types.append(name)
+    return tuple(types)
+
+
+class GuildConfig:
+    kind = "config"
+    __slots__ = (
+        "guild_id", "infraction_log", "infraction_audit_log", "promotion_log", "promotion_audit_log",
+        "infraction_issuer_roles", "promotion_issuer_roles", "infraction_types", "settings",
+    )
+
+    def __init__(self, guild_id=None, settings: dict = None):
+        settings = settings or {}
+        self.guild_id = to_int(guild_id)
+        self.infraction_log = to_int(settings.get("infraction_log"))
+        self.infraction_audit_log = to_int(settings.get("infraction_audit_log"))
+        self.promotion_log = to_int(settings.get("promotion_log"))
+        self.promotion_audit_log = to_int(settings.get("promotion_audit_log"))
+        self.infraction_issuer_roles = _role_ids(settings.get("infraction_issuer_role"))
+        self.promotion_issuer_roles = _role_ids(settings.get("promotion_issuer_role"))
+        self.infraction_types = _infraction_types(settings.get("infraction_types"))
+        # Everything the guild has set, as stored, for the config view and the dashboard.
+        self.settings = settings
+
+    @classmethod
+    def from_doc(cls, doc: Optional[dict]) -> "GuildConfig":
+        doc = doc or {}
+        return cls(doc.get("guild_id"), {k: v for k, v in doc.items() if k not in ("_id", "guild_id")})
+
+    def to_doc(self) -> dict:
+        doc = dict(self.settings)
+        if self.guild_id is not None:
+            doc["guild_id"] = str(self.guild_id)
+        return doc
+
+
+class StaffRecord:
+    """Fields shared by infractions and promotions; kind names the id and message fields in the doc."""
+
+    kind = None
+    __slots__ = (
+        "_id", "record_id", "guild_id", "member_id", "issued_by_id", "issued_by_name", "reason", "timestamp",
+        "message_id", "channel_id", "audit_message_id", "audit_channel_id", "render",
+    )
+
+    def __init__(self, record_id=None, guild_id=None, member_id=None, issued_by_id=None, reason=None, timestamp=None,
+                 render=None, _id=None, issued_by_name=None, message_id=None, channel_id=None,
+                 audit_message_id=None, audit_channel_id=None):
+        self._id = _id
+        self.record_id = record_id
+        self.guild_id = to_int(guild_id)
+        self.member_id = to_int(member_id)
+        self.issued_by_id = to_int(issued_by_id)
+        self.issued_by_name = issued_by_name
+        self.reason = reason
+        self.timestamp = to_datetime(timestamp)
+        self.message_id = to_int(message_id)
+        self.channel_id = to_int(channel_id)
+        self.audit_message_id = to_int(audit_message_id)
+        self.audit_channel_id = to_int(audit_channel_id)
+        self.render = render
+
+    @classmethod
+    def _fields_from_doc(cls, doc: dict) -> dict:
+        # Docs written by older versions of the bot and by the dashboard use a handful of field names.
+        by = _first(doc, "by", "actor", "moderator", "author", "executor", "staff")
+        target = doc.get("target")
+        by_name = None
+        by_id = None
+        if isinstance(by, dict):
+            by_name = _first(by, "username", "global_name", "name", "tag")
+            by_id = by.get("id")
+        elif by:
+            by_name = str(by)
+        return {
+            "_id": doc.get("_id"),
+            "record_id": _first(doc, f"{cls.kind}_id", "id", "short_id", "code"),
+            "guild_id": doc.get("guild_id"),
+            "member_id": (
+                _first(target, "id", "user_id", "member_id") if isinstance(target, dict)
+                else _first(doc, "member_id", "user_id", "target_id")
+            ),
+            "issued_by_id": by_id or _first(doc, "issued_by_id", "by_id", "moderator_id", "staff_id", "author_id", "executor_id"),
+            "issued_by_name": by_name or _first(
+                doc, "by_username", "by_name", "moderator_tag", "moderator_name", "moderator_username", "staff_tag",
+                "staff_name", "author_tag", "author_username", "executor_tag", "executor_username", "issued_by",
+            ),
+            "reason": _first(doc, "reason", "note", "notes"),
+            "timestamp": _first(doc, "timestamp", "created_at", "ts"),
+            "message_id": doc.get(f"{cls.kind}_message_id"),
+            "channel_id": doc.get(f"{cls.kind}_channel_id"),
+            "audit_message_id": doc.get(f"{cls.kind}_audit_message_id"),
+            "audit_channel_id": doc.get(f"{cls.kind}_audit_channel_id"),
+            "render": doc.get("render"),
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict):
+        return cls(**cls._fields_from_doc(doc))
+
+    def to_doc(self) -> dict:
+        doc = {
+            f"{self.kind}_id": self.record_id,
+            "guild_id": _str_id(self.guild_id),
+            "member_id": _str_id(self.member_id),
+            "issued_by_id": _str_id(self.issued_by_id),
+            f"{self.kind}_message_id": self.message_id,
+            f"{self.kind}_channel_id": _str_id(self.channel_id),
+            f"{self.kind}_audit_message_id": self.audit_message_id,
+            f"{self.kind}_audit_channel_id": _str_id(self.audit_channel_id),
+            "reason": self.reason,
+            "timestamp": _iso(self.timestamp),
+            "render": self.render,
+        }
+        if self._id is not None:
+            doc["_id"] = self._id
+        if self.issued_by_name is not None:
+            doc["issued_by"] = self.issued_by_name
+        return doc
+
+    @property
+    def display_id(self) -> Optional[str]:
+        if self.record_id:
+            return str(self.record_id)
+        return str(self._id) if self._id is not None else None
+
+    def to_api(self, names: dict = None) -> dict:
+        by_info = (names or {}).get(_str_id(self.issued_by_id)) or {}
+        target_info = (names or {}).get(_str_id(self.member_id)) or {}
+        return {
+            "id": self.display_id,
+            "reason": self.reason or "",
+            "by": by_info.get("display_name") or self.issued_by_name,
+            "by_id": _str_id(self.issued_by_id),
+            "by_username": by_info.get("username"),
+            "target_id": _str_id(self.member_id),
+            "target": target_info.get("display_name"),
+            "target_username": target_info.get("username"),
+            "created_at": int(self.timestamp.replace(tzinfo=timezone.utc).timestamp()) if self.timestamp else None,
+        }
+
+
+class Infraction(StaffRecord):
+    kind = "infraction"
+    __slots__ = ("infraction_type", "expires_at", "temporary_duration", "expired_notified")
+
+    def __init__(self, infraction_type=None, expires_at=None, temporary_duration=None, expired_notified=False, **fields):
+        super().__init__(**fields)
+        self.infraction_type = infraction_type
+        self.expires_at = to_datetime(expires_at)
+        self.temporary_duration = temporary_duration
+        self.expired_notified = bool(expired_notified)
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "Infraction":
+        return cls(
+            infraction_type=doc.get("infraction_type"),
+            expires_at=doc.get("expires_at"),
+            temporary_duration=doc.get("temporary_duration"),
+            expired_notified=doc.get("expired_notified", False),
+            **cls._fields_from_doc(doc),
+        )
+
+    def to_doc(self) -> dict:
+        doc = super().to_doc()
+        doc.update({
+            "infraction_type": self.infraction_type,
+            "expires_at": _iso(self.expires_at),
+            "temporary_duration": self.temporary_duration,
+        })
+        if self.expired_notified:
+            doc["expired_notified"] = True
+        return doc
+
+
+class Promotion(StaffRecord):
+    kind = "promotion"
+    __slots__ = ("new_role_id",)
+
+    def __init__(self, new_role_id=None, **fields):
+        super().__init__(**fields)
+        self.new_role_id = to_int(new_role_id)
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "Promotion":
+        return cls(new_role_id=doc.get("new_role_id"), **cls._fields_from_doc(doc))
+
+    def to_doc(self) -> dict:
+        doc = super().to_doc()
+        doc["new_role_id"] = _str_id(self.new_role_id)
+        return doc
+
+
+MODELS = {model.kind: model for model in (GuildConfig, Infraction, Promotion)}
+
+
+def dump(value):
+    """A cache value in a form that survives BSON/JSON: models become their tagged doc."""
+    if isinstance(value, (GuildConfig, StaffRecord)):
+        return {"__model__": value.kind, "doc": value.to_doc()}
+    return value
+
+
+def load(value):
+    if isinstance(value, dict) and "__model__" in value:
+        return MODELS[value["__model__"]].from_doc(value["doc"])
+    return value
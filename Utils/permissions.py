@@ -0,0 +1,70 @@
+from interactions import Listener
+
+# capability -> GuildConfig attribute holding the roles allowed to use it
+CAPABILITY_ROLES = {
+    "promote": "promotion_issuer_roles",
+    "infract": "infraction_issuer_roles",
+}
+
+ALLOWED = "allowed"
+DENIED = "denied"
+ROLE_MISSING = "role_missing"
+
+
+class StaffPermissions:
+    """Per-guild allowed role ids for each staff capability, checked with a set intersection.
+
+    Rules are built from the guild config and the cached guild roles (never REST), and dropped
+    whenever the config is written or one of the guild's roles is created, updated or deleted.
+    A capability whose configured roles aren't cached (yet) is rebuilt on every check instead
+    of being remembered as missing.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.rules = {}
+
+    def _build(self, guild, config) -> dict:
+        rules = {}
+        for capability, attribute in CAPABILITY_ROLES.items():
+            role_ids = getattr(config, attribute)
+            if not role_ids:
+                rules[capability] = None
+                continue
+            rules[capability] = frozenset(r for r in role_ids if guild.get_role(r) is not None)
+        return rules
+
+    async def check(self, guild, member, capability: str) -> str:
+        rules = self.rules.get(int(guild.id))
+        if rules is None:
+            rules = self._build(guild, await self.bot.guild_config.get(guild.id))
+            if frozenset() not in rules.values():
+                self.rules[int(guild.id)] = rules
+        allowed = rules[capability]
+        if allowed is None:
+            return ALLOWED
+        if not allowed:
+            return ROLE_MISSING
+        return DENIED if allowed.isdisjoint(getattr(member, "_role_ids", ())) else ALLOWED
+
+    def invalidate(self, guild_id):
+        self.rules.pop(int(guild_id), None)
+
+    def stats(self) -> dict:
+        return {"guilds": len(self.rules)}
+
+
+def install_permissions(bot):
+    permissions = StaffPermissions(bot)
+    bot.permissions = permissions
+
+    async def on_role_change(event):
+        permissions.invalidate(event.guild_id)
+
+    async def on_guild_left(event):
+        permissions.invalidate(event.guild_id)
+
+    for event_name in ("on_role_create", "on_role_update", "on_role_delete"):
+        bot.add_listener(Listener.create(event_name)(on_role_change))
+    bot.add_listener(Listener.create("on_guild_left")(on_guild_left))
+    return permissions
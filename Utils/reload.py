@@ -0,0 +1,33 @@
+import sys
+import time
+
+
+def reload_extension(bot, name: str):
+    """Reload an extension, handing in-memory state from the old instances to the new ones.
+
+    Extensions opt in with export_state() -> dict, called before unload, and
+    import_state(state), called on whichever instance with the same name is live afterwards:
+    the reloaded one, or the old module's if the library reverted a failed reload.
+    Returns (seconds taken, names of extensions whose state was carried over).
+    """
+    started = time.perf_counter()
+    module = sys.modules.get(name)
+    states = {}
+    for ext in bot.get_extensions(name):
+        export_state = getattr(ext, "export_state", None)
+        if callable(export_state):
+            states[ext.name] = export_state()
+
+    restored = []
+    try:
+        bot.reload_extension(name)
+    finally:
+        # Runs even when the reload raised, so whatever is still loaded gets its timers back.
+        for ext in bot.get_extensions(name):
+            import_state = getattr(ext, "import_state", None)
+            if ext.name in states and callable(import_state):
+                import_state(states[ext.name])
+                restored.append(ext.name)
+    if module is not None and sys.modules.get(name) is module:
+        bot.logger.warning(f"Reload of {name} failed and was reverted to the previous version.")
+    return time.perf_counter() - started, restored
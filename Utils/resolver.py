@@ -0,0 +1,104 @@
+import os
+import time
+
+from interactions import Listener
+
+
+class ObjectResolver:
+    """Channel and role lookups: the gateway cache first, then at most one REST fetch per id.
+
+    Fetched objects are kept until their delete event; ids that failed to fetch are
+    remembered for RESOLVER_NEGATIVE_TTL seconds (default 300) instead of retried per call,
+    at most RESOLVER_NEGATIVE_LIMIT of them (default 10000) per kind.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.negative_ttl = float(os.getenv("RESOLVER_NEGATIVE_TTL", "300"))
+        self.negative_limit = int(os.getenv("RESOLVER_NEGATIVE_LIMIT", "10000"))
+        self.channels = {}
+        self.roles = {}
+        self.missing_channels = {}
+        self.missing_roles = {}
+        self.fetches = 0
+
+    def _remember_missing(self, missing: dict, key):
+        now = time.monotonic()
+        # Every entry gets the same TTL, so insertion order is expiry order and the oldest go first.
+        while missing:
+            oldest = next(iter(missing))
+            if missing[oldest] > now and len(missing) < self.negative_limit:
+                break
+            del missing[oldest]
+        missing[key] = now + self.negative_ttl
+
+    async def _resolve(self, memo: dict, missing: dict, guild, object_id, get, fetch):
+        object_id = int(object_id)
+        found = get(object_id)
+        if found is not None:
+            return found
+        key = (int(guild.id), object_id)
+        if key in memo:
+            return memo[key]
+        expires = missing.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                return None
+            del missing[key]
+        self.fetches += 1
+        try:
+            found = await fetch(object_id)
+        except Exception:
+            found = None
+        if found is not None:
+            memo[key] = found
+        else:
+            self._remember_missing(missing, key)
+        return found
+
+    async def channel(self, guild, channel_id):
+        return await self._resolve(self.channels, self.missing_channels, guild, channel_id, guild.get_channel, guild.fetch_channel)
+
+    async def role(self, guild, role_id):
+        return await self._resolve(self.roles, self.missing_roles, guild, role_id, guild.get_role, guild.fetch_role)
+
+    def forget_guild(self, guild_id):
+        guild_id = int(guild_id)
+        for memo in (self.channels, self.roles, self.missing_channels, self.missing_roles):
+            for key in [key for key in memo if key[0] == guild_id]:
+                del memo[key]
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self.channels),
+            "roles": len(self.roles),
+            "missing": len(self.missing_channels) + len(self.missing_roles),
+            "fetches": self.fetches,
+        }
+
+
+async def edit_message_embed(bot, channel_id, message_id, embed: dict):
+    """Replace a message's embed by id, without fetching the message first."""
+    await bot.http.edit_message({"embeds": [embed]}, int(channel_id), int(message_id))
+
+
+def install_resolver(bot):
+    resolver = ObjectResolver(bot)
+    bot.resolver = resolver
+
+    async def on_channel_delete(event):
+        guild_id = getattr(event.channel, "_guild_id", None)
+        if guild_id is None:
+            return
+        resolver.channels.pop((int(guild_id), int(event.channel.id)), None)
+
+    async def on_role_delete(event):
+        resolver.roles.pop((int(event.guild_id), int(event.id)), None)
+
+    async def on_guild_left(event):
+        resolver.forget_guild(event.guild_id)
+
+    bot.add_listener(Listener.create("on_channel_delete")(on_channel_delete))
+    bot.add_listener(Listener.create("on_role_delete")(on_role_delete))
+    bot.add_listener(Listener.create("on_guild_left")(on_guild_left))
+    return resolver
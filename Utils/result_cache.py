@@ -0,0 +1,37 @@
+import json
+import time
+
+# Dashboard reads are cached per guild against a generation number that every infraction or
+# promotion write bumps, so a poll only reaches Mongo after something in the guild changed.
+
+
+def generation_key(guild_id) -> str:
+    return f"generation_{guild_id}"
+
+
+def result_key(guild_id, endpoint: str, params: dict, generation: int) -> str:
+    return f"result_{guild_id}_{endpoint}:{json.dumps(params, sort_keys=True, default=str)}@{generation}"
+
+
+async def current_generation(cache, guild_id) -> int:
+    generation = await cache.get(generation_key(guild_id))
+    if generation is None:
+        # Seeded from the clock, not 0, so a counter lost to eviction or a restart can't
+        # come back at a value that older cached results were stored under.
+        generation = time.time_ns()
+        await cache.set(generation_key(guild_id), generation)
+    return generation
+
+
+async def bump_generation(cache, guild_id):
+    await cache.set(generation_key(guild_id), await current_generation(cache, guild_id) + 1)
+
+
+async def cached_result(cache, guild_id, endpoint: str, params: dict, compute):
+    """compute()'s result for this guild's current generation, computing it at most once per generation."""
+    key = result_key(guild_id, endpoint, params, await current_generation(cache, guild_id))
+    result = await cache.get(key)
+    if result is None:
+        result = await compute()
+        await cache.set(key, result)
+    return result
@@ -0,0 +1,112 @@
+import asyncio
+import os
+import time
+
+from interactions import AutoShardedClient, Client
+
+
+def parse_shard_ids(value: str, total: int):
+    value = (value or "").strip()
+    if not value:
+        return list(range(total))
+    ids = set()
+    for part in value.split(","):
+        start, _, end = part.strip().partition("-")
+        ids.update(range(int(start), int(end or start) + 1))
+    if not ids or min(ids) < 0 or max(ids) >= total:
+        raise ValueError(f"SHARD_IDS {value!r} must lie within 0-{total - 1}")
+    return sorted(ids)
+
+
+def shard_settings():
+    total = os.getenv("SHARD_COUNT")
+    if not total:
+        return None
+    total = int(total)
+    return total, parse_shard_ids(os.getenv("SHARD_IDS", ""), total)
+
+
+def shard_label():
+    """Short tag for per-process files and sockets, e.g. "0-3"; None when running unsharded."""
+    value = os.getenv("SHARD_IDS", "").strip()
+    if not os.getenv("SHARD_COUNT") or not value:
+        return None
+    return value.replace(",", "_")
+
+
+def create_client(**kwargs):
+    settings = shard_settings()
+    if settings is None:
+        return Client(**kwargs)
+    total, shard_ids = settings
+    return AutoShardedClient(total_shards=total, shard_ids=shard_ids, **kwargs)
+
+
+def is_sharded(bot):
+    return isinstance(bot, AutoShardedClient)
+
+
+def shard_of(guild_id, total: int):
+    return (int(guild_id) >> 22) % total
+
+
+def owned_shards(bot):
+    total = getattr(bot, "total_shards", 1) or 1
+    return list(getattr(bot, "shard_ids", None) or range(total))
+
+
+def owns_guild(bot, guild_id):
+    total = getattr(bot, "total_shards", 1) or 1
+    if total == 1:
+        return True
+    return shard_of(guild_id, total) in owned_shards(bot)
+
+
+def is_primary(bot):
+    # Exactly one process does cluster-wide chores such as command sync.
+    return 0 in owned_shards(bot)
+
+
+def _shard_guild_counts(bot):
+    counts = {shard_id: 0 for shard_id in owned_shards(bot)}
+    total = getattr(bot, "total_shards", 1) or 1
+    for guild in bot.guilds:
+        shard_id = shard_of(guild.id, total)
+        if shard_id in counts:
+            counts[shard_id] += 1
+    return counts
+
+
+async def publish_shard_state(bot):
+    now = time.time()
+    latencies = getattr(bot, "latencies", {}) or {}
+    await asyncio.gather(*(
+        bot.db.bot_meta.update_one(
+            {"_id": f"shard_{bot.app.id}_{shard_id}"},
+            {"$set": {
+                "kind": "shard",
+                "app_id": str(bot.app.id),
+                "shard_id": shard_id,
+                "total_shards": bot.total_shards,
+                "guild_count": count,
+                "latency_s": latencies.get(shard_id),
+                "updated_at": now,
+            }},
+            upsert=True,
+        )
+        for shard_id, count in _shard_guild_counts(bot).items()
+    ))
+
+
+async def total_guild_count(bot):
+    if not is_sharded(bot):
+        return len(bot.guilds)
+
+    local = _shard_guild_counts(bot)
+    await publish_shard_state(bot)
+    # Shards that stopped reporting (process down) drop out instead of being counted forever.
+    fresh_after = time.time() - float(os.getenv("SHARD_STATE_TTL", "900"))
+    query = {"kind": "shard", "app_id": str(bot.app.id), "total_shards": bot.total_shards, "updated_at": {"$gte": fresh_after}}
+    counts = {doc["shard_id"]: doc["guild_count"] async for doc in bot.db.bot_meta.find(query)}
+    counts.update(local)
+    return sum(counts.values())
@@ -0,0 +1,49 @@
+import time
+
+
+class StartupTimeline:
+
+    def __init__(self, origin: float = None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases = {}
+
+    def start(self, name: str):
+        self.phases[name] = {"start": time.perf_counter() - self.origin, "end": None}
+
+    def end(self, name: str):
+        phase = self.phases.setdefault(name, {"start": 0.0, "end": None})
+        phase["end"] = time.perf_counter() - self.origin
+
+    async def run(self, name: str, coro):
+        self.start(name)
+        try:
+            return await coro
+        finally:
+            self.end(name)
+
+    def report(self):
+        phases = [
+            {
+                "name": name,
+                "start_s": round(p["start"], 3),
+                "duration_s": round(p["end"] - p["start"], 3) if p["end"] is not None else None,
+            }
+            for name, p in sorted(self.phases.items(), key=lambda item: item[1]["start"])
+        ]
+        ends = [p["end"] for p in self.phases.values() if p["end"] is not None]
+        return {"total_s": round(max(ends), 3) if ends else None, "phases": phases}
+
+    def format_report(self):
+        report = self.report()
+        lines = []
+        for p in report["phases"]:
+            duration = "pending" if p["duration_s"] is None else f"{p['duration_s']:.3f}s"
+            lines.append(f"{p['name']}: +{p['start_s']:.3f}s ({duration})")
+        return f"Startup took {report['total_s']}s | " + " | ".join(lines)
+
+
+async def timed(bot, name: str, coro):
+    timeline = getattr(bot, "startup_timeline", None)
+    if timeline is None:
+        return await coro
+    return await timeline.run(name, coro)
@@ -0,0 +1,217 @@
+"""Two-tier cache: the in-process BoundedCache (L1) in front of Redis (L2).
+
+Enabled by REDIS_URL (e.g. redis://localhost:6379/0). Every write and delete is appended to the
+stream REDIS_CACHE_PREFIX + "invalidate" (capped at REDIS_INVALIDATION_BACKLOG entries, default
+10000); every other process drops those keys from its L1, so its next read comes from Redis.
+A process that loses its Redis connection resumes the stream where it stopped, so only the keys
+invalidated meanwhile are dropped; its whole L1 is cleared only if the backlog was trimmed past
+that point. Values are stored as BSON, the encoding the Mongo docs arrived in; models
+go in as their tagged doc (Utils.models.dump) and are parsed again on the way out.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+import bson
+from bson.errors import InvalidDocument
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from Utils.mem_cache import BoundedCache
+from Utils.models import dump, load
+
+log = logging.getLogger("Logger")
+
+
+def _stream_id(entry_id: bytes) -> tuple:
+    return tuple(int(part) for part in entry_id.split(b"-"))
+
+
+def encode(value) -> bytes:
+    return bson.encode({"v": dump(value)})
+
+
+def decode(raw: bytes):
+    return load(bson.decode(raw)["v"])
+
+
+class TieredCache:
+
+    def __init__(self, url: str, l1: BoundedCache = None, prefix: str = None):
+        self.l1 = l1 or BoundedCache()
+        self.redis = redis.from_url(url)
+        self.prefix = prefix or os.getenv("REDIS_CACHE_PREFIX", "chirp:cache:")
+        self.stream = f"{self.prefix}invalidate"
+        self.backlog = int(os.getenv("REDIS_INVALIDATION_BACKLOG", "10000"))
+        self.origin = uuid.uuid4().hex
+        self.listener = None
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+        self.invalidation_gaps = 0
+
+    def _redis_key(self, key, namespace):
+        return f"{self.prefix}{namespace or ''}{key}"
+
+    def _ttl(self, key, ttl):
+        return self.l1.ttl_for(key) if ttl is None else ttl
+
+    def _ensure_listener(self):
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        last_id = None
+        while True:
+            try:
+                if last_id is None:
+                    last_id = await self._stream_tail()
+                else:
+                    last_id = await self._resume(last_id)
+                while True:
+                    for _, entries in await self.redis.xread({self.stream: last_id}, count=500, block=5000):
+                        for entry_id, fields in entries:
+                            self._apply_invalidation(fields[b"m"])
+                            last_id = entry_id
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.l2_errors += 1
+                log.warning("Cache invalidation listener lost its Redis connection; retrying.", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _stream_tail(self):
+        # Entry ids are Redis server milliseconds, so "now" is a valid position even on an empty stream.
+        seconds, microseconds = await self.redis.time()
+        return f"{seconds * 1000 + microseconds // 1000 - 1}-0".encode()
+
+    async def _resume(self, last_id):
+        # Entries after last_id are replayed by the next read, unless the backlog cap already dropped some;
+        # trimming only happens once the stream is at the cap.
+        oldest = await self.redis.xrange(self.stream, count=1)
+        trimmed = oldest and await self.redis.xlen(self.stream) >= self.backlog
+        if trimmed and _stream_id(oldest[0][0]) > _stream_id(last_id):
+            self.invalidation_gaps += 1
+            log.warning("Missed more cache invalidations than the backlog holds; clearing the local cache.")
+            await self.l1.clear()
+            return await self._stream_tail()
+        return last_id
+
+    def _apply_invalidation(self, data):
+        message = json.loads(data)
+        if message["o"] == self.origin:
+            return
+        for key in message["k"]:
+            self.l1.discard(key, message["n"])
+        self.invalidations_received += 1
+
+    async def _publish(self, keys, namespace):
+        message = json.dumps({"o": self.origin, "n": namespace, "k": keys})
+        await self.redis.xadd(self.stream, {"m": message}, maxlen=self.backlog, approximate=True)
+        self.invalidations_sent += 1
+
+    async def get(self, key, default=None, namespace=None):
+        self._ensure_listener()
+        value = await self.l1.get(key, None, namespace)
+        if value is not None:
+            return value
+        try:
+            raw = await self.redis.get(self._redis_key(key, namespace))
+        except RedisError:
+            self.l2_errors += 1
+            return default
+        if raw is None:
+            self.l2_misses += 1
+            return default
+        self.l2_hits += 1
+        value = decode(raw)
+        await self.l1.set(key, value, namespace=namespace)
+        return value
+
+    async def set(self, key, value, ttl=None, namespace=None):
+        self._ensure_listener()
+        await self.l1.set(key, value, ttl, namespace)
+        ttl = self._ttl(key, ttl)
+        try:
+            await self.redis.set(self._redis_key(key, namespace), encode(value), px=int(ttl * 1000) if ttl else None)
+            await self._publish([key], namespace)
+        except (RedisError, InvalidDocument):
+            self.l2_errors += 1
+        return True
+
+    async def delete(self, key, namespace=None):
+        self._ensure_listener()
+        deleted = await self.l1.delete(key, namespace)
+        try:
+            deleted = max(deleted, await self.redis.delete(self._redis_key(key, namespace)))
+            await self._publish([key], namespace)
+        except RedisError:
+            self.l2_errors += 1
+        return deleted
+
+    async def exists(self, key, namespace=None):
+        return await self.get(key, None, namespace) is not None
+
+    async def multi_get(self, keys, namespace=None):
+        self._ensure_listener()
+        values = await self.l1.multi_get(keys, namespace)
+        missing = [i for i, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+        try:
+            raws = await self.redis.mget([self._redis_key(keys[i], namespace) for i in missing])
+        except RedisError:
+            self.l2_errors += 1
+            return values
+        for i, raw in zip(missing, raws):
+            if raw is None:
+                self.l2_misses += 1
+                continue
+            self.l2_hits += 1
+            values[i] = decode(raw)
+            await self.l1.set(keys[i], values[i], namespace=namespace)
+        return values
+
+    async def multi_set(self, pairs, ttl=None, namespace=None):
+        self._ensure_listener()
+        pairs = list(pairs)
+        await self.l1.multi_set(pairs, ttl, namespace)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in pairs:
+                    key_ttl = self._ttl(key, ttl)
+                    pipe.set(self._redis_key(key, namespace), encode(value), px=int(key_ttl * 1000) if key_ttl else None)
+                await pipe.execute()
+            await self._publish([key for key, _ in pairs], namespace)
+        except (RedisError, InvalidDocument):
+            self.l2_errors += 1
+        return True
+
+    async def clear(self, namespace=None):
+        return await self.l1.clear(namespace)
+
+    def stats(self) -> dict:
+        stats = self.l1.stats()
+        stats["l2"] = {
+            "hits": self.l2_hits,
+            "misses": self.l2_misses,
+            "errors": self.l2_errors,
+            "invalidations_sent": self.invalidations_sent,
+            "invalidations_received": self.invalidations_received,
+            "invalidation_gaps": self.invalidation_gaps,
+            "subscribed": self.listener is not None and not self.listener.done(),
+        }
+        return stats
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.cancel()
+
+
+def create_cache():
+    url = os.getenv("REDIS_URL")
+    return TieredCache(url) if url else BoundedCache()
@@ -4,6 +4,8 @@ import os
 
 import uvicorn
 
+from Utils.event_loop import resolve_loop_name
+
 logger = logging.getLogger("uvicon")
 
 
@@ -14,15 +16,25 @@ def create_uvicorn_config():
         app="api.bot_api:app",
         host=host,
         port=port,
-        loop="asyncio",
+        loop=resolve_loop_name(),
         lifespan="on",
     )
 
 
-async def start_uvicorn():
+async def start_uvicorn(timeline=None):
     config = create_uvicorn_config()
     server = uvicorn.Server(config)
 
+    if timeline is not None:
+        timeline.start("uvicorn_bind")
+        startup = server.startup
+
+        async def timed_startup(sockets=None):
+            await startup(sockets=sockets)
+            timeline.end("uvicorn_bind")
+
+        server.startup = timed_startup
+
     logger.info("Starting Uvicorn server on %s:%s", config.host, config.port)
     try:
         await server.serve()
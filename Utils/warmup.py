@@ -0,0 +1,20 @@
+import asyncio
+import os
+
+
+async def prefetch_guild_configs(bot):
+    guild_ids = [str(guild.id) for guild in bot.guilds]
+    batch_size = int(os.getenv("CONFIG_PREFETCH_BATCH_SIZE", "1000"))
+    found = 0
+    for i in range(0, len(guild_ids), batch_size):
+        batch = guild_ids[i:i + batch_size]
+        docs = {doc["guild_id"]: doc async for doc in bot.db.config.find({"guild_id": {"$in": batch}})}
+        found += len(docs)
+        await bot.guild_config.prime({guild_id: docs.get(guild_id) or {} for guild_id in batch})
+    bot.logger.info(f"Prefetched configs for {len(guild_ids)} guilds ({found} configured).")
+
+
+async def warm_connection_pool(bot):
+    # Each concurrent ping checks out its own socket, so the pool is filled before traffic arrives.
+    size = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+    await asyncio.gather(*(bot.db_client.admin.command("ping") for _ in range(size)))
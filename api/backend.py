@@ -0,0 +1,349 @@
+import asyncio
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from Utils.member_cache import cache_stats
+from Utils.log_pipeline import log_stats
+from Utils.models import load
+from Utils.sharding import owned_shards, shard_of
+from .ipc import IPCClient, IPCError, ipc_paths
+
+
+def _guild_icon_url(guild):
+    icon = getattr(guild, "icon", None)
+    if not icon:
+        return None
+    return f"https://cdn.discordapp.com/icons/{guild.id}/{getattr(icon, 'hash', icon)}.png?size=96"
+
+
+def _guild_payload(guild) -> Dict[str, Any]:
+    return {
+        "id": str(guild.id),
+        "name": getattr(guild, "name", "Unknown server"),
+        "icon": _guild_icon_url(guild),
+        "member_count": getattr(guild, "member_count", None),
+    }
+
+
+class LocalBackend:
+    """Serves bot data straight from the in-process client."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @property
+    def db(self):
+        return self.bot.db
+
+    @property
+    def cache(self):
+        return self.bot.mem_cache
+
+    def cache_for(self, guild_id: int):
+        return self.bot.mem_cache
+
+    async def shards(self) -> Dict[str, Any]:
+        return {"total": getattr(self.bot, "total_shards", 1) or 1, "ids": owned_shards(self.bot)}
+
+    async def guilds(self) -> List[Dict[str, Any]]:
+        return [_guild_payload(guild) for guild in getattr(self.bot, "guilds", []) or []]
+
+    async def guild(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        guild = self.bot.get_guild(int(guild_id))
+        return _guild_payload(guild) if guild else None
+
+    async def member_names(self, guild_id: int, user_ids: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        return await self.bot.member_names.resolve(guild_id, user_ids)
+
+    async def config_updated(self, guild_id: int, doc: dict):
+        await self.bot.guild_config.put(guild_id, doc)
+
+    async def startup(self) -> Optional[Dict[str, Any]]:
+        timeline = getattr(self.bot, "startup_timeline", None)
+        return timeline.report() if timeline is not None else None
+
+    async def health(self) -> Dict[str, Any]:
+        bot = self.bot
+        try:
+            guild_count = len(getattr(bot, "guilds", []) or [])
+        except Exception:
+            guild_count = None
+        try:
+            latency_s = getattr(bot, "latency", None)
+            if latency_s is not None and not math.isfinite(latency_s):
+                latency_s = None
+        except Exception:
+            latency_s = None
+        bot_user = getattr(bot, "user", None)
+        bot_info = None
+        if bot_user is not None:
+            try:
+                bot_info = {
+                    "id": str(getattr(bot_user, "id", "")),
+                    "username": getattr(bot_user, "name", None) or getattr(bot_user, "username", None) or "bot",
+                }
+            except Exception:
+                bot_info = None
+        try:
+            is_ready = getattr(bot, "is_ready", False)
+            ready = bool(is_ready() if callable(is_ready) else is_ready)
+        except Exception:
+            ready = None
+        try:
+            shard_count = getattr(bot, "total_shards", None) or getattr(bot, "shard_count", None)
+            shard_ids = owned_shards(bot)
+        except Exception:
+            shard_count = None
+            shard_ids = None
+        try:
+            users_cached = len(bot.cache.user_cache)
+        except Exception:
+            users_cached = None
+        # Count commands from both prefix (commands.Bot) and application (app_commands.CommandTree)
+        commands_prefix = None
+        commands_application = None
+        try:
+            prefix = getattr(bot, "commands", None)
+            if prefix is not None:
+                try:
+                    commands_prefix = len(list(prefix))
+                except TypeError:
+                    commands_prefix = len(prefix)
+        except Exception:
+            commands_prefix = None
+        try:
+            tree = getattr(bot, "tree", None)
+            if tree is not None:
+                get_commands = getattr(tree, "get_commands", None)
+                if callable(get_commands):
+                    commands_application = len(get_commands())
+        except Exception:
+            commands_application = None
+        try:
+            counts = [c for c in (commands_prefix, commands_application) if isinstance(c, int)]
+            commands_total = sum(counts) if counts else None
+        except Exception:
+            commands_total = None
+        try:
+            import resource  # type: ignore
+            ru = resource.getrusage(resource.RUSAGE_SELF)
+            mem_kb = getattr(ru, "ru_maxrss", 0)
+            memory_mb = round((mem_kb / 1024.0), 1) if mem_kb else None
+        except Exception:
+            memory_mb = None
+        try:
+            member_cache = cache_stats(bot)
+        except Exception:
+            member_cache = None
+        try:
+            logging_stats = log_stats()
+        except Exception:
+            logging_stats = None
+        guild_config = getattr(bot, "guild_config", None)
+        loader = getattr(bot, "loader", None)
+        permissions = getattr(bot, "permissions", None)
+        resolver = getattr(bot, "resolver", None)
+        dms = getattr(bot, "dms", None)
+        member_names = getattr(bot, "member_names", None)
+        try:
+            mem_cache = bot.mem_cache.stats()
+        except Exception:
+            mem_cache = None
+        return {
+            "guild_count": guild_count,
+            "latency_s": latency_s,
+            "ready": ready,
+            "shard_count": shard_count,
+            "shard_ids": shard_ids,
+            "users_cached": users_cached,
+            "commands_prefix": commands_prefix,
+            "commands_application": commands_application,
+            "commands_total": commands_total,
+            "memory_mb": memory_mb,
+            "member_cache": member_cache,
+            "logging": logging_stats,
+            "guild_config": guild_config.stats() if guild_config is not None else None,
+            "mem_cache": mem_cache,
+            "loader": loader.stats() if loader is not None else None,
+            "permissions": permissions.stats() if permissions is not None else None,
+            "resolver": resolver.stats() if resolver is not None else None,
+            "dms": dms.stats() if dms is not None else None,
+            "member_names": member_names.stats() if member_names is not None else None,
+            "services": {
+                "db": getattr(bot, "db", None) is not None,
+                "cache": getattr(bot, "mem_cache", None) is not None,
+            },
+            "bot": bot_info,
+        }
+
+
+class RemoteCache:
+    """aiocache-like facade whose reads and writes land in the bot process' cache."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key, default=None):
+        value = await self.client.call("cache_get", key=key)
+        return default if value is None else load(value)
+
+    async def set(self, key, value, ttl=None):
+        return await self.client.call("cache_set", key=key, value=value, ttl=ttl)
+
+    async def delete(self, key):
+        return await self.client.call("cache_delete", key=key)
+
+
+class IPCBackend:
+    """Serves bot data over the bot's Unix-socket RPC while talking to Mongo directly."""
+
+    def __init__(self, client, db):
+        self.client = client
+        self.db = db
+        self.cache = RemoteCache(client)
+
+    def cache_for(self, guild_id: int):
+        return self.cache
+
+    async def shards(self):
+        return await self.client.call("shards")
+
+    async def guilds(self):
+        return await self.client.call("guilds")
+
+    async def guild(self, guild_id: int):
+        return await self.client.call("guild", guild_id=str(guild_id))
+
+    async def member_names(self, guild_id: int, user_ids: Iterable[str]):
+        return await self.client.call("member_names", guild_id=str(guild_id), user_ids=[str(u) for u in user_ids])
+
+    async def config_updated(self, guild_id: int, doc: dict):
+        return await self.client.call("config_updated", guild_id=str(guild_id), doc=doc)
+
+    async def startup(self):
+        return await self.client.call("startup")
+
+    async def health(self):
+        return await self.client.call("health")
+
+
+class RoutedCache:
+    """Guild-scoped cache facade that lands on the shard process owning the guild."""
+
+    def __init__(self, backend, guild_id: int):
+        self.backend = backend
+        self.guild_id = guild_id
+
+    async def get(self, key, default=None):
+        return await (await self.backend._route(self.guild_id)).cache.get(key, default)
+
+    async def set(self, key, value, ttl=None):
+        return await (await self.backend._route(self.guild_id)).cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key):
+        return await (await self.backend._route(self.guild_id)).cache.delete(key)
+
+
+SUMMED_HEALTH_FIELDS = ("guild_count", "users_cached", "memory_mb")
+PER_SHARD_HEALTH_FIELDS = (
+    "shard_ids", "ready", "latency_s", "guild_count", "member_cache", "logging", "guild_config",
+    "mem_cache", "loader", "permissions", "resolver", "dms", "member_names",
+)
+
+
+class ShardedBackend:
+    """Fans out to one IPCBackend per shard process and routes guild calls to the owning shard."""
+
+    def __init__(self, backends: List[IPCBackend], db):
+        self.backends = backends
+        self.db = db
+        self._total = None
+        self._owners = {}
+
+    async def _discover(self):
+        layouts = await asyncio.gather(*(b.shards() for b in self.backends), return_exceptions=True)
+        for backend, layout in zip(self.backends, layouts):
+            if isinstance(layout, Exception):
+                continue
+            self._total = layout["total"]
+            for shard_id in layout["ids"]:
+                self._owners[shard_id] = backend
+
+    async def _route(self, guild_id: int) -> IPCBackend:
+        if self._total is None:
+            await self._discover()
+        backend = self._owners.get(shard_of(guild_id, self._total)) if self._total else None
+        if backend is None:
+            # Layout unknown or the owning process has not answered yet; try again on the next call.
+            self._total = None
+            return self.backends[0]
+        return backend
+
+    def cache_for(self, guild_id: int):
+        return RoutedCache(self, guild_id)
+
+    async def _each(self, method: str):
+        results = await asyncio.gather(*(getattr(b, method)() for b in self.backends), return_exceptions=True)
+        return [r for r in results if not isinstance(r, Exception)], len(results)
+
+    async def guilds(self):
+        results, _ = await self._each("guilds")
+        if not results:
+            raise IPCError("no shard process reachable")
+        return [guild for shard_guilds in results for guild in shard_guilds]
+
+    async def guild(self, guild_id: int):
+        return await (await self._route(guild_id)).guild(guild_id)
+
+    async def member_names(self, guild_id: int, user_ids: Iterable[str]):
+        return await (await self._route(guild_id)).member_names(guild_id, user_ids)
+
+    async def config_updated(self, guild_id: int, doc: dict):
+        return await (await self._route(guild_id)).config_updated(guild_id, doc)
+
+    async def startup(self):
+        results, _ = await self._each("startup")
+        reports = [r for r in results if r]
+        if not reports:
+            return None
+        totals = [r["total_s"] for r in reports if r.get("total_s") is not None]
+        return {"total_s": max(totals) if totals else None, "phases": [], "processes": reports}
+
+    async def health(self):
+        results, total = await self._each("health")
+        if not results:
+            raise IPCError("no shard process reachable")
+        latencies = [r["latency_s"] for r in results if r.get("latency_s") is not None]
+        merged = {
+            field: sum(r[field] for r in results if r.get(field) is not None)
+            for field in SUMMED_HEALTH_FIELDS
+        }
+        merged.update({
+            "latency_s": sum(latencies) / len(latencies) if latencies else None,
+            "ready": len(results) == total and all(r.get("ready") for r in results),
+            "shard_count": results[0].get("shard_count"),
+            "shard_ids": sorted(s for r in results for s in (r.get("shard_ids") or [])),
+            "processes_up": len(results),
+            "processes_total": total,
+            "services": results[0].get("services"),
+            "bot": results[0].get("bot"),
+            "shards": [
+                {k: r.get(k) for k in PER_SHARD_HEALTH_FIELDS}
+                for r in results
+            ],
+        })
+        return merged
+
+
+def create_backend(bot):
+    if bot is not None:
+        return LocalBackend(bot)
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    db = AsyncIOMotorClient(os.environ.get("MONGODB_URI"))["Chirp"]
+    backends = [IPCBackend(IPCClient(path), db) for path in ipc_paths()]
+    if len(backends) == 1:
+        return backends[0]
+    return ShardedBackend(backends, db)
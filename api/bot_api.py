@@ -1,3 +1,4 @@
+import asyncio
 import os
 import hmac
 import hashlib
@@ -7,13 +8,42 @@ from typing import Optional, List, Any, Dict
 from datetime import datetime, timedelta
 from fastapi import FastAPI, Request, Header, HTTPException, Depends, status
 from fastapi import Body
-from .context import bot
+from fastapi.responses import JSONResponse
+from pymongo import ReturnDocument
+from Utils.guild_config import config_key
+from Utils.mem_cache import infraction_key
+from Utils.models import GuildConfig, Infraction, Promotion
+from Utils.result_cache import bump_generation, cached_result
+from . import context
+from .backend import create_backend
+from .ipc import IPCError
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 API_TOKEN = os.getenv("apitkn") or os.getenv("APITKN") or os.getenv("API_TOKEN")
 app = FastAPI()
 START_TIME = int(time.time())
 log = logging.getLogger("bot_api")
+# In-process this wraps the live client; under API_MODE=split context.bot is unset and the bot is reached over IPC.
+# The multi-tenant runner fills context.bots instead and requests pick a bot with the X-Bot header.
+tenant_backends = {name: create_backend(tenant) for name, tenant in context.bots.items()}
+default_backend = None if tenant_backends else create_backend(context.bot)
+
+
+async def get_backend(x_bot: str = Header(None)):
+    if not tenant_backends:
+        return default_backend
+    if not x_bot:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="missing X-Bot header")
+    try:
+        return tenant_backends[x_bot]
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="unknown_bot")
+
+
+@app.exception_handler(IPCError)
+async def bot_unavailable(request: Request, exc: IPCError):
+    log.warning("Bot IPC call failed: %s", exc)
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"ok": False, "error": "bot_unavailable"})
 
 
 async def verify_hmac(request: Request, x_signature: str = Header(None), x_timestamp: str = Header(None)):
@@ -63,375 +93,121 @@ async def verify_request(
     raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="authentication not configured")
 
 
-def _guild_icon_url(guild):
-    icon_hash = getattr(guild, "icon", None)
-    if not icon_hash:
-        return None
-    return f"https://cdn.discordapp.com/icons/{guild.id}/{icon_hash}.png?size=96"
-
-
-def _ensure_bot_in_guild(guild_id: int):
-    for guild in getattr(bot, "guilds", []):
-        if str(getattr(guild, "id", "")) == str(guild_id):
-            return guild
+async def _ensure_bot_in_guild(backend, guild_id: int):
+    guild = await backend.guild(guild_id)
+    if guild:
+        return guild
     log.warning("Guild %s not found in bot cache", guild_id)
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="bot_not_in_guild")
 
 
-def _ts_from_doc(doc: dict) -> Optional[int]:
-    try:
-        v = doc.get("created_at") or doc.get("timestamp") or doc.get("ts")
-        if isinstance(v, (int, float)):
-            return int(v)
-        if isinstance(v, str):
-            try:
-                return int(datetime.fromisoformat(v.replace('Z', '+00:00')).timestamp())
-            except Exception:
-                return None
-    except Exception:
-        return None
-    return None
-
-
-def _member_info(member) -> Optional[Dict[str, str]]:
-    if not member:
-        return None
-    try:
-        user = getattr(member, "user", member)
-        display_name = (
-            getattr(member, "display_name", None)
-            or getattr(user, "global_name", None)
-            or getattr(user, "username", None)
-            or getattr(member, "name", None)
-        )
-        username = getattr(user, "username", None) or getattr(user, "name", None)
-        return {"display_name": str(display_name) if display_name else None, "username": str(username) if username else None}
-    except Exception:
-        return None
-
-
-def _resolve_member_info_from_id(guild, uid: Optional[str]) -> Optional[Dict[str, str]]:
-    if not guild or not uid:
-        return None
-    try:
-        gm = getattr(guild, "get_member", None)
-        m = gm(int(uid)) if callable(gm) else None
-        return _member_info(m) if m else None
-    except Exception:
-        return None
-
-
-def _map_infraction(doc: dict, guild=None) -> Dict[str, Any]:
-    _id = (
-        doc.get("infraction_id")
-        or doc.get("id")
-        or doc.get("short_id")
-        or doc.get("code")
-        or str(doc.get("_id"))
-    )
-    reason = doc.get("reason") or ""
-    by_id = doc.get("issued_by_id")
-    by_info = _resolve_member_info_from_id(guild, by_id)
-    by_name = (by_info and by_info.get("display_name"))
-    target_id = doc.get("member_id") or doc.get("user_id") or doc.get("target_id")
-    target_info = _resolve_member_info_from_id(guild, target_id)
-    target_name = target_info and target_info.get("display_name")
-    created_at = _ts_from_doc(doc)
-    return {
-        "id": str(_id) if _id is not None else None,
-        "reason": reason,
-        "by": by_name,
-        "by_id": by_id,
-        "by_username": (by_info and by_info.get("username")) or None,
-        "target_id": target_id,
-        "target": target_name,
-        "target_username": (target_info and target_info.get("username")) or None,
-        "created_at": created_at,
-    }
-
-
-def _map_promotion(doc: dict, guild=None) -> Dict[str, Any]:
-    _id = (
-        doc.get("promotion_id")
-        or doc.get("id")
-        or doc.get("short_id")
-        or doc.get("code")
-        or str(doc.get("_id"))
-    )
-    reason = doc.get("reason") or ""
-    by_id = doc.get("issued_by_id")
-    by_info = _resolve_member_info_from_id(guild, by_id)
-    by_name = (by_info and by_info.get("display_name"))
-    target_id = doc.get("member_id") or doc.get("user_id") or doc.get("target_id")
-    target_info = _resolve_member_info_from_id(guild, target_id)
-    target_name = target_info and target_info.get("display_name")
-    created_at = _ts_from_doc(doc)
-    return {
-        "id": str(_id) if _id is not None else None,
-        "reason": reason,
-        "by": by_name,
-        "by_id": by_id,
-        "by_username": (by_info and by_info.get("username")) or None,
-        "target_id": target_id,
-        "target": target_name,
-        "target_username": (target_info and target_info.get("username")) or None,
-        "created_at": created_at,
-    }
-
-
-def _sanitize_item(doc: dict, guild=None) -> Dict[str, Any]:
-    try:
-        preferred = (
-            doc.get("short_id")
-            or doc.get("code")
-            or doc.get("id")
-            or doc.get("infraction_id")
-            or doc.get("promotion_id")
-        )
-        _id = str(preferred or doc.get("_id"))
-    except Exception:
-        _id = None
-    reason = doc.get("reason") or doc.get("note") or doc.get("notes") or ""
-    by = (
-        doc.get("by")
-        or doc.get("actor")
-        or doc.get("moderator")
-        or doc.get("author")
-        or doc.get("executor")
-        or doc.get("staff")
-        or {}
-    )
-    by_name = None
-    by_id = None
-    by_username = None
-    if isinstance(by, dict):
-        by_name = (
-            by.get("username")
-            or by.get("global_name")
-            or by.get("name")
-            or by.get("tag")
-        )
-        by_id = by.get("id")
-    else:
-        if by:
-            by_name = str(by)
-    by_name = by_name or (
-        doc.get("by_username")
-        or doc.get("by_name")
-        or doc.get("moderator_tag")
-        or doc.get("moderator_name")
-        or doc.get("moderator_username")
-        or doc.get("staff_tag")
-        or doc.get("staff_name")
-        or doc.get("author_tag")
-        or doc.get("author_username")
-        or doc.get("executor_tag")
-        or doc.get("executor_username")
-        or doc.get("issued_by")
-    )
-    by_id = by_id or (
-        doc.get("by_id")
-        or doc.get("moderator_id")
-        or doc.get("staff_id")
-        or doc.get("author_id")
-        or doc.get("executor_id")
-        or doc.get("issued_by_id")
-    )
-    if guild is not None and by_id:
-        by_info = _resolve_member_info_from_id(guild, by_id)
-        if by_info:
-            by_name = by_info.get("display_name") or by_name
-            by_username = by_info.get("username")
-
-    target = doc.get("target") or {}
-    if isinstance(target, dict):
-        target_id = target.get("id") or target.get("user_id") or target.get("member_id")
-    else:
-        target_id = doc.get("target_id") or doc.get("user_id") or doc.get("member_id") or None
-    target_name = None
-    target_username = None
-    if guild is not None and target_id:
-        target_info = _resolve_member_info_from_id(guild, target_id)
-        if target_info:
-            target_name = target_info.get("display_name")
-            target_username = target_info.get("username")
-
-    created_at = _ts_from_doc(doc)
-    return {
-        "id": _id,
-        "reason": reason,
-        "by": by_name,
-        "by_id": by_id,
-        "by_username": by_username,
-        "target_id": target_id,
-        "target": target_name,
-        "target_username": target_username,
-        "created_at": created_at,
-    }
+async def _map_page(backend, guild_id: int, docs: List[dict], model) -> List[Dict[str, Any]]:
+    records = []
+    for doc in docs:
+        try:
+            records.append(model.from_doc(doc))
+        except Exception:
+            continue
+    # One name lookup per page instead of one per referenced member.
+    ids = sorted({str(uid) for record in records for uid in (record.issued_by_id, record.member_id) if uid})
+    names = (await backend.member_names(guild_id, ids) or {}) if ids else {}
+    return [record.to_api(names) for record in records]
 
 
 @app.get("/api/guilds")
-async def list_guilds(verified: bool = Depends(verify_request)):
-    payload = []
-    for guild in getattr(bot, "guilds", []):
-        try:
-            payload.append(
-                {
-                    "id": str(guild.id),
-                    "name": getattr(guild, "name", "Unknown server"),
-                    "icon": _guild_icon_url(guild),
-                    "member_count": getattr(guild, "member_count", None),
-                }
-            )
-        except Exception:  # pragma: no cover - defensive
-            log.exception("Failed to serialise guild %s", getattr(guild, "id", "unknown"))
-    return {"ok": True, "guilds": payload}
+async def list_guilds(verified: bool = Depends(verify_request), backend=Depends(get_backend)):
+    return {"ok": True, "guilds": await backend.guilds()}
 
 
 @app.get("/api/guilds/{guild_id}/config")
-async def get_guild_config(guild_id: int, verified: bool = Depends(verify_request)):
-    guild = _ensure_bot_in_guild(guild_id)
-    cache_key = f"config_{guild_id}"
-    config = await bot.mem_cache.get(cache_key)
-    if not config:
-        config = await bot.db.config.find_one({"guild_id": str(guild_id)}) or {}
-        if config:
-            await bot.mem_cache.set(cache_key, config)
-
-    if not config:
-        return {"ok": True, "guild_id": str(guild_id), "config": {}}
-
-    sanitized = {k: v for k, v in config.items() if k not in {"_id", "guild_id"}}
-    return {"ok": True, "guild_id": str(guild_id), "config": sanitized}
+async def get_guild_config(guild_id: int, verified: bool = Depends(verify_request), backend=Depends(get_backend)):
+    await _ensure_bot_in_guild(backend, guild_id)
+    config = await backend.cache_for(guild_id).get(config_key(guild_id))
+    if config is None:
+        doc = await backend.db.config.find_one({"guild_id": str(guild_id)}) or {}
+        await backend.config_updated(guild_id, doc)
+        config = GuildConfig.from_doc(doc)
+    return {"ok": True, "guild_id": str(guild_id), "config": config.settings}
 
 
 @app.post("/api/guilds/{guild_id}/config")
-async def update_guild_config(guild_id: int, payload: dict, verified: bool = Depends(verify_request)):
-    guild = _ensure_bot_in_guild(guild_id)
-    cache_key = f"config_{guild_id}"
+async def update_guild_config(guild_id: int, payload: dict, verified: bool = Depends(verify_request), backend=Depends(get_backend)):
+    await _ensure_bot_in_guild(backend, guild_id)
     try:
-        await bot.mem_cache.delete(cache_key)
-        await bot.db.config.update_one({"guild_id": str(guild_id)}, {"$set": payload}, upsert=True)
-        doc = await bot.db.config.find_one({"guild_id": str(guild_id)}) or {"guild_id": str(guild_id)}
-        await bot.mem_cache.set(cache_key, doc)
-        sanitized = {k: v for k, v in doc.items() if k not in {"_id", "guild_id"}}
-        return {"ok": True, "guild_id": str(guild_id), "config": sanitized}
+        doc = await backend.db.config.find_one_and_update(
+            {"guild_id": str(guild_id)}, {"$set": payload}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        # The bot's GuildConfigStore replaces its cached doc, so commands see the change immediately.
+        await backend.config_updated(guild_id, doc)
+        return {"ok": True, "guild_id": str(guild_id), "config": GuildConfig.from_doc(doc).settings}
     except Exception as e:
         log.exception("Failed to update configuration for guild %s", guild_id)
         return {"ok": False, "error": str(e)}
 
 
+async def _bot_health(backend):
+    try:
+        bot_health = await backend.health()
+        status_text = "ok" if bot_health.get("processes_up", 1) == bot_health.get("processes_total", 1) else "degraded"
+    except IPCError:
+        bot_health = {"ready": False}
+        status_text = "bot_unavailable"
+    return status_text, bot_health
+
+
 @app.get("/health")
-async def health():
+async def health(x_bot: str = Header(None)):
     now = int(time.time())
     uptime_s = now - START_TIME
-    try:
-        guild_count = len(getattr(bot, "guilds", []) or [])
-    except Exception:
-        guild_count = None
-    try:
-        latency_s = getattr(bot, "latency", None)
-    except Exception:
-        latency_s = None
-    bot_user = getattr(bot, "user", None)
-    bot_info = None
-    if bot_user is not None:
-        try:
-            bot_info = {
-                "id": str(getattr(bot_user, "id", "")),
-                "username": getattr(bot_user, "name", None) or getattr(bot_user, "username", None) or "bot",
-            }
-        except Exception:
-            bot_info = None
-    # Additional non-sensitive operational info
-    try:
-        ready = bool(getattr(bot, "is_ready", lambda: False)())
-    except Exception:
-        ready = None
-    try:
-        shard_count = getattr(bot, "shard_count", None)
-    except Exception:
-        shard_count = None
-    try:
-        users_cached = len(getattr(bot, "users", []) or [])
-    except Exception:
-        users_cached = None
-    # Count commands from both prefix (commands.Bot) and application (app_commands.CommandTree)
-    commands_prefix = None
-    commands_application = None
-    try:
-        prefix = getattr(bot, "commands", None)
-        if prefix is not None:
-            try:
-                commands_prefix = len(list(prefix))
-            except TypeError:
-                commands_prefix = len(prefix)
-    except Exception:
-        commands_prefix = None
-    try:
-        tree = getattr(bot, "tree", None)
-        if tree is not None:
-            get_commands = getattr(tree, "get_commands", None)
-            if callable(get_commands):
-                commands_application = len(get_commands())
-    except Exception:
-        commands_application = None
-    try:
-        counts = [c for c in (commands_prefix, commands_application) if isinstance(c, int)]
-        commands_total = sum(counts) if counts else None
-    except Exception:
-        commands_total = None
-    try:
-        import resource  # type: ignore
-        ru = resource.getrusage(resource.RUSAGE_SELF)
-        mem_kb = getattr(ru, "ru_maxrss", 0)
-        memory_mb = round((mem_kb / 1024.0), 1) if mem_kb else None
-    except Exception:
-        memory_mb = None
-    db_present = getattr(bot, "db", None) is not None
-    cache_present = getattr(bot, "mem_cache", None) is not None
-    services = {
-        "db": db_present,
-        "cache": cache_present,
-    }
+    if tenant_backends and not x_bot:
+        bots = {}
+        for name, tenant in tenant_backends.items():
+            tenant_status, tenant_health = await _bot_health(tenant)
+            bots[name] = {"status": tenant_status, **tenant_health}
+        status_text = "ok" if all(b["status"] == "ok" for b in bots.values()) else "degraded"
+        bot_health = {"bots": bots}
+    else:
+        status_text, bot_health = await _bot_health(await get_backend(x_bot))
     auth = "token" if API_TOKEN else ("hmac" if SECRET_KEY else "none")
     version = os.getenv("COMMIT_SHA")
     return {
-        "status": "ok",
+        "status": status_text,
         "now": now,
         "started_at": START_TIME,
         "uptime_s": uptime_s,
-        "guild_count": guild_count,
-        "latency_s": latency_s,
-        "ready": ready,
-        "shard_count": shard_count,
-        "users_cached": users_cached,
-        "commands_prefix": commands_prefix,
-        "commands_application": commands_application,
-        "commands_total": commands_total,
-        "memory_mb": memory_mb,
-        "services": services,
+        **bot_health,
         "auth": auth,
         "version": version,
-        "bot": bot_info,
     }
 
 
+@app.get("/api/startup")
+async def startup_report(verified: bool = Depends(verify_request), backend=Depends(get_backend)):
+    report = await backend.startup()
+    if report is None:
+        return {"ok": False, "error": "startup timeline unavailable"}
+    return {"ok": True, "startup": report}
+
+
 @app.get("/api/guilds/{guild_id}/stats")
-async def guild_stats(guild_id: int, verified: bool = Depends(verify_request)):
-    _ensure_bot_in_guild(guild_id)
+async def guild_stats(guild_id: int, verified: bool = Depends(verify_request), backend=Depends(get_backend)):
+    await _ensure_bot_in_guild(backend, guild_id)
     guild_id_str = str(guild_id)
-    inf_total = 0
-    prom_total = 0
-    try:
-        inf_total = await bot.db.infractions.count_documents({"guild_id": guild_id_str})
-    except Exception:
-        inf_total = 0
+
+    async def compute():
+        inf_total, prom_total = await asyncio.gather(
+            _count(backend.db.infractions, guild_id_str), _count(backend.db.promotions, guild_id_str)
+        )
+        return {"ok": True, "guild_id": guild_id_str, "infractions_total": inf_total, "promotions_total": prom_total}
+
+    return await cached_result(backend.cache_for(guild_id), guild_id, "stats", {}, compute)
+
+
+async def _count(collection, guild_id_str: str) -> int:
     try:
-        prom_total = await bot.db.promotions.count_documents({"guild_id": guild_id_str})
+        return await collection.count_documents({"guild_id": guild_id_str})
     except Exception:
-        prom_total = 0
-    return {"ok": True, "guild_id": guild_id_str, "infractions_total": inf_total, "promotions_total": prom_total}
+        return 0
 
 
 try:
@@ -447,8 +223,9 @@ async def guild_infractions(
     id: Optional[str] = None,
     q: Optional[str] = None,
     verified: bool = Depends(verify_request),
+    backend=Depends(get_backend),
 ):
-    guild = _ensure_bot_in_guild(guild_id)
+    await _ensure_bot_in_guild(backend, guild_id)
     guild_id_str = str(guild_id)
     query: Dict[str, Any] = {"guild_id": guild_id_str}
     needle = (q or id)
@@ -465,39 +242,27 @@ async def guild_infractions(
             except Exception:
                 pass
         query = {"$and": [{"guild_id": guild_id_str}, {"$or": ors}]}
-    items: List[Dict[str, Any]] = []
-    total = 0
-    try:
-        total = await bot.db.infractions.count_documents({"guild_id": guild_id_str})
-    except Exception:
-        total = 0
-    try:
-        cursor = bot.db.infractions.find(query).sort([("_id", -1)]).limit(max(1, int(limit)))
-    except Exception:
-        cursor = None
-    if cursor is not None:
-        async for doc in cursor:
-            try:
-                items.append(_map_infraction(doc, guild=guild))
-            except Exception:
-                try:
-                    items.append(_sanitize_item(doc, guild=guild))
-                except Exception:
-                    continue
-    if not items and total:
+
+    async def compute():
+        items: List[Dict[str, Any]] = []
+        total = await _count(backend.db.infractions, guild_id_str)
         try:
-            cursor2 = bot.db.infractions.find({"guild_id": guild_id_str}).sort([("timestamp", -1)]).limit(max(1, int(limit)))
-            async for doc in cursor2:
-                try:
-                    items.append(_map_infraction(doc, guild=guild))
-                except Exception:
-                    try:
-                        items.append(_sanitize_item(doc, guild=guild))
-                    except Exception:
-                        continue
+            cursor = backend.db.infractions.find(query).sort([("_id", -1)]).limit(max(1, int(limit)))
         except Exception:
-            pass
-    return {"ok": True, "guild_id": guild_id_str, "total": total, "items": items}
+            cursor = None
+        if cursor is not None:
+            items = await _map_page(backend, guild_id, await cursor.to_list(length=None), Infraction)
+        if not items and total:
+            try:
+                cursor2 = backend.db.infractions.find({"guild_id": guild_id_str}).sort([("timestamp", -1)]).limit(max(1, int(limit)))
+                items = await _map_page(backend, guild_id, await cursor2.to_list(length=None), Infraction)
+            except IPCError:
+                raise
+            except Exception:
+                pass
+        return {"ok": True, "guild_id": guild_id_str, "total": total, "items": items}
+
+    return await cached_result(backend.cache_for(guild_id), guild_id, "infractions", {"limit": limit, "q": needle}, compute)
 
 
 @app.get("/api/guilds/{guild_id}/promotions")
@@ -507,8 +272,9 @@ async def guild_promotions(
     id: Optional[str] = None,
     q: Optional[str] = None,
     verified: bool = Depends(verify_request),
+    backend=Depends(get_backend),
 ):
-    guild = _ensure_bot_in_guild(guild_id)
+    await _ensure_bot_in_guild(backend, guild_id)
     guild_id_str = str(guild_id)
     query: Dict[str, Any] = {"guild_id": guild_id_str}
     needle = (q or id)
@@ -525,26 +291,19 @@ async def guild_promotions(
             except Exception:
                 pass
         query = {"$and": [{"guild_id": guild_id_str}, {"$or": ors}]}
-    items: List[Dict[str, Any]] = []
-    total = 0
-    try:
-        total = await bot.db.promotions.count_documents({"guild_id": guild_id_str})
-    except Exception:
-        total = 0
-    try:
-        cursor = bot.db.promotions.find(query).sort([("_id", -1)]).limit(max(1, int(limit)))
-    except Exception:
-        cursor = None
-    if cursor is not None:
-        async for doc in cursor:
-            try:
-                items.append(_map_promotion(doc, guild=guild))
-            except Exception:
-                try:
-                    items.append(_sanitize_item(doc, guild=guild))
-                except Exception:
-                    continue
-    return {"ok": True, "guild_id": guild_id_str, "total": total, "items": items}
+
+    async def compute():
+        items: List[Dict[str, Any]] = []
+        total = await _count(backend.db.promotions, guild_id_str)
+        try:
+            cursor = backend.db.promotions.find(query).sort([("_id", -1)]).limit(max(1, int(limit)))
+        except Exception:
+            cursor = None
+        if cursor is not None:
+            items = await _map_page(backend, guild_id, await cursor.to_list(length=None), Promotion)
+        return {"ok": True, "guild_id": guild_id_str, "total": total, "items": items}
+
+    return await cached_result(backend.cache_for(guild_id), guild_id, "promotions", {"limit": limit, "q": needle}, compute)
 
 
 @app.post("/api/guilds/{guild_id}/infractions/{infraction_id}")
@@ -553,17 +312,19 @@ async def edit_infraction(
     infraction_id: str,
     payload: Dict[str, Any] = Body(...),
     verified: bool = Depends(verify_request),
+    backend=Depends(get_backend),
 ):
-    _ensure_bot_in_guild(guild_id)
+    await _ensure_bot_in_guild(backend, guild_id)
     guild_id_str = str(guild_id)
     reason = (payload.get("reason") or "").strip()
     try:
-        await bot.db.infractions.update_one(
+        await backend.db.infractions.update_one(
             {"guild_id": guild_id_str, "infraction_id": infraction_id},
             {"$set": {"reason": reason}},
         )
         try:
-            await bot.mem_cache.delete(f"infraction_{infraction_id}")
+            await backend.cache_for(guild_id).delete(infraction_key(guild_id, infraction_id))
+            await bump_generation(backend.cache_for(guild_id), guild_id)
         except Exception:
             pass
         return {"ok": True}
@@ -576,8 +337,9 @@ async def guild_infractions_series(
     guild_id: int,
     days: int = 30,
     verified: bool = Depends(verify_request),
+    backend=Depends(get_backend),
 ):
-    _ensure_bot_in_guild(guild_id)
+    await _ensure_bot_in_guild(backend, guild_id)
     guild_id_str = str(guild_id)
     try:
         d = max(1, min(int(days), 180))
@@ -585,6 +347,14 @@ async def guild_infractions_series(
         d = 30
     now = datetime.utcnow()
     since = now - timedelta(days=d - 1)
+    # Keyed by day too, so a cached series never outlives the date it was built for.
+    return await cached_result(
+        backend.cache_for(guild_id), guild_id, "series", {"days": d, "date": now.strftime("%Y-%m-%d")},
+        lambda: _infractions_series(backend, guild_id_str, d, now, since),
+    )
+
+
+async def _infractions_series(backend, guild_id_str: str, d: int, now: datetime, since: datetime) -> Dict[str, Any]:
     try:
         pipeline = [
             {"$match": {"guild_id": guild_id_str, "timestamp": {"$exists": True}}},
@@ -598,7 +368,7 @@ async def guild_infractions_series(
             },
             {"$sort": {"_id": 1}},
         ]
-        cursor = bot.db.infractions.aggregate(pipeline)
+        cursor = backend.db.infractions.aggregate(pipeline)
         raw = []
         async for doc in cursor:
             raw.append({"date": doc.get("_id"), "count": int(doc.get("count", 0))})
@@ -1 +1,3 @@
-bot = None
\ No newline at end of file
+bot = None
+# Filled by the multi-tenant runner: instance name -> client.
+bots = {}
@@ -0,0 +1,169 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+
+from Utils.models import dump
+from Utils.sharding import shard_label
+
+log = logging.getLogger("bot_ipc")
+
+# Large guild listings go out as a single line.
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def ipc_path():
+    label = shard_label()
+    return os.getenv("BOT_IPC_PATH", f"/tmp/chirp-bot.{label}.sock" if label else "/tmp/chirp-bot.sock")
+
+
+def ipc_paths():
+    # The API of a sharded deployment lists every shard process' socket.
+    paths = [p.strip() for p in os.getenv("BOT_IPC_PATHS", "").split(",") if p.strip()]
+    return paths or [ipc_path()]
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, default=str, separators=(",", ":")).encode() + b"\n"
+
+
+class IPCError(Exception):
+    pass
+
+
+class IPCServer:
+    """Answers newline-delimited JSON requests from API workers on a Unix socket."""
+
+    def __init__(self, bot, path: str = None):
+        self.bot = bot
+        from .backend import LocalBackend
+
+        self.path = path or ipc_path()
+        self.backend = LocalBackend(bot)
+        self.connections = set()
+        self.methods = {
+            "guilds": lambda: self.backend.guilds(),
+            "guild": lambda guild_id: self.backend.guild(int(guild_id)),
+            "member_names": lambda guild_id, user_ids: self.backend.member_names(int(guild_id), user_ids),
+            "config_updated": lambda guild_id, doc: self.backend.config_updated(int(guild_id), doc),
+            "startup": lambda: self.backend.startup(),
+            "shards": lambda: self.backend.shards(),
+            "health": lambda: self.backend.health(),
+            "cache_get": lambda key: self._cache_get(key),
+            "cache_set": lambda key, value, ttl=None: bot.mem_cache.set(key, value, ttl=ttl),
+            "cache_delete": lambda key: bot.mem_cache.delete(key),
+        }
+
+    async def _cache_get(self, key):
+        # Models cross the socket as their tagged doc; RemoteCache parses them back.
+        return dump(await self.backend.bot.mem_cache.get(key))
+
+    async def _dispatch(self, request: dict, writer: asyncio.StreamWriter):
+        request_id = request.get("id")
+        method = self.methods.get(request.get("method"))
+        try:
+            if method is None:
+                raise IPCError(f"unknown method {request.get('method')!r}")
+            response = {"id": request_id, "result": await method(**(request.get("params") or {}))}
+        except IPCError as e:
+            response = {"id": request_id, "error": str(e)}
+        except Exception as e:
+            log.exception("IPC method %s failed", request.get("method"))
+            response = {"id": request_id, "error": str(e)}
+        if not writer.is_closing():
+            writer.write(_encode(response))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        self.connections.add(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    log.warning("Dropping malformed IPC request")
+                    continue
+                task = asyncio.create_task(self._dispatch(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections.discard(writer)
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._handle, path=self.path, limit=STREAM_LIMIT)
+        os.chmod(self.path, 0o600)
+        log.info("Bot IPC listening on %s", self.path)
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            # wait_closed() (and so serve_forever()) blocks until API workers hang up, so drop them first.
+            server.close()
+            for writer in list(self.connections):
+                writer.close()
+            await server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+class IPCClient:
+    """Multiplexes concurrent calls from one API worker over a single socket connection."""
+
+    def __init__(self, path: str = None, timeout: float = None):
+        self.path = path or ipc_path()
+        self.timeout = timeout if timeout is not None else float(os.getenv("BOT_IPC_TIMEOUT", "5"))
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._writer = None
+        self._reader_task = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        async with self._lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=STREAM_LIMIT)
+            except OSError as e:
+                raise IPCError(f"bot unreachable at {self.path}: {e}") from e
+            self._reader_task = asyncio.create_task(self._read(reader))
+
+    async def _read(self, reader: asyncio.StreamReader):
+        try:
+            while line := await reader.readline():
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(IPCError(response["error"]))
+                else:
+                    future.set_result(response.get("result"))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(IPCError("bot connection lost"))
+            self._pending.clear()
+
+    async def call(self, method: str, **params):
+        await self._connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(_encode({"id": request_id, "method": method, "params": params}))
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise IPCError(f"bot did not answer {method} within {self.timeout}s") from None
+        finally:
+            self._pending.pop(request_id, None)
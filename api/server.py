@@ -0,0 +1,22 @@
+"""Standalone dashboard API for API_MODE=split: python -m api.server"""
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+from Utils.event_loop import resolve_loop_name
+
+
+def main():
+    load_dotenv()
+    uvicorn.run(
+        "api.bot_api:app",
+        host=os.getenv("UVICORN_HOST", "0.0.0.0"),
+        port=int(os.getenv("UVICORN_PORT", "6248")),
+        workers=int(os.getenv("API_WORKERS", "2")),
+        loop=resolve_loop_name(),
+    )
+
+
+if __name__ == "__main__":
+    main()
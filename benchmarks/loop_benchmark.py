@@ -0,0 +1,154 @@
+"""Compare event loops for the shared gateway + API loop.
+
+Usage: python benchmarks/loop_benchmark.py [--loops asyncio uvloop] [--repeat 3] [--json]
+
+Each scenario runs on a fresh loop built by Utils.event_loop, exactly like main.py:
+  api       - /health request throughput against api.bot_api:app served by uvicorn
+  dispatch  - simulated interaction dispatch (decode, ack, one REST round trip) latency
+  mixed     - dispatch latency while the API is under the same load as `api`
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+import uvicorn
+
+from Utils.event_loop import LOOPS, run
+
+SAMPLE_INTERACTION = {
+    "type": 2,
+    "id": "1430990000000000000",
+    "application_id": "1430980000000000000",
+    "guild_id": "1430984964283043916",
+    "channel_id": "1430984965826543733",
+    "token": "x" * 180,
+    "member": {"user": {"id": "856196104385986560", "username": "dev"}, "roles": [str(1430990000000000000 + i) for i in range(10)]},
+    "data": {"id": "1430990000000000001", "name": "infractions", "type": 1, "options": [
+        {"name": "view", "type": 1, "options": [{"name": "infraction_id", "type": 3, "value": "ABCD1234"}]},
+    ]},
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _api_load(url, requests, concurrency):
+    async with aiohttp.ClientSession() as session:
+        async def worker(count):
+            for _ in range(count):
+                async with session.get(url) as resp:
+                    await resp.read()
+
+        await worker(min(50, requests))
+        per_worker = max(1, requests // concurrency)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    total = per_worker * concurrency
+    return {"requests": total, "seconds": round(elapsed, 3), "rps": round(total / elapsed, 1)}
+
+
+async def _dispatch(events, burst, rest_delay):
+    raw = json.dumps(SAMPLE_INTERACTION)
+    scheduling, completion = [], []
+
+    async def handle(payload, arrived):
+        started = time.perf_counter()
+        scheduling.append(started - arrived)
+        json.loads(payload)
+        await asyncio.sleep(0)
+        await asyncio.sleep(rest_delay)
+        completion.append(time.perf_counter() - arrived)
+
+    tasks = []
+    for i in range(events):
+        tasks.append(asyncio.create_task(handle(raw, time.perf_counter())))
+        # The gateway reader yields between frames; mimic bursts of `burst` events per read.
+        if i % burst == 0:
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    def pct(values, q):
+        return round(statistics.quantiles(values, n=100)[q - 1] * 1000, 3)
+
+    return {
+        "events": events,
+        "schedule_p50_ms": pct(scheduling, 50),
+        "schedule_p99_ms": pct(scheduling, 99),
+        "complete_p50_ms": pct(completion, 50),
+        "complete_p99_ms": pct(completion, 99),
+    }
+
+
+async def run_scenarios(args):
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config("api.bot_api:app", host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    url = f"http://127.0.0.1:{port}/health"
+
+    try:
+        results = {
+            "api": await _api_load(url, args.requests, args.concurrency),
+            "dispatch": await _dispatch(args.events, args.burst, args.rest_delay),
+        }
+        mixed_api = asyncio.create_task(_api_load(url, args.requests, args.concurrency))
+        results["mixed"] = await _dispatch(args.events, args.burst, args.rest_delay)
+        results["mixed"]["api_rps"] = (await mixed_api)["rps"]
+        return results
+    finally:
+        server.should_exit = True
+        await serve_task
+
+
+def _median_runs(runs):
+    merged = {}
+    for scenario in runs[0]:
+        merged[scenario] = {
+            key: statistics.median(run[scenario][key] for run in runs)
+            for key in runs[0][scenario]
+        }
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loops", nargs="+", default=list(LOOPS), choices=LOOPS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--burst", type=int, default=25)
+    parser.add_argument("--rest-delay", type=float, default=0.001)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {name: _median_runs([run(run_scenarios(args), name) for _ in range(args.repeat)]) for name in args.loops}
+
+    if args.json:
+        print(json.dumps({"python": sys.version.split()[0], "args": vars(args), "results": results}, indent=2))
+        return
+
+    print(f"Python {sys.version.split()[0]}, median of {args.repeat} runs")
+    print(f"{'loop':<8} {'api rps':>9} {'disp p50':>9} {'disp p99':>9} {'mixed p50':>10} {'mixed p99':>10} {'mixed rps':>10}")
+    for name, r in results.items():
+        print(
+            f"{name:<8} {r['api']['rps']:>9} {r['dispatch']['complete_p50_ms']:>8}ms {r['dispatch']['complete_p99_ms']:>8}ms "
+            f"{r['mixed']['complete_p50_ms']:>9}ms {r['mixed']['complete_p99_ms']:>9}ms {r['mixed']['api_rps']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Run several branded Chirp instances in one process.
+
+TENANTS_FILE (default tenants.json) lists the instances:
+
+    {"bots": [
+        {"name": "chirp", "token_env": "DISCORD_TOKEN"},
+        {"name": "acme", "token_env": "ACME_TOKEN", "brand": "Acme", "database": "Acme"}
+    ]}
+
+All instances share one Mongo pool, one in-memory cache (namespaced per instance) and one
+dashboard API; API requests choose an instance with the X-Bot header.
+"""
+import time
+boot_started = time.perf_counter()
+
+import os
+import json
+import logging
+import signal
+import asyncio
+
+from dotenv import load_dotenv
+
+from api import context
+from Utils.uvicorn import start_uvicorn
+from Utils.gateway_session import graceful_shutdown
+from Utils.instance import SharedResources, create_bot
+from Utils.log_pipeline import setup_logging
+from Utils.startup import StartupTimeline
+from Utils.event_loop import resolve_loop_name, run
+
+load_dotenv()
+
+log_listener = setup_logging()
+cls_log = logging.getLogger("Logger")
+cls_log.setLevel(logging.INFO)
+
+
+def load_tenants(path: str):
+    with open(path) as f:
+        tenants = json.load(f)["bots"]
+    names = [tenant["name"] for tenant in tenants]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate bot names in {path}")
+    for tenant in tenants:
+        tenant["token"] = tenant.get("token") or os.environ[tenant.get("token_env", "DISCORD_TOKEN")]
+    return tenants
+
+
+tenants = load_tenants(os.getenv("TENANTS_FILE", "tenants.json"))
+shared = SharedResources()
+bots = {}
+for tenant in tenants:
+    name = tenant["name"]
+    timeline = StartupTimeline(boot_started)
+    timeline.end("imports")
+    bots[name] = create_bot(
+        shared,
+        timeline,
+        cls_log.getChild(name),
+        name=name,
+        database=tenant.get("database", "Chirp"),
+        brand=tenant.get("brand", "Chirp"),
+        session_path=f"gateway_session.{name}.json",
+    )
+context.bots = bots
+
+
+async def _shutdown():
+    await asyncio.gather(*(graceful_shutdown(bot) for bot in bots.values()), return_exceptions=True)
+    shared.close()
+
+
+def shutdown():
+    if any(bot.draining for bot in bots.values()):
+        return
+    cls_log.info("Shutting down...")
+    asyncio.get_event_loop().create_task(_shutdown())
+
+
+signal.signal(signal.SIGINT, lambda s, f: shutdown())
+signal.signal(signal.SIGTERM, lambda s, f: shutdown())
+
+
+async def _run_bot(name, bot, token):
+    bot.startup_timeline.start("gateway_ready")
+    try:
+        await bot.astart(token)
+    except Exception:
+        # One broken instance (revoked token, ...) must not take the others down.
+        cls_log.exception(f"Bot {name} stopped with an error.")
+
+
+async def main():
+    cls_log.info(f"Running {len(bots)} bots on the {resolve_loop_name()} event loop.")
+    api_task = asyncio.create_task(start_uvicorn())
+    bots_task = asyncio.gather(*(_run_bot(t["name"], bots[t["name"]], t["token"]) for t in tenants))
+    done, pending = await asyncio.wait({api_task, bots_task}, return_when=asyncio.FIRST_COMPLETED)
+    for p in pending:
+        p.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    run(main())
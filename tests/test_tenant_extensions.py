@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interactions import Client
+
+from Utils.instance import EXTENSIONS
+
+
+def _bound_extension(command):
+    return command.callback.args[0]
+
+
+class TenantExtensionsTest(unittest.TestCase):
+    def test_commands_run_against_their_own_client(self):
+        tenants = [Client(), Client()]
+        for bot in tenants:
+            for extension in EXTENSIONS:
+                bot.load_extension(extension)
+
+        first, second = tenants
+        for name, ext in first.ext.items():
+            other = second.ext[name]
+            self.assertIsNot(ext, other)
+            self.assertEqual(len(ext.commands), len(other.commands))
+            for command, other_command in zip(ext.commands, other.commands):
+                self.assertIs(_bound_extension(command).bot, first)
+                self.assertIs(_bound_extension(other_command).bot, second)
+
+    def test_tasks_are_not_shared(self):
+        first, second = Client(), Client()
+        for bot in (first, second):
+            bot.load_extension("Extensions.staff-management.infractions")
+        first_task = first.ext["Infractions"].check_expired_infractions
+        second_task = second.ext["Infractions"].check_expired_infractions
+        self.assertIsNot(first_task, second_task)
+        self.assertIs(first_task.callback.args[0].bot, first)
+        self.assertIs(second_task.callback.args[0].bot, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Runs against a real Redis server: REDIS_TEST_URL=redis://localhost:6379/15 python -m unittest discover -s tests
+
+The database is flushed before each test.
+"""
+import asyncio
+import os
+import sys
+import unittest
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redis import asyncio as redis
+
+from Utils.tiered_cache import TieredCache
+
+REDIS_TEST_URL = os.getenv("REDIS_TEST_URL")
+
+
+@unittest.skipUnless(REDIS_TEST_URL, "REDIS_TEST_URL is not set")
+class TieredCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.admin = redis.from_url(REDIS_TEST_URL)
+        await self.admin.flushdb()
+        prefix = f"test:{uuid.uuid4().hex}:"
+        self.a = TieredCache(REDIS_TEST_URL, prefix=prefix)
+        self.b = TieredCache(REDIS_TEST_URL, prefix=prefix)
+
+    async def asyncTearDown(self):
+        for cache in (self.a, self.b):
+            cache.close()
+            await cache.redis.aclose()
+        await self.admin.aclose()
+
+    async def _settle(self, condition, timeout=5.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not condition():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("timed out waiting for the invalidation listener")
+            await asyncio.sleep(0.05)
+
+    async def test_write_invalidates_other_process_l1(self):
+        await self.b.set("config_1", {"infraction_log": "1"})
+        await self.a.set("config_1", {"infraction_log": "2"})
+        await self._settle(lambda: self.b.invalidations_received == 1)
+        self.assertIsNone(await self.b.l1.get("config_1"))
+        self.assertEqual(await self.b.get("config_1"), {"infraction_log": "2"})
+
+    async def test_reconnect_replays_only_missed_invalidations(self):
+        await self.b.set("config_1", {"infraction_log": "1"})
+        await self.b.set("config_2", {"infraction_log": "1"})
+        await asyncio.sleep(0.2)
+
+        # Drop every client connection but the admin one; b's listener is mid-XREAD and has to reconnect.
+        await self.admin.execute_command("CLIENT", "KILL", "TYPE", "normal", "SKIPME", "yes")
+        await self.a.set("config_1", {"infraction_log": "2"})
+        await self._settle(lambda: self.b.invalidations_received == 1)
+
+        self.assertGreaterEqual(self.b.l2_errors, 1)
+        self.assertEqual(self.b.invalidation_gaps, 0)
+        self.assertIsNone(await self.b.l1.get("config_1"))
+        self.assertEqual(await self.b.l1.get("config_2"), {"infraction_log": "1"})
+
+    async def test_trimmed_backlog_clears_l1(self):
+        self.a.backlog = self.b.backlog = 5
+        await self.b.set("config_2", {"infraction_log": "1"})
+        await asyncio.sleep(0.2)
+
+        await self.admin.execute_command("CLIENT", "KILL", "TYPE", "normal", "SKIPME", "yes")
+        for i in range(300):
+            await self.a.set(f"config_{100 + i}", i)
+        await self._settle(lambda: self.b.invalidation_gaps == 1)
+
+        self.assertIsNone(await self.b.l1.get("config_2"))
+
+
+if __name__ == "__main__":
+    unittest.main()